@@ -0,0 +1,121 @@
+"""
+====================================================================
+            SUIVI DES ALLOCATIONS : LA MÉMOIRE IMAGE PAR IMAGE
+====================================================================
+
+Chaque fois que le programme crée un objet (un texte, un tuple, une
+surface...), Python lui réserve de la mémoire : c'est une ALLOCATION.
+Si chaque image du jeu crée beaucoup d'objets, le "ramasse-miettes"
+(gc) de Python doit régulièrement s'arrêter pour faire le ménage, et
+le serpent saccade pendant ces pauses.
+
+Avec l'option --allocations, on mesure pour chaque écran (menu, nom,
+partie, fin...) :
+- les octets alloués pendant une image (le "pic" de l'image)
+- ce qui reste alloué après l'image (la croissance)
+- les passages du ramasse-miettes et la durée de ses pauses
+
+Ces mesures utilisent tracemalloc (qui ralentit un peu le jeu) : on
+ne l'active que pour chercher ce qui alloue.
+====================================================================
+"""
+
+import gc
+import time
+import tracemalloc
+
+
+class StatistiquesEcran:
+    """
+    Les mesures accumulées pour un écran
+    """
+    def __init__(self):
+        self.images = 0
+        self.octets_alloues = 0     # Somme des pics de chaque image
+        self.pic_max = 0            # Le plus gros pic d'une image
+        self.croissance = 0         # Ce qui est resté alloué
+        self.collectes = [0, 0, 0]  # Passages du ramasse-miettes, par génération
+        self.duree_gc = 0.0         # Temps total des pauses (secondes)
+        self.pause_gc_max = 0.0     # La plus longue pause
+
+    def par_image(self):
+        return self.octets_alloues / self.images if self.images else 0.0
+
+
+class SuiviAllocations:
+    """
+    Mesure les allocations et les pauses du ramasse-miettes, image par image
+    image(nom_ecran) est appelé après chaque image (voir mettre_a_jour_affichage)
+    """
+    def __init__(self):
+        self.ecrans = {}
+        self.precedent = 0
+        # Pauses du ramasse-miettes pas encore rangées dans un écran
+        self.collectes = [0, 0, 0]
+        self.duree_gc = 0.0
+        self.pause_gc_max = 0.0
+        self.debut_gc = 0.0
+
+    def demarrer(self):
+        tracemalloc.start()
+        gc.callbacks.append(self.rappel_gc)
+        self.precedent = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+
+    def arreter(self):
+        if self.rappel_gc in gc.callbacks:
+            gc.callbacks.remove(self.rappel_gc)
+        tracemalloc.stop()
+
+    def rappel_gc(self, phase, infos):
+        """
+        Appelé par Python au début et à la fin de chaque passage du ramasse-miettes
+        """
+        if phase == "start":
+            self.debut_gc = time.perf_counter()
+        else:
+            duree = time.perf_counter() - self.debut_gc
+            self.collectes[infos["generation"]] += 1
+            self.duree_gc += duree
+            self.pause_gc_max = max(self.pause_gc_max, duree)
+
+    def image(self, nom_ecran):
+        """
+        Range les mesures de l'image qui vient d'être affichée
+        Retourne (octets alloués pendant l'image, croissance)
+        """
+        courant, pic = tracemalloc.get_traced_memory()
+        alloues = pic - self.precedent
+        croissance = courant - self.precedent
+
+        statistiques = self.ecrans.get(nom_ecran)
+        if statistiques is None:
+            statistiques = self.ecrans[nom_ecran] = StatistiquesEcran()
+        statistiques.images += 1
+        statistiques.octets_alloues += alloues
+        statistiques.pic_max = max(statistiques.pic_max, alloues)
+        statistiques.croissance += croissance
+        for generation in range(3):
+            statistiques.collectes[generation] += self.collectes[generation]
+            self.collectes[generation] = 0
+        statistiques.duree_gc += self.duree_gc
+        statistiques.pause_gc_max = max(statistiques.pause_gc_max, self.pause_gc_max)
+        self.duree_gc = self.pause_gc_max = 0.0
+
+        # Les mesures elles-mêmes ne comptent pas pour l'image suivante
+        self.precedent = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        return alloues, croissance
+
+    def rapport(self):
+        """
+        Le résumé écran par écran, en texte
+        """
+        lignes = ["Allocations par image et pauses du ramasse-miettes", ""]
+        lignes.append(f"{'écran':<18}{'images':>8}{'octets/image':>14}{'pic max':>10}"
+                      f"{'croissance':>12}{'gc (0/1/2)':>14}{'pause max':>11}")
+        for nom, stats in sorted(self.ecrans.items(), key=lambda element: -element[1].images):
+            collectes = "/".join(str(nombre) for nombre in stats.collectes)
+            lignes.append(f"{nom:<18}{stats.images:>8}{stats.par_image():>14.0f}{stats.pic_max:>10}"
+                          f"{stats.croissance:>12}{collectes:>14}{stats.pause_gc_max * 1000:>9.2f}ms")
+        return "\n".join(lignes)
@@ -0,0 +1,126 @@
+"""
+====================================================================
+            LA CAMÉRA : JOUER SUR UN PLATEAU PLUS GRAND QUE L'ÉCRAN
+====================================================================
+
+Quand le plateau est plus grand que la fenêtre (option --plateau), on
+ne voit qu'une partie du plateau : la caméra suit la tête du serpent
+en glissant doucement, sous le panneau du haut.
+
+Pour dessiner vite, on ne dessine que les cases VISIBLES. Pour les
+trouver sans parcourir tout le serpent, on range les cases occupées
+par "blocs" de 8 x 8 cases (un index spatial) : on ne regarde que
+les blocs qui touchent l'écran. Le temps de dessin dépend donc de la
+taille de l'écran, pas de la longueur du serpent ni du plateau.
+====================================================================
+"""
+
+from collections import Counter
+
+from snake_game import LARGEUR, HAUTEUR, HAUTEUR_PANNEAU, TAILLE_CASE
+
+# Nombre de cases sur chaque côté d'un bloc de l'index
+TAILLE_BLOC = 8
+TAILLE_BLOC_PIXELS = TAILLE_BLOC * TAILLE_CASE
+
+# À chaque image, la caméra fait cette part du chemin vers sa cible
+DOUCEUR_CAMERA = 0.35
+
+# La partie de la fenêtre où l'on voit le plateau (sous le panneau)
+LARGEUR_VUE = LARGEUR
+HAUTEUR_VUE = HAUTEUR - HAUTEUR_PANNEAU
+
+
+class IndexSpatial:
+    """
+    Les cases occupées, rangées par bloc : (bx, by) -> {case: nombre}
+    (une case peut être comptée plusieurs fois : deux pommes au même endroit)
+    """
+    def __init__(self, cases=()):
+        self.blocs = {}
+        for case in cases:
+            self.ajouter(case)
+
+    def bloc_de(self, case):
+        return (case[0] // TAILLE_BLOC_PIXELS, case[1] // TAILLE_BLOC_PIXELS)
+
+    def ajouter(self, case):
+        self.blocs.setdefault(self.bloc_de(case), Counter())[case] += 1
+
+    def retirer(self, case):
+        bloc = self.blocs.get(self.bloc_de(case))
+        if bloc is None or not bloc[case]:
+            return
+        bloc[case] -= 1
+        if not bloc[case]:
+            del bloc[case]
+
+    def cases_dans(self, gauche, haut, largeur, hauteur):
+        """
+        Les cases des blocs qui touchent ce rectangle (en pixels du plateau)
+        """
+        for by in range(haut // TAILLE_BLOC_PIXELS, (haut + hauteur - 1) // TAILLE_BLOC_PIXELS + 1):
+            for bx in range(gauche // TAILLE_BLOC_PIXELS, (gauche + largeur - 1) // TAILLE_BLOC_PIXELS + 1):
+                bloc = self.blocs.get((bx, by))
+                if bloc:
+                    yield from bloc
+
+
+class Camera:
+    """
+    Suit la tête du serpent et sait quelles cases sont visibles
+    (x, y) : le point du plateau affiché en haut à gauche, sous le panneau
+    """
+    def __init__(self, partie, largeur_plateau, hauteur_plateau):
+        self.largeur_plateau = largeur_plateau
+        self.hauteur_plateau = hauteur_plateau
+        self.serpent = IndexSpatial(partie.serpent)
+        self.pommes = IndexSpatial(partie.pommes)
+        self.x, self.y = self.cible(partie.serpent[0])
+
+    def cible(self, tete):
+        """
+        Où la caméra veut aller : la tête au milieu, sans sortir du plateau
+        """
+        x = tete[0] + TAILLE_CASE // 2 - LARGEUR_VUE // 2
+        y = tete[1] + TAILLE_CASE // 2 - HAUTEUR_VUE // 2
+        x = max(0, min(x, self.largeur_plateau - LARGEUR_VUE))
+        y = max(HAUTEUR_PANNEAU, min(y, self.hauteur_plateau - HAUTEUR_VUE))
+        return x, y
+
+    def noter(self, changements):
+        """
+        Met l'index à jour après un pas (changements : le résultat d'avancer_partie)
+        """
+        self.serpent.ajouter(changements["tete"])
+        if changements["queue"] is not None:
+            self.serpent.retirer(changements["queue"])
+        for pomme in changements["pommes_mangees"]:
+            self.pommes.retirer(pomme)
+        for pomme in changements["pommes_ajoutees"]:
+            self.pommes.ajouter(pomme)
+
+    def suivre(self, tete):
+        """
+        Rapproche doucement la caméra de la tête
+        """
+        cible_x, cible_y = self.cible(tete)
+        self.x += (cible_x - self.x) * DOUCEUR_CAMERA
+        self.y += (cible_y - self.y) * DOUCEUR_CAMERA
+
+    def vers_ecran(self, case):
+        """
+        Position d'une case du plateau dans la fenêtre
+        """
+        return (case[0] - round(self.x), case[1] - round(self.y) + HAUTEUR_PANNEAU)
+
+    def visible(self, case):
+        x, y = self.vers_ecran(case)
+        return -TAILLE_CASE < x < LARGEUR_VUE and HAUTEUR_PANNEAU - TAILLE_CASE < y < HAUTEUR
+
+    def cases_visibles(self, index):
+        """
+        Les cases de l'index qu'on voit à l'écran
+        """
+        cases = index.cases_dans(round(self.x), round(self.y), LARGEUR_VUE, HAUTEUR_VUE)
+        return [case for case in cases if self.visible(case)]
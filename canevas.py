@@ -0,0 +1,96 @@
+"""
+====================================================================
+            UNE GRANDE FENÊTRE SANS DESSINER PLUS
+====================================================================
+
+Le jeu dessine toujours dans une image de 1000 x 780 pixels, le
+"canevas" (une case du plateau = un carré de 20 pixels). À chaque
+image, le canevas est agrandi d'un seul coup à la taille de la fenêtre
+(ou de l'écran entier) :
+
+- l'agrandissement se fait par un nombre entier (x2, x3...) : chaque
+  pixel devient un carré de pixels, les cases et les textes restent
+  nets. Il reste des bandes noires autour si la fenêtre n'a pas la
+  même forme que le jeu ;
+- le programme dessine toujours le même nombre de pixels, quelle que
+  soit la taille de la fenêtre : sur un écran 4K, seul l'agrandissement
+  coûte plus cher ;
+- les textes du panneau sont rendus une seule fois (voir texte_panneau)
+  et agrandis avec le reste ;
+- changer la taille de la fenêtre ne change rien au dessin : on
+  recalcule seulement le facteur d'agrandissement.
+
+    python snake_game.py --fenetre 3000x2340
+    python snake_game.py --plein-ecran
+====================================================================
+"""
+
+import pygame
+
+from snake_game import LARGEUR, HAUTEUR, NOIR
+
+
+def calculer_destination(taille_fenetre, taille_canevas=(LARGEUR, HAUTEUR)):
+    """
+    Le facteur d'agrandissement (entier si possible) et le rectangle de
+    la fenêtre où va le canevas agrandi, centré
+    Une fenêtre plus petite que le canevas le rétrécit (facteur < 1)
+    """
+    largeur_fenetre, hauteur_fenetre = taille_fenetre
+    largeur, hauteur = taille_canevas
+    facteur = min(largeur_fenetre // largeur, hauteur_fenetre // hauteur)
+    if facteur < 1:
+        facteur = min(largeur_fenetre / largeur, hauteur_fenetre / hauteur)
+    destination = pygame.Rect(0, 0, int(largeur * facteur), int(hauteur * facteur))
+    destination.center = (largeur_fenetre // 2, hauteur_fenetre // 2)
+    return facteur, destination
+
+
+class FenetreAgrandie:
+    """
+    La vraie fenêtre, et le canevas où le jeu dessine
+    """
+    def __init__(self, taille_fenetre=None, plein_ecran=False):
+        if plein_ecran:
+            pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            pygame.display.set_mode(taille_fenetre or (LARGEUR, HAUTEUR), pygame.RESIZABLE)
+        # Le canevas a le même format de pixels que la fenêtre (copie rapide)
+        self.canevas = pygame.Surface((LARGEUR, HAUTEUR)).convert()
+        self.taille_fenetre = None
+        self.facteur = 1
+        self.destination = None
+        self.zone = None
+
+    def preparer(self, fenetre):
+        """
+        Recalcule l'agrandissement pour la taille actuelle de la fenêtre
+        """
+        self.taille_fenetre = fenetre.get_size()
+        self.facteur, self.destination = calculer_destination(self.taille_fenetre)
+        # Les bandes noires autour du jeu, dessinées une fois
+        fenetre.fill(NOIR)
+        self.zone = fenetre.subsurface(self.destination)
+
+    def presenter(self):
+        """
+        Agrandit le canevas dans la fenêtre, en une seule opération
+        (à appeler juste avant pygame.display.flip)
+        """
+        fenetre = pygame.display.get_surface()
+        # Fenêtre redimensionnée (ou recréée) : nouveau facteur
+        if fenetre.get_size() != self.taille_fenetre or self.zone.get_parent() is not fenetre:
+            self.preparer(fenetre)
+        if self.facteur == 1:
+            self.zone.blit(self.canevas, (0, 0))
+        else:
+            pygame.transform.scale(self.canevas, self.destination.size, self.zone)
+
+    def vers_canevas(self, position):
+        """
+        Position de la souris dans la fenêtre -> position dans le canevas
+        """
+        if self.destination is None:
+            self.preparer(pygame.display.get_surface())
+        x, y = position
+        return (int((x - self.destination.x) / self.facteur), int((y - self.destination.y) / self.facteur))
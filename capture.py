@@ -0,0 +1,154 @@
+"""
+====================================================================
+                CAPTURE DES IMAGES DU JEU (SANS FENÊTRE)
+====================================================================
+
+Ce module permet d'enregistrer les images affichées par le jeu,
+même sans écran : SDL utilise alors le pilote vidéo "dummy" qui
+dessine dans la mémoire au lieu d'ouvrir une fenêtre.
+
+Deux formats sont disponibles :
+- "brut" : toutes les images à la suite dans un seul fichier,
+           copiées directement depuis la mémoire de la surface
+           (le plus rapide, idéal pour des milliers d'images)
+- "png"  : une image PNG par fichier (facile à regarder)
+
+On s'en sert pour vérifier qu'une image est identique, pixel par
+pixel, à une image de référence (une "golden image").
+====================================================================
+"""
+
+import os
+import struct
+
+import pygame
+
+# Formats de capture possibles
+FORMAT_BRUT = "brut"
+FORMAT_PNG = "png"
+
+# Nom du fichier qui contient le flux d'images brutes
+NOM_FLUX_BRUT = "images.brut"
+
+# Chaque image du flux brut commence par un petit en-tête :
+#   - 4 octets "magiques" pour reconnaître le début d'une image
+#   - le numéro de l'image
+#   - la largeur, la hauteur et le pas (octets par ligne)
+#   - le nombre d'octets par pixel et les 4 masques de couleur
+#   - le nom de l'écran (16 caractères maximum)
+# Ensuite viennent les pixels, ligne par ligne (hauteur * pas octets).
+ENTETE_IMAGE = struct.Struct("<4sIIII B4I16s")
+MAGIQUE = b"SNKF"
+
+
+def activer_pilote_sans_fenetre():
+    """
+    Force SDL à dessiner en mémoire (pilote "dummy") au lieu d'ouvrir une fenêtre
+    Doit être appelée avant pygame.display.set_mode()
+    """
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    # Si l'affichage est déjà initialisé avec un autre pilote, on le redémarre
+    if pygame.display.get_init():
+        pygame.display.quit()
+    pygame.display.init()
+
+
+class CaptureImages:
+    """
+    Enregistre chaque image qu'on lui donne, dans le format choisi
+    Si nombre_max est donné, un événement QUIT est envoyé au jeu quand
+    ce nombre d'images est atteint (le jeu se ferme tout seul)
+    """
+
+    def __init__(self, dossier, format_images=FORMAT_BRUT, nombre_max=None):
+        if format_images not in (FORMAT_BRUT, FORMAT_PNG):
+            raise ValueError(f"Format de capture inconnu: {format_images}")
+        self.dossier = dossier
+        self.format_images = format_images
+        self.nombre_max = nombre_max
+        self.nombre_images = 0
+        os.makedirs(dossier, exist_ok=True)
+
+        self.fichier = None
+        if format_images == FORMAT_BRUT:
+            self.fichier = open(os.path.join(dossier, NOM_FLUX_BRUT), 'wb')
+
+    def capturer(self, surface, nom_ecran):
+        """
+        Enregistre le contenu actuel de la surface
+        nom_ecran indique d'où vient l'image ("menu", "partie", "fin", ...)
+        """
+        if self.nombre_max is not None and self.nombre_images >= self.nombre_max:
+            return
+
+        if self.format_images == FORMAT_BRUT:
+            entete = ENTETE_IMAGE.pack(
+                MAGIQUE, self.nombre_images,
+                surface.get_width(), surface.get_height(), surface.get_pitch(),
+                surface.get_bytesize(), *surface.get_masks(),
+                nom_ecran.encode('utf-8')[:16])
+            self.fichier.write(entete)
+            # get_buffer() donne accès directement à la mémoire de la surface :
+            # les pixels sont écrits dans le fichier sans copie intermédiaire
+            tampon = surface.get_buffer()
+            self.fichier.write(tampon)
+            # Libérer le tampon pour déverrouiller la surface
+            del tampon
+        else:
+            chemin = os.path.join(self.dossier, f"{self.nombre_images:06d}_{nom_ecran}.png")
+            pygame.image.save(surface, chemin)
+
+        self.nombre_images += 1
+
+        # Nombre maximum atteint : demander au jeu de se fermer
+        if self.nombre_max is not None and self.nombre_images >= self.nombre_max:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+
+    def fermer(self):
+        """
+        Termine la capture (ferme le fichier du flux brut)
+        """
+        if self.fichier is not None:
+            self.fichier.close()
+            self.fichier = None
+
+
+def lire_flux_brut(chemin):
+    """
+    Relit un flux d'images brutes
+    Donne (générateur) pour chaque image un tuple (numero, nom_ecran, surface)
+    """
+    with open(chemin, 'rb') as f:
+        while True:
+            entete = f.read(ENTETE_IMAGE.size)
+            if len(entete) < ENTETE_IMAGE.size:
+                return
+            (magique, numero, largeur, hauteur, pas,
+             octets_par_pixel, r, v, b, a, nom) = ENTETE_IMAGE.unpack(entete)
+            if magique != MAGIQUE:
+                raise ValueError(f"Flux d'images invalide (image {numero})")
+            pixels = f.read(hauteur * pas)
+
+            # Recréer une surface avec exactement le même format de pixels
+            surface = pygame.Surface((largeur, hauteur), 0, octets_par_pixel * 8, (r, v, b, a))
+            tampon = surface.get_buffer()
+            if surface.get_pitch() == pas:
+                tampon.write(pixels)
+            else:
+                # Le pas est différent : copier ligne par ligne
+                octets_ligne = largeur * octets_par_pixel
+                for ligne in range(hauteur):
+                    tampon.write(pixels[ligne * pas:ligne * pas + octets_ligne],
+                                 ligne * surface.get_pitch())
+            del tampon
+
+            yield numero, nom.rstrip(b'\0').decode('utf-8'), surface
+
+
+def images_identiques(surface_a, surface_b):
+    """
+    Retourne True si les deux images sont identiques pixel par pixel
+    """
+    if surface_a.get_size() != surface_b.get_size():
+        return False
+    return pygame.image.tobytes(surface_a, "RGB") == pygame.image.tobytes(surface_b, "RGB")
@@ -0,0 +1,158 @@
+"""
+====================================================================
+            LE CLASSEMENT SUR LE RÉSEAU (POUR LES ÉCRANS DU HALL)
+====================================================================
+
+Avec l'option --classement-http, le jeu répond aux écrans du hall qui
+demandent le classement, comme un petit site web :
+
+    http://machine:8080/classement        les meilleurs scores
+    http://machine:8080/joueurs/Zoé       les statistiques d'un joueur
+
+Les réponses sont préparées à l'avance (un "instantané") et refaites
+seulement quand un score est ajouté. Chaque réponse a une étiquette
+(ETag) : un écran qui redemande le classement en donnant l'étiquette
+qu'il a déjà reçoit "304 : rien n'a changé", sans aucun contenu. Des
+centaines d'écrans peuvent ainsi demander le classement toutes les
+secondes sans ralentir le jeu.
+====================================================================
+"""
+
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+
+from snake_game import calculer_classement, resume_joueur
+
+PORT_CLASSEMENT = 8080
+TAILLE_CLASSEMENT = 10
+
+
+def reponse_json(donnees):
+    """
+    Le contenu JSON en octets et son étiquette (calculée à partir du contenu)
+    """
+    octets = json.dumps(donnees, ensure_ascii=False, indent=2).encode("utf-8")
+    return '"' + hashlib.sha1(octets).hexdigest()[:16] + '"', octets
+
+
+class InstantaneClassement:
+    """
+    Les réponses toutes prêtes : chemin -> (étiquette, octets)
+    """
+    def __init__(self, scores):
+        self.reponses = {}
+        self.verrou = threading.Lock()
+        self.mettre_a_jour(scores)
+
+    def mettre_a_jour(self, scores, nom=None):
+        """
+        Refait le classement, et la page du joueur nom (tous les joueurs si nom est None)
+        """
+        classement = [{"rang": rang, "nom": nom_joueur, "meilleur": meilleur, "parties": parties}
+                      for rang, (nom_joueur, meilleur, parties)
+                      in enumerate(calculer_classement(scores)[:TAILLE_CLASSEMENT], 1)]
+        nouvelles = {"/classement": reponse_json({"classement": classement})}
+        for nom_joueur in (scores if nom is None else [nom]):
+            historique = scores[nom_joueur]
+            page = dict(resume_joueur(historique), nom=nom_joueur,
+                        meilleurs=historique["meilleurs"],
+                        dernieres=[score for score, date in historique["recentes"][-10:]])
+            nouvelles["/joueurs/" + nom_joueur] = reponse_json(page)
+        # Les serveurs lisent pendant que le jeu écrit : on remplace d'un coup
+        with self.verrou:
+            reponses = dict(self.reponses)
+            reponses.update(nouvelles)
+            self.reponses = reponses
+
+    def reponse(self, chemin):
+        return self.reponses.get(chemin)
+
+
+def etiquette_connue(etiquette, entete):
+    """
+    True si l'en-tête If-None-Match contient cette étiquette
+    L'en-tête est une liste séparée par des virgules ("*" = n'importe laquelle),
+    chaque étiquette peut commencer par W/ (étiquette "faible", comparée pareil)
+    """
+    for valeur in entete.split(","):
+        valeur = valeur.strip()
+        if valeur == "*":
+            return True
+        if valeur.startswith("W/"):
+            valeur = valeur[2:]
+        if valeur == etiquette:
+            return True
+    return False
+
+
+class GestionnaireClassement(BaseHTTPRequestHandler):
+    """
+    Répond à une demande d'un écran (un fil par connexion)
+    """
+    # Les écrans peuvent garder leur connexion ouverte entre deux demandes
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        chemin = unquote(urlsplit(self.path).path).rstrip("/") or "/classement"
+        reponse = self.server.instantane.reponse(chemin)
+        if reponse is None:
+            self.envoyer(404, None, b'{"erreur": "introuvable"}')
+            return
+        etiquette, octets = reponse
+        if etiquette_connue(etiquette, self.headers.get("If-None-Match", "")):
+            self.envoyer(304, etiquette, b"")
+        else:
+            self.envoyer(200, etiquette, octets)
+
+    def envoyer(self, code, etiquette, octets):
+        self.send_response(code)
+        if etiquette is not None:
+            self.send_header("ETag", etiquette)
+        # L'écran doit redemander à chaque fois (mais il reçoit souvent un 304)
+        self.send_header("Cache-Control", "no-cache")
+        if code != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(octets)))
+        self.end_headers()
+        self.wfile.write(octets)
+
+    def log_message(self, format, *arguments):
+        # Pas un message par demande dans le terminal du jeu
+        pass
+
+
+class ServeurClassement:
+    """
+    Le serveur web du classement, dans un fil en arrière-plan
+    """
+    def __init__(self, scores, hote="0.0.0.0", port=PORT_CLASSEMENT):
+        self.instantane = InstantaneClassement(scores)
+        self.serveur = ThreadingHTTPServer((hote, port), GestionnaireClassement)
+        self.serveur.daemon_threads = True
+        self.serveur.instantane = self.instantane
+        self.port = self.serveur.server_address[1]
+        self.fil = None
+
+    def demarrer(self):
+        self.fil = threading.Thread(target=self.serveur.serve_forever, name="classement", daemon=True)
+        self.fil.start()
+
+    def mettre_a_jour(self, scores, nom):
+        """
+        Appelé par ajouter_score quand un score change
+        """
+        self.instantane.mettre_a_jour(scores, nom)
+
+    def arreter(self):
+        self.serveur.shutdown()
+        self.serveur.server_close()
+
+
+def adresse_joueur(nom):
+    """
+    Le chemin de la page d'un joueur (les accents et espaces sont encodés)
+    """
+    return "/joueurs/" + quote(nom)
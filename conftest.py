@@ -0,0 +1,18 @@
+"""
+Configuration commune des tests : pas de fenêtre ni de son pendant les tests
+"""
+import os
+
+# Doit être fait avant l'initialisation de Pygame (import de snake_game)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+
+
+@pytest.fixture
+def ecran():
+    """La fenêtre du jeu (dessinée en mémoire, aucune fenêtre n'est ouverte)"""
+    import snake_game
+    return pygame.display.set_mode((snake_game.LARGEUR, snake_game.HAUTEUR))
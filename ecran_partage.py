@@ -0,0 +1,252 @@
+"""
+====================================================================
+            ÉCRAN PARTAGÉ : 2 À 4 JOUEURS SUR LE MÊME CLAVIER
+====================================================================
+
+La fenêtre est coupée en 2, 3 ou 4 "vues". Chaque joueur a sa propre
+partie (son serpent, ses pommes, son score, sa couleur de joueurs.json)
+et ses propres touches :
+
+    Joueur 1 : les flèches       Joueur 3 : I J K L
+    Joueur 2 : Z Q S D           Joueur 4 : le pavé numérique 8 4 5 6
+
+Toutes les parties avancent ensemble, au même rythme (un seul pas
+pour tout le monde). La partie d'un joueur qui a perdu s'arrête, les
+autres continuent ; l'écran partagé se termine quand tout le monde a
+perdu (ou avec Échap).
+
+Pour que 4 plateaux ne coûtent pas 4 fois plus cher qu'un seul :
+
+- Chaque plateau est dessiné à moitié taille (cases de 10 pixels) :
+  les 4 vues tiennent dans la fenêtre habituelle.
+- Les cases (corps, tête, pomme) sont préparées UNE fois pour chaque
+  couleur : dessiner, c'est seulement copier ces petites images.
+- Toutes les cases de toutes les vues sont copiées en UN seul appel
+  (ecran.blits), puis la fenêtre est affichée une seule fois.
+- Les textes du panneau (noms et scores) ne sont refaits que quand un
+  score change.
+
+Lancer :   python ecran_partage.py Zoé Max Léa
+====================================================================
+"""
+
+import argparse
+import random
+
+import pygame
+
+import snake_game
+from snake_game import (Partie, Direction, avancer_partie, changer_direction, est_joueur_piege,
+                        LARGEUR, HAUTEUR, HAUTEUR_PANNEAU, TAILLE_CASE, FPS, NOIR, ROUGE, VERT,
+                        TOUCHES_DIRECTION)
+
+JOUEURS_MIN = 2
+JOUEURS_MAX = 4
+
+# Les touches de chaque joueur (clavier français : Z Q S D)
+TOUCHES_JOUEURS = [
+    TOUCHES_DIRECTION,
+    {pygame.K_z: Direction.HAUT, pygame.K_s: Direction.BAS,
+     pygame.K_q: Direction.GAUCHE, pygame.K_d: Direction.DROITE},
+    {pygame.K_i: Direction.HAUT, pygame.K_k: Direction.BAS,
+     pygame.K_j: Direction.GAUCHE, pygame.K_l: Direction.DROITE},
+    {pygame.K_KP8: Direction.HAUT, pygame.K_KP5: Direction.BAS,
+     pygame.K_KP4: Direction.GAUCHE, pygame.K_KP6: Direction.DROITE},
+]
+
+# La couleur d'un joueur qui n'a pas encore choisi la sienne
+COULEURS_PAR_DEFAUT = [VERT, (0, 150, 255), (255, 150, 0), (200, 100, 255)]
+
+# Les plateaux sont dessinés à moitié taille
+TAILLE_CASE_VUE = TAILLE_CASE // 2
+LARGEUR_VUE = LARGEUR // 2
+HAUTEUR_VUE = (HAUTEUR - HAUTEUR_PANNEAU) // 2
+
+
+def disposer_vues(nombre_joueurs):
+    """
+    Les rectangles des vues dans la fenêtre, sous le panneau
+    2 joueurs : côte à côte ; 3 ou 4 joueurs : en carré
+    """
+    if nombre_joueurs == 2:
+        haut = HAUTEUR_PANNEAU + HAUTEUR_VUE // 2
+        return [pygame.Rect(0, haut, LARGEUR_VUE, HAUTEUR_VUE),
+                pygame.Rect(LARGEUR_VUE, haut, LARGEUR_VUE, HAUTEUR_VUE)]
+    return [pygame.Rect((i % 2) * LARGEUR_VUE, HAUTEUR_PANNEAU + (i // 2) * HAUTEUR_VUE,
+                        LARGEUR_VUE, HAUTEUR_VUE)
+            for i in range(nombre_joueurs)]
+
+
+class JoueurLocal:
+    """
+    Un joueur de l'écran partagé : sa partie, ses touches, sa couleur et sa vue
+    """
+    def __init__(self, nom, couleur, touches, vue, alea):
+        self.nom = nom
+        self.couleur = tuple(couleur)
+        self.touches = touches
+        self.vue = vue
+        self.partie = Partie(est_joueur_piege(nom), alea)
+        self.vivant = True
+
+    def vers_vue(self, case):
+        """
+        Position à l'écran d'une case du plateau (en pixels, plateau complet)
+        """
+        return (self.vue.x + case[0] // 2,
+                self.vue.y + (case[1] - HAUTEUR_PANNEAU) // 2)
+
+
+def creer_joueurs(noms, joueurs_enregistres, graine=None):
+    """
+    Un JoueurLocal par nom, avec sa couleur enregistrée (ou une couleur par défaut)
+    Tous les joueurs ont la même graine : les mêmes pommes au début, pour être juste
+    """
+    if graine is None:
+        graine = random.randrange(1 << 30)
+    vues = disposer_vues(len(noms))
+    joueurs = []
+    for numero, nom in enumerate(noms):
+        couleur = snake_game.obtenir_couleur_rgb_joueur(joueurs_enregistres, nom) or COULEURS_PAR_DEFAUT[numero]
+        joueurs.append(JoueurLocal(nom, couleur, TOUCHES_JOUEURS[numero], vues[numero], random.Random(graine)))
+    return joueurs
+
+
+def fabriquer_case(couleur):
+    """
+    Une case de la vue : un carré de couleur avec sa bordure noire
+    """
+    case = pygame.Surface((TAILLE_CASE_VUE, TAILLE_CASE_VUE))
+    case.fill(NOIR)
+    case.fill(couleur, (1, 1, TAILLE_CASE_VUE - 2, TAILLE_CASE_VUE - 2))
+    return case
+
+
+class RenduPartage:
+    """
+    Dessine toutes les vues en un seul passage
+    """
+    def __init__(self, joueurs):
+        self.police_nom = pygame.font.Font(None, 30)
+        self.police_score = pygame.font.Font(None, 28)
+        self.pomme = pygame.Surface((TAILLE_CASE_VUE, TAILLE_CASE_VUE))
+        self.pomme.fill(ROUGE)
+        # Pour chaque joueur : (case du corps, case de la tête), préparées une fois
+        self.cases = {}
+        for joueur in joueurs:
+            tete = tuple(min(c + 100, 255) for c in joueur.couleur)
+            self.cases[joueur.nom] = (fabriquer_case(joueur.couleur), fabriquer_case(tete))
+        # Le voile posé sur la vue d'un joueur qui a perdu
+        self.voile = pygame.Surface((LARGEUR_VUE, HAUTEUR_VUE), pygame.SRCALPHA)
+        self.voile.fill((0, 0, 0, 160))
+        perdu = pygame.font.Font(None, 60).render("PERDU", True, (255, 80, 80))
+        self.voile.blit(perdu, perdu.get_rect(center=(LARGEUR_VUE // 2, HAUTEUR_VUE // 2)))
+        # Le panneau n'est refait que quand un score change
+        self.panneau = pygame.Surface((LARGEUR, HAUTEUR_PANNEAU))
+        self.etat_panneau = None
+
+    def preparer_panneau(self, joueurs):
+        etat = [(joueur.partie.score, joueur.vivant) for joueur in joueurs]
+        if etat == self.etat_panneau:
+            return
+        self.etat_panneau = etat
+        self.panneau.fill((40, 40, 40))
+        largeur_colonne = LARGEUR // len(joueurs)
+        for numero, joueur in enumerate(joueurs):
+            centre = numero * largeur_colonne + largeur_colonne // 2
+            couleur = joueur.couleur if joueur.vivant else (120, 120, 120)
+            texte_nom = self.police_nom.render(joueur.nom, True, couleur)
+            self.panneau.blit(texte_nom, texte_nom.get_rect(midtop=(centre, 15)))
+            texte_score = self.police_score.render(f"Score: {joueur.partie.score}", True, couleur)
+            self.panneau.blit(texte_score, texte_score.get_rect(midtop=(centre, 45)))
+
+    def dessiner(self, ecran, joueurs):
+        """
+        Dessine le panneau et toutes les vues (ne met pas à jour l'affichage)
+        """
+        self.preparer_panneau(joueurs)
+        ecran.fill(NOIR)
+        # Toutes les copies de toutes les vues, faites ensuite en un seul appel
+        copies = [(self.panneau, (0, 0))]
+        for joueur in joueurs:
+            corps, tete = self.cases[joueur.nom]
+            serpent = joueur.partie.serpent
+            copies.extend((corps, joueur.vers_vue(case)) for case in serpent[1:])
+            copies.append((tete, joueur.vers_vue(serpent[0])))
+            copies.extend((self.pomme, joueur.vers_vue(pomme)) for pomme in joueur.partie.pommes)
+            if not joueur.vivant:
+                copies.append((self.voile, joueur.vue.topleft))
+        ecran.blits(copies, doreturn=False)
+        # Les bords des vues, par-dessus
+        for joueur in joueurs:
+            pygame.draw.rect(ecran, (100, 100, 100), joueur.vue, 1)
+        pygame.draw.line(ecran, (100, 100, 100), (0, HAUTEUR_PANNEAU), (LARGEUR, HAUTEUR_PANNEAU), 2)
+
+
+def jouer_ecran_partage(ecran, noms, joueurs_enregistres, scores, graine=None):
+    """
+    La boucle de l'écran partagé : retourne {nom: score}
+    Les scores sont ajoutés à l'historique de chaque joueur
+    """
+    joueurs = creer_joueurs(noms, joueurs_enregistres, graine)
+    rendu = RenduPartage(joueurs)
+    en_cours = True
+    while en_cours and any(joueur.vivant for joueur in joueurs):
+        for evenement in pygame.event.get():
+            if evenement.type == pygame.QUIT:
+                en_cours = False
+            elif evenement.type == pygame.KEYDOWN:
+                if evenement.key == pygame.K_ESCAPE:
+                    en_cours = False
+                for joueur in joueurs:
+                    if evenement.key in joueur.touches:
+                        changer_direction(joueur.partie, joueur.touches[evenement.key])
+
+        # Un seul pas pour tout le monde
+        for joueur in joueurs:
+            if joueur.vivant and avancer_partie(joueur.partie)["collision"] is not None:
+                joueur.vivant = False
+
+        rendu.dessiner(ecran, joueurs)
+        snake_game.mettre_a_jour_affichage(ecran, "partage")
+        snake_game.horloge.tick(FPS)
+
+    for joueur in joueurs:
+        snake_game.ajouter_score(scores, joueur.nom, joueur.partie.score)
+    return {joueur.nom: joueur.partie.score for joueur in joueurs}
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Snake à plusieurs sur le même écran")
+    parseur.add_argument("noms", nargs="+", help=f"les noms des joueurs ({JOUEURS_MIN} à {JOUEURS_MAX})")
+    parseur.add_argument("--graine", type=int, default=None, help="graine du hasard (mêmes pommes)")
+    parseur.add_argument("--profile", nargs="?", const="profil", metavar="PREFIXE",
+                         help="mesurer où le jeu passe son temps (écrit PREFIXE.folded et PREFIXE.txt)")
+    options = parseur.parse_args(arguments)
+    if not JOUEURS_MIN <= len(options.noms) <= JOUEURS_MAX:
+        parseur.error(f"il faut de {JOUEURS_MIN} à {JOUEURS_MAX} joueurs")
+    if len(set(options.noms)) != len(options.noms):
+        parseur.error("deux joueurs ont le même nom")
+
+    ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
+    pygame.display.set_caption("Snake - écran partagé")
+    # Profilage : le temps de la partie est rangé sous l'écran "partage" (voir profilage.py)
+    profileur = None
+    if options.profile:
+        from profilage import ProfileurEchantillons
+        profileur = ProfileurEchantillons()
+        profileur.demarrer()
+    scores = snake_game.charger_scores()
+    resultats = jouer_ecran_partage(ecran, options.noms, snake_game.charger_joueurs(), scores, options.graine)
+    snake_game.sauvegarde.arreter()
+    if profileur is not None:
+        profileur.arreter()
+        print(profileur.enregistrer(options.profile))
+        print(f"⏱️ Profil écrit dans {options.profile}.folded et {options.profile}.txt")
+    for nom, score in sorted(resultats.items(), key=lambda resultat: -resultat[1]):
+        print(f"{nom}: {score}")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
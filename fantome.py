@@ -0,0 +1,274 @@
+"""
+====================================================================
+            LE FANTÔME : FAIRE LA COURSE CONTRE SON RECORD
+====================================================================
+
+Pendant une partie, on note la position de la tête à chaque pas.
+Si la partie bat le record du joueur, ces positions deviennent son
+nouveau "fantôme". À la partie suivante, le fantôme rejoue le record
+en transparence, et on peut faire la course contre lui.
+
+Pour que le fichier reste tout petit, on n'écrit pas les positions
+mais le numéro de la case (0 à 1749 sur la grille de 50 x 35), et
+seulement la DIFFÉRENCE avec la case précédente. Le serpent avance
+d'une case à la fois, donc cette différence est presque toujours +1,
+-1, +50 ou -50 : elle tient dans un seul octet ("varint").
+
+Le fantôme est relu petit à petit depuis le disque pendant la partie :
+même un record très long n'occupe pas plus de mémoire.
+====================================================================
+"""
+
+import os
+import struct
+from collections import deque
+
+import pygame
+
+from snake_game import LARGEUR, HAUTEUR_PANNEAU, TAILLE_CASE
+
+DOSSIER_FANTOMES = "fantomes"
+
+# En-tête du fichier : "SNKG", score du record, longueur du serpent au départ
+MAGIQUE = b"SNKG"
+ENTETE = struct.Struct("<4sIH")
+
+# Nombre de cases sur une ligne de la grille
+COLONNES = LARGEUR // TAILLE_CASE
+
+COULEUR_FANTOME = (200, 200, 255)
+TRANSPARENCE_FANTOME = 90   # 0 = invisible, 255 = opaque
+
+
+def chemin_fantome(nom):
+    """
+    Le fichier du fantôme d'un joueur (le nom est nettoyé pour en faire un nom de fichier)
+    """
+    propre = "".join(c if c.isalnum() else "_" for c in nom.lower())
+    return os.path.join(DOSSIER_FANTOMES, propre + ".fantome")
+
+
+# ===================================================================
+# ÉCRIRE ET LIRE LES NOMBRES COMPACTS
+# ===================================================================
+
+def case_vers_numero(case):
+    x, y = case
+    return (y - HAUTEUR_PANNEAU) // TAILLE_CASE * COLONNES + x // TAILLE_CASE
+
+
+def numero_vers_case(numero):
+    ligne, colonne = divmod(numero, COLONNES)
+    return (colonne * TAILLE_CASE, HAUTEUR_PANNEAU + ligne * TAILLE_CASE)
+
+
+def encoder_varint(nombre):
+    """
+    Un entier positif en octets : 7 bits par octet, le 8e bit dit "il y a une suite"
+    """
+    octets = bytearray()
+    while nombre >= 0x80:
+        octets.append((nombre & 0x7F) | 0x80)
+        nombre >>= 7
+    octets.append(nombre)
+    return bytes(octets)
+
+
+def lire_varint(fichier):
+    """
+    Lit un entier écrit par encoder_varint (None à la fin du fichier)
+    """
+    nombre = 0
+    decalage = 0
+    while True:
+        octet = fichier.read(1)
+        if not octet:
+            return None
+        nombre |= (octet[0] & 0x7F) << decalage
+        if octet[0] < 0x80:
+            return nombre
+        decalage += 7
+
+
+# Les quatre pas normaux (droite, gauche, bas, haut) ont un petit code à eux
+PAS_NORMAUX = [1, -1, COLONNES, -COLONNES]
+
+
+def encoder_pas(numero_precedent, numero, a_grandi):
+    """
+    Un pas du serpent en un seul octet (presque toujours) :
+    - un code : 0 à 3 pour les pas normaux, sinon 4 + la différence de case
+      (les différences négatives deviennent impaires, les positives paires)
+    - un bit qui dit si le serpent a grandi
+    """
+    difference = numero - numero_precedent
+    if difference in PAS_NORMAUX:
+        code = PAS_NORMAUX.index(difference)
+    else:
+        code = 4 + (difference * 2 if difference >= 0 else -difference * 2 - 1)
+    return encoder_varint(code * 2 + a_grandi)
+
+
+def decoder_pas(numero_precedent, valeur):
+    code, a_grandi = divmod(valeur, 2)
+    if code < 4:
+        difference = PAS_NORMAUX[code]
+    else:
+        zigzag = code - 4
+        difference = zigzag // 2 if zigzag % 2 == 0 else -(zigzag + 1) // 2
+    return numero_precedent + difference, bool(a_grandi)
+
+
+def score_du_fantome(chemin):
+    """
+    Le score du record enregistré dans ce fichier (-1 s'il n'y en a pas)
+    """
+    try:
+        with open(chemin, 'rb') as f:
+            magique, score, _ = ENTETE.unpack(f.read(ENTETE.size))
+    except (OSError, struct.error):
+        return -1
+    return score if magique == MAGIQUE else -1
+
+
+# ===================================================================
+# ENREGISTRER LA PARTIE EN COURS
+# ===================================================================
+
+class EnregistreurFantome:
+    """
+    Note les pas de la partie dans un fichier temporaire, qui remplace le
+    fantôme du joueur seulement si la partie bat son record
+    """
+    def __init__(self, nom, serpent_depart):
+        os.makedirs(DOSSIER_FANTOMES, exist_ok=True)
+        self.chemin = chemin_fantome(nom)
+        self.fichier = open(self.chemin + ".tmp", 'wb')
+        self.longueur_depart = len(serpent_depart)
+        self.fichier.write(ENTETE.pack(MAGIQUE, 0, self.longueur_depart))
+        self.numero_precedent = 0
+        # Le serpent de départ, de la queue vers la tête (comme s'il grandissait)
+        for case in reversed(serpent_depart):
+            self.noter_case(case, True)
+
+    def noter_case(self, case, a_grandi):
+        numero = case_vers_numero(case)
+        self.fichier.write(encoder_pas(self.numero_precedent, numero, a_grandi))
+        self.numero_precedent = numero
+
+    def noter(self, changements):
+        """
+        Note un pas (changements : le résultat d'avancer_partie)
+        """
+        self.noter_case(changements["tete"], changements["queue"] is None)
+
+    def abandonner(self):
+        """
+        Oublie la partie en cours (elle ne deviendra pas un fantôme)
+        """
+        self.fichier.close()
+        os.remove(self.chemin + ".tmp")
+
+    def terminer(self, score, meilleur_score=0):
+        """
+        Garde la partie comme nouveau fantôme si elle bat le record
+        meilleur_score : le meilleur score du joueur dans scores.json (avant
+        cette partie) ; le record est le plus grand de ce score et de celui
+        du fantôme, pour que le premier fantôme soit vraiment le record
+        Retourne True si le fantôme a été remplacé
+        """
+        if score <= max(score_du_fantome(self.chemin), meilleur_score):
+            self.abandonner()
+            return False
+        # Écrire le vrai score dans l'en-tête, puis remplacer l'ancien fantôme
+        self.fichier.seek(0)
+        self.fichier.write(ENTETE.pack(MAGIQUE, score, self.longueur_depart))
+        self.fichier.close()
+        os.replace(self.chemin + ".tmp", self.chemin)
+        return True
+
+
+# ===================================================================
+# REJOUER LE FANTÔME
+# ===================================================================
+
+class LecteurFantome:
+    """
+    Relit le fantôme pas à pas et le dessine d'un seul coup (un seul appel
+    à blits) avec une case transparente préparée à l'avance
+    """
+    def __init__(self, chemin, couleur=COULEUR_FANTOME):
+        # Lecture par petits blocs : le fichier n'est jamais chargé en entier
+        self.fichier = open(chemin, 'rb')
+        magique, self.score, longueur_depart = ENTETE.unpack(self.fichier.read(ENTETE.size))
+        if magique != MAGIQUE:
+            self.fichier.close()
+            raise ValueError(f"{chemin} n'est pas un fichier de fantôme")
+        # La case transparente, préparée une seule fois
+        self.case_fantome = pygame.Surface((TAILLE_CASE, TAILLE_CASE))
+        self.case_fantome.fill(couleur)
+        self.case_fantome.set_alpha(TRANSPARENCE_FANTOME)
+        # (case transparente, position) de la queue (à gauche) vers la tête (à droite),
+        # déjà prêt pour blits
+        self.corps = deque()
+        self.numero = 0
+        self.termine = False
+        self.longueur_depart = longueur_depart
+        self.pas_lus = 0    # Appels à avancer() (même après la fin du record)
+
+        for _ in range(longueur_depart):
+            self.avancer()
+
+    def avancer(self):
+        """
+        Fait avancer le fantôme d'un pas (il disparaît à la fin de son record)
+        """
+        self.pas_lus += 1
+        if self.termine:
+            return
+        valeur = lire_varint(self.fichier)
+        if valeur is None:
+            self.termine = True
+            self.corps.clear()
+            return
+        self.numero, a_grandi = decoder_pas(self.numero, valeur)
+        if not a_grandi and self.corps:
+            self.corps.popleft()
+        self.corps.append((self.case_fantome, numero_vers_case(self.numero)))
+
+    def reculer(self, nombre_pas):
+        """
+        Revient nombre_pas pas en arrière (après un rembobinage de la partie)
+        Le fichier ne se lit que dans un sens : on repart du début et on
+        refait les pas jusqu'au bon endroit
+        """
+        cible = max(self.longueur_depart, self.pas_lus - nombre_pas)
+        self.fichier.seek(ENTETE.size)
+        self.corps.clear()
+        self.numero = 0
+        self.termine = False
+        self.pas_lus = 0
+        for _ in range(cible):
+            self.avancer()
+
+    def cases(self):
+        """
+        Les cases du fantôme, de la tête vers la queue (comme partie.serpent)
+        """
+        return [case for _, case in reversed(self.corps)]
+
+    def dessiner(self, ecran):
+        ecran.blits(self.corps, doreturn=False)
+
+    def fermer(self):
+        self.fichier.close()
+
+
+def ouvrir_fantome(nom, couleur=COULEUR_FANTOME):
+    """
+    Le fantôme du joueur, ou None s'il n'en a pas encore
+    """
+    try:
+        return LecteurFantome(chemin_fantome(nom), couleur)
+    except (OSError, ValueError, struct.error):
+        return None
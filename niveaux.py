@@ -0,0 +1,181 @@
+"""
+====================================================================
+            LES NIVEAUX : DES MURS SUR LE PLATEAU
+====================================================================
+
+Un niveau est un simple fichier texte dans le dossier niveaux/ : une
+ligne du fichier = une ligne du plateau, un caractère = une case.
+
+    #  un mur
+    .  une case libre (un espace aussi)
+
+Le fichier peut être plus petit que le plateau (le reste est libre).
+
+Au chargement, le niveau est "compilé" une seule fois :
+- une carte des murs (un octet par case, 1 = mur) avec une bordure de
+  murs tout autour : savoir si la tête touche un mur, ou sort du
+  plateau, c'est lire UNE case de la carte ;
+- la liste des cases libres qu'on peut atteindre depuis le départ :
+  les pommes n'apparaissent que là (jamais dans un mur, ni dans une
+  pièce fermée où le serpent ne peut pas entrer) ;
+- l'image des murs, dessinée une fois et copiée à chaque image du jeu.
+
+    python snake_game.py --niveau boites
+====================================================================
+"""
+
+import os
+from collections import deque
+
+import pygame
+
+from snake_game import LARGEUR_PLATEAU, HAUTEUR_PLATEAU, HAUTEUR_PANNEAU, TAILLE_CASE, NOIR
+
+# Les niveaux fournis avec le jeu, à côté de ce fichier (quel que soit le dossier courant)
+DOSSIER_NIVEAUX = os.path.join(os.path.dirname(os.path.abspath(__file__)), "niveaux")
+CARACTERE_MUR = "#"
+COULEUR_MUR = (110, 110, 130)
+
+# Les pommes "près des bords" (pièges) : à moins de ... cases du bord
+DISTANCE_BORD = 3
+
+# Essais au hasard avant de chercher les cases libres une par une
+ESSAIS_POMME = 100
+
+
+def position_depart(largeur_plateau, hauteur_plateau):
+    """
+    Les cases du serpent au départ (comme dans Partie), en numéros (colonne, ligne)
+    """
+    tete_x = (largeur_plateau // 2) // TAILLE_CASE
+    tete_y = ((hauteur_plateau // 2) // TAILLE_CASE * TAILLE_CASE - HAUTEUR_PANNEAU) // TAILLE_CASE
+    return [(tete_x, tete_y), (tete_x - 1, tete_y), (tete_x - 2, tete_y)]
+
+
+class Niveau:
+    """
+    Un niveau compilé : la carte des murs, les cases accessibles et l'image des murs
+    """
+    def __init__(self, nom, murs, colonnes, lignes):
+        self.nom = nom
+        self.colonnes = colonnes
+        self.lignes = lignes
+        self.murs_cases = sorted(murs)
+
+        # La carte : (colonnes + 2) x (lignes + 2) octets, la bordure est un mur
+        self.largeur_carte = colonnes + 2
+        self.carte = bytearray([1]) * (self.largeur_carte * (lignes + 2))
+        for ligne in range(lignes):
+            debut = (ligne + 1) * self.largeur_carte + 1
+            self.carte[debut:debut + colonnes] = bytes(colonnes)
+        for colonne, ligne in murs:
+            self.carte[(ligne + 1) * self.largeur_carte + colonne + 1] = 1
+
+        depart = position_depart(colonnes * TAILLE_CASE, HAUTEUR_PANNEAU + lignes * TAILLE_CASE)
+        tete_colonne, tete_ligne = depart[0]
+        if any(self.mur_en(colonne, ligne) for colonne, ligne in depart + [(tete_colonne + 1, tete_ligne)]):
+            raise ValueError(f"Niveau {nom} : le serpent doit pouvoir partir (cases {depart} et celle devant)")
+
+        # Les cases libres accessibles depuis le départ, en pixels
+        self.accessibles = [self.vers_pixels(case) for case in self.remplir_depuis(depart[0])]
+        self.accessibles_bord = [
+            (x, y) for x, y in self.accessibles
+            if min(x // TAILLE_CASE, colonnes - 1 - x // TAILLE_CASE,
+                   (y - HAUTEUR_PANNEAU) // TAILLE_CASE, lignes - 1 - (y - HAUTEUR_PANNEAU) // TAILLE_CASE) < DISTANCE_BORD
+        ]
+        self.couche = None
+
+    def mur_en(self, colonne, ligne):
+        return self.carte[(ligne + 1) * self.largeur_carte + colonne + 1] == 1
+
+    def vers_pixels(self, case):
+        colonne, ligne = case
+        return (colonne * TAILLE_CASE, HAUTEUR_PANNEAU + ligne * TAILLE_CASE)
+
+    def est_mur(self, position):
+        """
+        True si la case (en pixels) est un mur ou hors du plateau : une seule lecture
+        """
+        return self.carte[((position[1] - HAUTEUR_PANNEAU) // TAILLE_CASE + 1) * self.largeur_carte
+                          + position[0] // TAILLE_CASE + 1] == 1
+
+    def remplir_depuis(self, depart):
+        """
+        Toutes les cases libres qu'on peut atteindre depuis depart (parcours en largeur)
+        """
+        vues = {depart}
+        a_visiter = deque([depart])
+        while a_visiter:
+            colonne, ligne = a_visiter.popleft()
+            for voisine in ((colonne + 1, ligne), (colonne - 1, ligne), (colonne, ligne + 1), (colonne, ligne - 1)):
+                if voisine not in vues and not self.mur_en(*voisine):
+                    vues.add(voisine)
+                    a_visiter.append(voisine)
+        return sorted(vues, key=lambda case: (case[1], case[0]))
+
+    def generer_pomme(self, serpent, piege, alea, proba_bord):
+        """
+        Une pomme sur une case accessible, pas sous le serpent
+        (près des bords avec la probabilité proba_bord si le joueur est piégé)
+        """
+        cases = self.accessibles
+        if piege and self.accessibles_bord and alea.random() < proba_bord:
+            cases = self.accessibles_bord
+        for _ in range(ESSAIS_POMME):
+            case = alea.choice(cases)
+            if case not in serpent:
+                return case
+        # Serpent immense : on cherche parmi les cases vraiment libres
+        occupees = set(serpent)
+        libres = [case for case in self.accessibles if case not in occupees]
+        return alea.choice(libres or cases)
+
+    def couche_murs(self):
+        """
+        L'image du plateau avec ses murs, dessinée la première fois seulement
+        """
+        if self.couche is None:
+            self.couche = pygame.Surface((self.colonnes * TAILLE_CASE, self.lignes * TAILLE_CASE))
+            self.couche.fill(NOIR)
+            for colonne, ligne in self.murs_cases:
+                case = (colonne * TAILLE_CASE, ligne * TAILLE_CASE, TAILLE_CASE, TAILLE_CASE)
+                self.couche.fill(COULEUR_MUR, case)
+                pygame.draw.rect(self.couche, NOIR, case, 1)
+        return self.couche
+
+
+def compiler_niveau(texte, nom="niveau", largeur_plateau=LARGEUR_PLATEAU, hauteur_plateau=HAUTEUR_PLATEAU):
+    """
+    Transforme le texte d'un niveau en Niveau
+    """
+    colonnes = largeur_plateau // TAILLE_CASE
+    lignes = (hauteur_plateau - HAUTEUR_PANNEAU) // TAILLE_CASE
+    rangees = texte.rstrip("\n").split("\n")
+    if len(rangees) > lignes or any(len(rangee.rstrip()) > colonnes for rangee in rangees):
+        raise ValueError(f"Niveau {nom} : plus grand que le plateau ({colonnes}x{lignes})")
+    murs = [(colonne, ligne)
+            for ligne, rangee in enumerate(rangees)
+            for colonne, caractere in enumerate(rangee)
+            if caractere == CARACTERE_MUR]
+    return Niveau(nom, murs, colonnes, lignes)
+
+
+def niveaux_disponibles():
+    """
+    Les noms des niveaux fournis avec le jeu
+    """
+    try:
+        return sorted(os.path.splitext(fichier)[0] for fichier in os.listdir(DOSSIER_NIVEAUX)
+                      if fichier.endswith(".txt"))
+    except OSError:
+        return []
+
+
+def charger_niveau(nom, largeur_plateau=LARGEUR_PLATEAU, hauteur_plateau=HAUTEUR_PLATEAU):
+    """
+    Charge le fichier NOM s'il existe, sinon le niveau NOM.txt fourni avec le jeu
+    """
+    chemin = nom if os.path.exists(nom) else os.path.join(DOSSIER_NIVEAUX, nom + ".txt")
+    with open(chemin, encoding="utf-8") as f:
+        return compiler_niveau(f.read(), os.path.splitext(os.path.basename(chemin))[0],
+                               largeur_plateau, hauteur_plateau)
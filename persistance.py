@@ -0,0 +1,135 @@
+"""
+====================================================================
+            SAUVEGARDE DIFFÉRÉE DES FICHIERS JSON
+====================================================================
+
+Écrire sur le disque peut être lent (surtout sur une carte SD). Pour
+que le jeu ne se fige pas, on ne l'écrit pas tout de suite :
+
+1. Le jeu "marque" un fichier comme modifié (c'est très rapide).
+2. Un fil d'exécution (thread) en arrière-plan écrit les fichiers
+   marqués un peu plus tard, en regroupant les modifications.
+3. Si le contenu n'a pas changé depuis la dernière écriture, on
+   n'écrit rien du tout.
+4. À la fin du jeu, tout ce qui reste est écrit avant de quitter.
+5. Si l'écriture échoue (disque plein, fichier protégé...), un message
+   l'explique et le fichier est réessayé un peu plus tard.
+====================================================================
+"""
+
+import atexit
+import json
+import os
+import threading
+
+# Temps d'attente (en secondes) avant d'écrire, pour regrouper les modifications
+INTERVALLE_SAUVEGARDE = 2.0
+
+
+class SauvegardeDifferee:
+    """
+    Garde les fichiers modifiés en attente et les écrit en arrière-plan
+    """
+    def __init__(self, intervalle=INTERVALLE_SAUVEGARDE):
+        self.intervalle = intervalle
+        self.a_ecrire = {}      # chemin -> texte JSON en attente d'écriture
+        self.deja_ecrit = {}    # chemin -> dernier texte JSON écrit
+        self.nombre_ecritures = 0
+        self.erreurs = {}       # chemin -> dernière erreur d'écriture (pour ne l'afficher qu'une fois)
+        self.arret_demande = False
+        self.fil = None
+        self.arret_a_la_sortie = False
+        # Protège a_ecrire et deja_ecrit (partagés entre le jeu et le fil d'écriture)
+        self.condition = threading.Condition()
+        # Un seul lot écrit à la fois : une vieille version ne peut pas écraser une plus récente
+        self.verrou_disque = threading.Lock()
+
+    def marquer(self, chemin, donnees):
+        """
+        Indique que le fichier doit contenir ces données (écrit plus tard)
+        Retourne False si le contenu est identique à ce qui est déjà écrit
+        """
+        # On transforme en texte tout de suite : le jeu peut continuer à
+        # modifier ses dictionnaires pendant que le fil écrit ce texte
+        texte = json.dumps(donnees, indent=2)
+        # Le chemin complet tout de suite : l'écriture a lieu plus tard, peut-être
+        # après un changement de dossier courant
+        chemin = os.path.abspath(chemin)
+        with self.condition:
+            if texte == self.deja_ecrit.get(chemin):
+                self.a_ecrire.pop(chemin, None)
+                return False
+            self.a_ecrire[chemin] = texte
+            if self.fil is None and not self.arret_demande:
+                self.fil = threading.Thread(target=self.boucle, name="sauvegarde", daemon=True)
+                self.fil.start()
+                # Au cas où le programme se termine sans appeler arreter()
+                if not self.arret_a_la_sortie:
+                    atexit.register(self.arreter)
+                    self.arret_a_la_sortie = True
+            self.condition.notify_all()
+        return True
+
+    def boucle(self):
+        """
+        Le fil d'écriture : attend des modifications, patiente un peu pour
+        les regrouper, puis écrit tout le lot
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.a_ecrire or self.arret_demande)
+                if self.arret_demande:
+                    return
+                self.condition.wait_for(lambda: self.arret_demande, timeout=self.intervalle)
+            self.vider()
+
+    def vider(self):
+        """
+        Écrit tout de suite tous les fichiers en attente
+        """
+        with self.verrou_disque:
+            with self.condition:
+                lot = self.a_ecrire
+                self.a_ecrire = {}
+            for chemin, texte in lot.items():
+                try:
+                    ecrire_fichier(chemin, texte)
+                except OSError as erreur:
+                    if str(erreur) != self.erreurs.get(chemin):
+                        print(f"⚠️ Impossible d'écrire {chemin} ({erreur}) : nouvel essai plus tard")
+                        self.erreurs[chemin] = str(erreur)
+                    # On le remet en attente, sauf si une version plus récente est déjà marquée
+                    with self.condition:
+                        self.a_ecrire.setdefault(chemin, texte)
+                    continue
+                if self.erreurs.pop(chemin, None) is not None:
+                    print(f"✅ {chemin} est de nouveau sauvegardé")
+                self.nombre_ecritures += 1
+                with self.condition:
+                    self.deja_ecrit[chemin] = texte
+
+    def arreter(self):
+        """
+        Arrête le fil d'écriture et écrit ce qui reste (à appeler avant de quitter)
+        """
+        with self.condition:
+            self.arret_demande = True
+            self.condition.notify_all()
+        if self.fil is not None and self.fil is not threading.current_thread():
+            self.fil.join()
+        self.vider()
+        # Prêt à redémarrer si on marque encore un fichier (nouvelle partie, tests...)
+        with self.condition:
+            self.fil = None
+            self.arret_demande = False
+
+
+def ecrire_fichier(chemin, texte):
+    """
+    Écrit d'abord dans un fichier temporaire puis le renomme : si le jeu
+    s'arrête au milieu, l'ancien fichier reste intact
+    """
+    temporaire = chemin + ".tmp"
+    with open(temporaire, 'w') as f:
+        f.write(texte)
+    os.replace(temporaire, chemin)
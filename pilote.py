@@ -0,0 +1,168 @@
+"""
+====================================================================
+            PILOTE AUTOMATIQUE : JOUER UN SCÉNARIO SANS PERSONNE
+====================================================================
+
+Pour tester tout le jeu (menu, nom, partie, fin...) sans fenêtre et
+sans attendre, on remplace deux choses :
+
+1. Le clavier et la souris : un "scénario" dit quelles touches envoyer
+   quand un écran apparaît. Par exemple : quand l'écran "nom" s'affiche,
+   taper "Zoe" puis ENTRÉE.
+2. Le temps : une horloge virtuelle remplace pygame.time.get_ticks et
+   l'horloge du jeu. Quand le jeu veut attendre, le temps avance d'un
+   coup au lieu de dormir : le compte à rebours de 3 secondes dure
+   quelques millisecondes, et la partie se déroule toujours pareil.
+
+    scenario = [
+        ("menu", [clic(position_du_bouton)]),
+        ("nom", taper("Zoe") + [touche(pygame.K_RETURN)]),
+        ("fin", [touche(pygame.K_q)]),
+    ]
+    pilote = jouer_scenario(scenario)
+====================================================================
+"""
+
+import random
+
+import pygame
+
+import snake_game
+
+# Si le jeu attend plus longtemps que ça (en temps virtuel) sans rien recevoir,
+# c'est que le scénario est fini (on ferme le jeu) ou bloqué (erreur)
+ATTENTE_MAX_MS = 60 * 1000
+
+
+# ===================================================================
+# FABRIQUER DES ÉVÉNEMENTS
+# ===================================================================
+
+def touche(code, texte=""):
+    """
+    Un appui sur une touche (code : pygame.K_...)
+    """
+    return pygame.event.Event(pygame.KEYDOWN, key=code, unicode=texte, mod=0, scancode=0)
+
+
+def taper(texte):
+    """
+    Les appuis sur les touches pour écrire ce texte
+    """
+    return [touche(ord(lettre.lower()), lettre) for lettre in texte]
+
+
+def clic(position):
+    """
+    Un clic gauche à cette position de la fenêtre
+    """
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=position, button=1)
+
+
+# ===================================================================
+# LE TEMPS VIRTUEL
+# ===================================================================
+
+class HorlogeVirtuelle:
+    """
+    Remplace pygame.time.Clock et pygame.time.get_ticks : le temps
+    n'avance que quand le jeu attend, et sans dormir
+    """
+    def __init__(self):
+        self.maintenant_ms = 0
+        self.fps = 0
+
+    def get_ticks(self):
+        return self.maintenant_ms
+
+    def avancer(self, duree_ms):
+        self.maintenant_ms += duree_ms
+
+    def tick(self, fps=0):
+        """
+        Comme Clock.tick : passe le temps d'une image et retourne sa durée
+        """
+        duree_ms = 1000 // fps if fps else 0
+        self.avancer(duree_ms)
+        self.fps = fps
+        return duree_ms
+
+    def get_fps(self):
+        return float(self.fps)
+
+
+# ===================================================================
+# LE PILOTE
+# ===================================================================
+
+class PiloteScenario:
+    """
+    Joue un scénario : à chaque image affichée, regarde si c'est l'écran
+    attendu par la prochaine étape, et si oui envoie ses événements
+    """
+    def __init__(self, scenario):
+        self.etapes = list(scenario)
+        self.horloge = HorlogeVirtuelle()
+        self.ecrans = []         # Les noms des écrans affichés, image par image
+        self.attente_ms = 0      # Temps passé à attendre sans rien recevoir
+
+    def image_affichee(self, nom_ecran):
+        self.ecrans.append(nom_ecran)
+        self.attente_ms = 0
+        if self.etapes and self.etapes[0][0] == nom_ecran:
+            _, evenements = self.etapes.pop(0)
+            for evenement in evenements:
+                pygame.event.post(evenement)
+
+    def attendre_evenements(self, delai_ms=snake_game.ATTENTE_ECRAN_MS):
+        """
+        Remplace snake_game.attendre_evenements : pas d'attente réelle
+        """
+        evenements = pygame.event.get()
+        if evenements:
+            self.attente_ms = 0
+            return evenements
+        self.horloge.avancer(delai_ms)
+        self.attente_ms += delai_ms
+        if self.attente_ms > ATTENTE_MAX_MS:
+            if self.etapes:
+                raise RuntimeError(f"Le jeu attend sur l'écran {self.ecrans[-1]!r} "
+                                   f"mais le scénario attend l'écran {self.etapes[0][0]!r}")
+            # Scénario fini : on ferme la fenêtre
+            self.attente_ms = 0
+            return [pygame.event.Event(pygame.QUIT)]
+        return []
+
+
+def jouer_scenario(scenario, arguments=(), graine=0):
+    """
+    Lance le jeu complet (snake_game.main) en suivant le scénario
+    Retourne le pilote (pour regarder les écrans affichés, le temps virtuel...)
+    """
+    pilote = PiloteScenario(scenario)
+    afficher = snake_game.mettre_a_jour_affichage
+
+    def mettre_a_jour_affichage(ecran, nom_ecran):
+        afficher(ecran, nom_ecran)
+        pilote.image_affichee(nom_ecran)
+
+    anciens = {
+        (snake_game, "horloge"): snake_game.horloge,
+        (snake_game, "attendre_evenements"): snake_game.attendre_evenements,
+        (snake_game, "mettre_a_jour_affichage"): afficher,
+        (pygame.time, "get_ticks"): pygame.time.get_ticks,
+        (pygame, "quit"): pygame.quit,
+    }
+    snake_game.horloge = pilote.horloge
+    snake_game.attendre_evenements = pilote.attendre_evenements
+    snake_game.mettre_a_jour_affichage = mettre_a_jour_affichage
+    pygame.time.get_ticks = pilote.horloge.get_ticks
+    # main() ferme Pygame en partant : on le garde ouvert pour la suite (tests...)
+    pygame.quit = lambda: None
+    random.seed(graine)
+    try:
+        snake_game.main(list(arguments))
+    finally:
+        for (module, nom), valeur in anciens.items():
+            setattr(module, nom, valeur)
+    return pilote
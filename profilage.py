@@ -0,0 +1,145 @@
+"""
+====================================================================
+            PROFILAGE : OÙ LE JEU PASSE-T-IL SON TEMPS ?
+====================================================================
+
+Avec l'option --profile, un petit fil d'exécution regarde très
+souvent (toutes les quelques millisecondes) ce que fait le jeu : la
+liste des fonctions en cours d'appel, qu'on appelle la "pile".
+
+Chaque échantillon est rangé selon l'écran affiché à ce moment-là
+(menu, saisie du nom, partie, fin...), qu'on reconnaît grâce aux
+fonctions présentes dans la pile.
+
+À la fin on écrit :
+- PREFIXE.folded : les piles "repliées", une par ligne, pour
+  dessiner un flamegraph (flamegraph.pl, speedscope...)
+- PREFIXE.txt    : les fonctions qui prennent le plus de temps,
+  écran par écran
+====================================================================
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+
+# Intervalle entre deux échantillons (en secondes)
+INTERVALLE_ECHANTILLONS = 0.005
+
+# Nombre de fonctions montrées dans le résumé, pour chaque écran
+NOMBRE_FONCTIONS_RESUME = 15
+
+# La fonction dans la pile -> l'écran affiché
+# (la plus proche du haut de la pile l'emporte)
+ECRANS = {
+    "afficher_menu": "menu",
+    "demander_nom_joueur": "nom",
+    "afficher_transition_compte_a_rebours": "compte_a_rebours",
+    "afficher_ecran_pause": "pause",
+    "afficher_feu_artifice": "feu_artifice",
+    "afficher_ecran_fin": "fin",
+    "jouer_ecran_partage": "partage",
+}
+# Dans main() mais dans aucun de ces écrans : c'est la partie en cours
+ECRAN_PAR_DEFAUT = "partie"
+
+
+def nom_fonction(cadre):
+    """
+    Nom lisible d'une fonction de la pile : "fichier.py:fonction"
+    """
+    code = cadre.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class ProfileurEchantillons:
+    """
+    Échantillonne régulièrement la pile d'un fil d'exécution (par défaut,
+    celui qui crée le profileur : le jeu)
+    """
+    def __init__(self, intervalle=INTERVALLE_ECHANTILLONS, fil_cible=None):
+        self.intervalle = intervalle
+        self.id_cible = fil_cible if fil_cible is not None else threading.get_ident()
+        self.piles = Counter()       # (écran, fonction1, fonction2, ...) -> nombre d'échantillons
+        self.arret = threading.Event()
+        self.fil = None
+
+    def demarrer(self):
+        self.fil = threading.Thread(target=self.boucle, name="profileur", daemon=True)
+        self.fil.start()
+
+    def arreter(self):
+        self.arret.set()
+        if self.fil is not None:
+            self.fil.join()
+
+    def boucle(self):
+        while not self.arret.wait(self.intervalle):
+            self.echantillonner()
+
+    def echantillonner(self):
+        """
+        Note la pile actuelle du fil surveillé
+        """
+        cadre = sys._current_frames().get(self.id_cible)
+        if cadre is None:
+            return
+        # Remonter la pile (de la fonction en cours jusqu'au début du programme)
+        pile = []
+        ecran = None
+        while cadre is not None:
+            if ecran is None:
+                ecran = ECRANS.get(cadre.f_code.co_name)
+            pile.append(nom_fonction(cadre))
+            cadre = cadre.f_back
+        pile.reverse()
+        self.piles[(ecran or ECRAN_PAR_DEFAUT,) + tuple(pile)] += 1
+
+    def ecrire_piles_repliees(self, chemin):
+        """
+        Format "replié" : ecran;fonction1;fonction2 nombre
+        """
+        with open(chemin, 'w') as f:
+            for pile, nombre in sorted(self.piles.items()):
+                f.write(";".join(pile) + f" {nombre}\n")
+
+    def resume(self, nombre_fonctions=NOMBRE_FONCTIONS_RESUME):
+        """
+        Texte qui montre, pour chaque écran, les fonctions les plus coûteuses
+        "propre" : temps passé dans la fonction elle-même
+        "total"  : temps passé dans la fonction et celles qu'elle appelle
+        """
+        total_echantillons = sum(self.piles.values()) or 1
+        par_ecran = {}
+        for pile, nombre in self.piles.items():
+            ecran, fonctions = pile[0], pile[1:]
+            stats = par_ecran.setdefault(ecran, {"echantillons": 0, "propre": Counter(), "total": Counter()})
+            stats["echantillons"] += nombre
+            if fonctions:
+                stats["propre"][fonctions[-1]] += nombre
+            # Une fonction récursive ne compte qu'une fois par échantillon
+            for fonction in set(fonctions):
+                stats["total"][fonction] += nombre
+
+        lignes = [f"Profil : {total_echantillons} échantillons "
+                  f"(un toutes les {self.intervalle * 1000:.0f} ms)"]
+        for ecran, stats in sorted(par_ecran.items(), key=lambda x: x[1]["echantillons"], reverse=True):
+            part = 100 * stats["echantillons"] / total_echantillons
+            lignes.append("")
+            lignes.append(f"=== {ecran} : {stats['echantillons']} échantillons ({part:.1f}%) ===")
+            lignes.append(f"{'propre':>8} {'total':>8}  fonction")
+            for fonction, propre in stats["propre"].most_common(nombre_fonctions):
+                lignes.append(f"{propre:8} {stats['total'][fonction]:8}  {fonction}")
+        return "\n".join(lignes)
+
+    def enregistrer(self, prefixe):
+        """
+        Écrit PREFIXE.folded et PREFIXE.txt, et retourne le résumé
+        """
+        self.ecrire_piles_repliees(prefixe + ".folded")
+        texte = self.resume()
+        with open(prefixe + ".txt", 'w') as f:
+            f.write(texte + "\n")
+        return texte
+
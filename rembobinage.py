@@ -0,0 +1,119 @@
+"""
+====================================================================
+            REMBOBINER LA PARTIE DE QUELQUES SECONDES
+====================================================================
+
+Pour revenir en arrière (mode enfant : on continue après un choc), il
+faut se souvenir des derniers pas de la partie. Copier tout le serpent
+à chaque pas coûterait cher (longueur du serpent x nombre de pas), alors
+on garde seulement :
+
+- pour chaque pas, ce qui a changé : la case de tête ajoutée, la case
+  de queue retirée, la direction et le mode triche (quelques octets) ;
+- tous les 10 pas, une "image clé" : les pommes, le score, la direction
+  et l'état du hasard (pour que les pommes suivantes soient les mêmes).
+
+Pour revenir au pas T : on défait les pas un par un jusqu'à l'image clé
+juste avant T (on enlève la tête, on remet la queue), on reprend les
+pommes et le hasard de l'image clé, puis on rejoue les pas jusqu'à T
+avec les mêmes directions. La partie est alors exactement comme au pas T.
+
+Les pas plus anciens que la fenêtre sont oubliés : la mémoire utilisée
+ne dépend que de la durée qu'on peut rembobiner.
+====================================================================
+"""
+
+from collections import deque
+
+from snake_game import FPS, avancer_partie
+
+# On peut revenir jusqu'à 3 secondes en arrière
+SECONDES_REMBOBINAGE = 3
+
+# Une image clé tous les ... pas
+INTERVALLE_IMAGE_CLE = 10
+
+
+class Rembobinage:
+    """
+    Se souvient des derniers pas d'une partie pour pouvoir revenir en arrière
+    Appeler noter() après chaque pas réussi d'avancer_partie
+    """
+    def __init__(self, partie, pas_max=SECONDES_REMBOBINAGE * FPS):
+        self.partie = partie
+        self.pas_max = pas_max
+        self.numero_pas = 0
+        # On garde un peu plus que pas_max : il faut toujours une image clé
+        # avant le pas le plus ancien qu'on veut pouvoir retrouver
+        self.pas = deque(maxlen=pas_max + INTERVALLE_IMAGE_CLE)   # (tête, queue, direction, triche)
+        self.images_cles = deque()                                 # (numéro du pas, état)
+        self.noter_image_cle()
+
+    def noter_image_cle(self):
+        partie = self.partie
+        etat = (list(partie.pommes), partie.score, partie.direction, partie.mode_triche,
+                partie.alea.getstate())
+        self.images_cles.append((self.numero_pas, etat))
+
+    def noter(self, changements):
+        """
+        Note le pas qui vient d'être joué (changements : le résultat d'avancer_partie)
+        """
+        self.numero_pas += 1
+        self.pas.append((changements["tete"], changements["queue"],
+                         self.partie.direction, self.partie.mode_triche))
+        if self.numero_pas % INTERVALLE_IMAGE_CLE == 0:
+            self.noter_image_cle()
+        # Oublier les images clés plus anciennes que le plus vieux pas gardé
+        # (on ne pourrait plus défaire les pas jusqu'à elles)
+        plus_ancien = self.numero_pas - len(self.pas)
+        while self.images_cles[0][0] < plus_ancien:
+            self.images_cles.popleft()
+
+    def pas_disponibles(self):
+        """
+        De combien de pas on peut revenir en arrière au plus
+        """
+        return min(self.pas_max, self.numero_pas - self.images_cles[0][0])
+
+    def rembobiner(self, nombre_pas):
+        """
+        Remet la partie comme elle était nombre_pas pas plus tôt
+        (ou aussi loin que possible) et retourne le nombre de pas défaits
+        """
+        nombre_pas = min(nombre_pas, self.pas_disponibles())
+        cible = self.numero_pas - nombre_pas
+
+        # L'image clé la plus récente avant la cible
+        while self.images_cles[-1][0] > cible:
+            self.images_cles.pop()
+        numero_cle, (pommes, score, direction, mode_triche, etat_alea) = self.images_cles[-1]
+
+        # Défaire les pas jusqu'à l'image clé, en gardant ceux à rejouer
+        serpent = self.partie.serpent
+        a_rejouer = []
+        for _ in range(self.numero_pas - numero_cle):
+            tete, queue, direction_pas, triche_pas = self.pas.pop()
+            serpent.pop(0)
+            if queue is not None:
+                serpent.append(queue)
+            a_rejouer.append((direction_pas, triche_pas))
+        self.numero_pas = numero_cle
+
+        # Reprendre l'état de l'image clé
+        partie = self.partie
+        partie.pommes[:] = pommes
+        partie.score = score
+        partie.direction = partie.direction_demandee = direction
+        partie.mode_triche = mode_triche
+        partie.alea.setstate(etat_alea)
+
+        # Rejouer les pas jusqu'à la cible, avec les mêmes directions
+        a_rejouer.reverse()
+        for direction_pas, triche_pas in a_rejouer[:cible - numero_cle]:
+            partie.direction_demandee = direction_pas
+            partie.mode_triche = triche_pas
+            changements = avancer_partie(partie)
+            self.numero_pas += 1
+            self.pas.append((changements["tete"], changements["queue"], direction_pas, triche_pas))
+        return nombre_pas
@@ -0,0 +1,562 @@
+"""
+====================================================================
+                JEU EN RÉSEAU (PLUSIEURS JOUEURS)
+====================================================================
+
+Plusieurs joueurs, sur des ordinateurs différents, jouent dans la
+même partie. Le SERVEUR est le seul à appliquer les règles du jeu
+(avancer_partie) : on dit qu'il fait "autorité". Les CLIENTS envoient
+seulement leurs flèches et dessinent ce que le serveur leur raconte.
+
+Pour économiser le réseau, le serveur n'envoie pas toute la partie à
+chaque pas, seulement ce qui a changé :
+- la nouvelle tête de chaque serpent
+- si la queue a été retirée
+- les pommes mangées et les nouvelles pommes
+- les scores qui ont changé et les serpents morts
+
+Chaque message est une ligne de texte JSON terminée par "\\n".
+
+Lancer un serveur :   python reseau.py serveur --joueurs 2
+Rejoindre la partie : python reseau.py client 192.168.1.10 --nom zoe
+Mesurer le serveur :  python reseau.py banc --parties 100
+====================================================================
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import random
+
+import pygame
+
+from snake_game import (Partie, Direction, TOUCHES_DIRECTION, avancer_partie, changer_direction,
+                        est_joueur_piege, initialiser_pommes, dessiner_partie, dessiner_serpent,
+                        mettre_a_jour_affichage, charger_joueurs, obtenir_couleur_rgb_joueur,
+                        FPS, LARGEUR, HAUTEUR, TAILLE_CASE, VERT)
+from robots import direction_sans_danger
+
+PORT_PAR_DEFAUT = 5555
+
+# Un client qui ne lit pas assez vite ses messages est déconnecté
+# quand il a plus que cette quantité d'octets en attente
+TAMPON_MAX_CLIENT = 256 * 1024
+
+# Comme dans la saisie du nom du jeu
+LONGUEUR_MAX_NOM = 20
+
+
+def encoder_message(message):
+    """
+    Transforme un message (dictionnaire) en une ligne d'octets à envoyer
+    """
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def decoder_message(ligne):
+    """
+    Transforme une ligne d'octets reçue en message (dictionnaire)
+    """
+    return json.loads(ligne.decode("utf-8"))
+
+
+def lire_bonjour(bonjour):
+    """
+    Vérifie le message de bienvenue d'un client : retourne (nom, couleur),
+    ou None si le message est faux (un nom qui n'est pas un texte, une
+    couleur qui n'est pas 3 nombres de 0 à 255...)
+    Sans nom ni couleur, on prend "Joueur" et le vert
+    """
+    if not isinstance(bonjour, dict):
+        return None
+    nom = bonjour.get("nom", "Joueur")
+    couleur = bonjour.get("couleur", VERT)
+    if not isinstance(nom, str) or not 1 <= len(nom) <= LONGUEUR_MAX_NOM:
+        return None
+    if (not isinstance(couleur, (list, tuple)) or len(couleur) != 3 or
+            not all(type(c) is int and 0 <= c <= 255 for c in couleur)):
+        return None
+    return nom, tuple(couleur)
+
+
+# ===================================================================
+# CÔTÉ SERVEUR
+# ===================================================================
+
+class JoueurReseau:
+    """
+    Un joueur connecté au serveur
+    """
+    def __init__(self, numero, nom, couleur, ecrivain=None):
+        self.numero = numero
+        self.nom = nom
+        self.couleur = couleur
+        self.ecrivain = ecrivain
+        self.partie = None      # Son serpent, son score... (créé au début de la partie)
+        self.vivant = True
+        self.connecte = True
+
+
+class PartieReseau:
+    """
+    Une partie partagée par plusieurs joueurs : chacun a son serpent et
+    son score, mais les pommes sont les mêmes pour tout le monde
+    """
+    def __init__(self, joueurs, fps=None, graine=None):
+        self.joueurs = joueurs
+        self.alea = random.Random(graine)
+        self.numero_tick = 0
+
+        # Les pommes sont partagées : tous les serpents utilisent la même liste
+        self.pommes = []
+        for rang, joueur in enumerate(joueurs):
+            joueur.partie = Partie(est_joueur_piege(joueur.nom), self.alea, pommes=self.pommes)
+            # Décaler les serpents de 4 lignes pour qu'ils ne partent pas du même endroit
+            decalage = (rang - len(joueurs) // 2) * 4 * TAILLE_CASE
+            joueur.partie.serpent = [(x, y + decalage) for (x, y) in joueur.partie.serpent]
+        self.pommes.extend(initialiser_pommes(1, [], piege=False, alea=self.alea))
+
+        # Comme dans le jeu normal : +2 FPS si tout le monde est piégé
+        if fps is None:
+            fps = FPS + 2 if all(j.partie.piege_joueur for j in joueurs) else FPS
+        self.fps = fps
+
+        # Mesure de la régularité des pas (gigue = retard par rapport à l'heure prévue)
+        self.gigue_max_ms = 0.0
+        self.somme_gigues_ms = 0.0
+
+    def joueurs_vivants(self):
+        return [j for j in self.joueurs if j.vivant]
+
+    def etat_complet(self):
+        """
+        Tout l'état de la partie (envoyé au début, pour que les clients partent de la même chose)
+        """
+        return {
+            "type": "etat",
+            "tick": self.numero_tick,
+            "fps": self.fps,
+            "joueurs": {str(j.numero): {"nom": j.nom, "couleur": list(j.couleur),
+                                        "serpent": [list(c) for c in j.partie.serpent],
+                                        "score": j.partie.score}
+                        for j in self.joueurs_vivants()},
+            "pommes": [list(p) for p in self.pommes],
+        }
+
+    def avancer(self):
+        """
+        Fait avancer tous les serpents vivants d'une case (un "tick")
+        Retourne le message qui décrit seulement ce qui a changé
+        """
+        self.numero_tick += 1
+        message = {"type": "tick", "tick": self.numero_tick, "joueurs": {}}
+        pommes_mangees = []
+        pommes_ajoutees = []
+        morts = []
+
+        # Les serpents avancent chacun leur tour : si deux têtes visent la même
+        # case au même moment, c'est le premier joueur qui la prend
+        for joueur in self.joueurs_vivants():
+            if not joueur.connecte:
+                joueur.vivant = False
+                morts.append(str(joueur.numero))
+                continue
+            autres_serpents = [j.partie.serpent for j in self.joueurs_vivants() if j is not joueur]
+            score_avant = joueur.partie.score
+            changements = avancer_partie(joueur.partie, autres_serpents)
+
+            if changements["collision"] is not None:
+                joueur.vivant = False
+                morts.append(str(joueur.numero))
+                continue
+
+            delta = {"tete": list(changements["tete"])}
+            if changements["queue"] is not None:
+                delta["queue"] = True
+            if joueur.partie.score != score_avant:
+                delta["score"] = joueur.partie.score
+            message["joueurs"][str(joueur.numero)] = delta
+            pommes_mangees.extend(list(p) for p in changements["pommes_mangees"])
+            pommes_ajoutees.extend(list(p) for p in changements["pommes_ajoutees"])
+
+        # N'envoyer que ce qui existe vraiment (message plus court)
+        if pommes_mangees:
+            message["pommes_mangees"] = pommes_mangees
+        if pommes_ajoutees:
+            message["pommes_ajoutees"] = pommes_ajoutees
+        if morts:
+            message["morts"] = morts
+        return message
+
+    def message_fin(self):
+        return {"type": "fin", "tick": self.numero_tick,
+                "scores": {str(j.numero): j.partie.score for j in self.joueurs}}
+
+
+class ServeurSnake:
+    """
+    Le serveur : accueille les joueurs, forme des parties de joueurs_par_partie
+    joueurs et fait tourner chaque partie à son rythme (fps)
+    ticks_max : arrêter les parties après ce nombre de pas (None = jamais)
+    """
+    def __init__(self, joueurs_par_partie=2, fps=None, ticks_max=None):
+        self.joueurs_par_partie = joueurs_par_partie
+        self.fps = fps
+        self.ticks_max = ticks_max
+        self.salle_attente = []
+        self.parties = []          # Parties en cours
+        self.taches = set()
+        self.prochain_numero = 0
+        self.serveur = None
+
+        # Statistiques de toutes les parties (pour vérifier la régularité des pas)
+        self.nombre_ticks = 0
+        self.gigue_max_ms = 0.0
+        self.somme_gigues_ms = 0.0
+
+    async def demarrer(self, hote="0.0.0.0", port=PORT_PAR_DEFAUT):
+        """
+        Ouvre le serveur. Retourne le port utilisé (utile avec port=0 : port choisi par le système)
+        """
+        self.serveur = await asyncio.start_server(self.accueillir_client, hote, port)
+        return self.serveur.sockets[0].getsockname()[1]
+
+    async def arreter(self):
+        self.serveur.close()
+        await self.serveur.wait_closed()
+        for tache in list(self.taches):
+            tache.cancel()
+
+    async def accueillir_client(self, lecteur, ecrivain):
+        """
+        Appelée pour chaque nouveau client : il se présente, attend sa partie,
+        puis envoie ses directions jusqu'à la fin
+        """
+        try:
+            bonjour = decoder_message(await lecteur.readline())
+        except (ValueError, ConnectionError):
+            ecrivain.close()
+            return
+        presentation = lire_bonjour(bonjour)
+        if presentation is None:
+            ecrivain.close()
+            return
+
+        joueur = JoueurReseau(self.prochain_numero, *presentation, ecrivain)
+        self.prochain_numero += 1
+        ecrivain.write(encoder_message({"type": "bienvenue", "numero": joueur.numero}))
+
+        # Dès qu'il y a assez de joueurs qui attendent, la partie commence
+        self.salle_attente.append(joueur)
+        if len(self.salle_attente) >= self.joueurs_par_partie:
+            # Sortis de la salle d'attente d'abord : une erreur ne bloque pas les suivants
+            joueurs = self.salle_attente[:self.joueurs_par_partie]
+            del self.salle_attente[:self.joueurs_par_partie]
+            partie = PartieReseau(joueurs, self.fps)
+            tache = asyncio.create_task(self.faire_tourner(partie))
+            self.taches.add(tache)
+            tache.add_done_callback(self.taches.discard)
+
+        # Lire les flèches du joueur
+        try:
+            async for ligne in lecteur:
+                # Une ligne incompréhensible est ignorée : le joueur continue à diriger
+                try:
+                    message = decoder_message(ligne)
+                    if message.get("type") == "direction" and joueur.partie is not None:
+                        changer_direction(joueur.partie, Direction[message["direction"]])
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    continue
+        except ConnectionError:
+            pass
+
+        # Déconnecté : son serpent disparaît au prochain pas
+        joueur.connecte = False
+        if joueur in self.salle_attente:
+            self.salle_attente.remove(joueur)
+
+    def diffuser(self, partie, message):
+        """
+        Envoie le même message à tous les joueurs de la partie
+        (le message n'est transformé en octets qu'une seule fois)
+        """
+        donnees = encoder_message(message)
+        for joueur in partie.joueurs:
+            if not joueur.connecte or joueur.ecrivain is None:
+                continue
+            # Client trop lent : on le déconnecte plutôt que de ralentir la partie
+            if joueur.ecrivain.transport.get_write_buffer_size() > TAMPON_MAX_CLIENT:
+                joueur.connecte = False
+                joueur.ecrivain.close()
+                continue
+            joueur.ecrivain.write(donnees)
+
+    async def faire_tourner(self, partie):
+        """
+        La boucle d'une partie : un pas toutes les 1/fps secondes
+        L'heure de chaque pas est calculée depuis le début de la partie
+        (et pas depuis le pas précédent), pour que les retards ne s'additionnent pas
+        """
+        self.parties.append(partie)
+        boucle = asyncio.get_running_loop()
+        periode = 1 / partie.fps
+        debut = boucle.time()
+        self.diffuser(partie, partie.etat_complet())
+
+        while partie.joueurs_vivants():
+            if self.ticks_max is not None and partie.numero_tick >= self.ticks_max:
+                break
+            heure_prevue = debut + (partie.numero_tick + 1) * periode
+            await asyncio.sleep(max(0.0, heure_prevue - boucle.time()))
+
+            # Gigue : de combien on est en retard sur l'heure prévue
+            gigue_ms = max(0.0, boucle.time() - heure_prevue) * 1000
+            partie.gigue_max_ms = max(partie.gigue_max_ms, gigue_ms)
+            partie.somme_gigues_ms += gigue_ms
+            self.gigue_max_ms = max(self.gigue_max_ms, gigue_ms)
+            self.somme_gigues_ms += gigue_ms
+            self.nombre_ticks += 1
+
+            self.diffuser(partie, partie.avancer())
+
+        self.diffuser(partie, partie.message_fin())
+        for joueur in partie.joueurs:
+            if joueur.ecrivain is not None:
+                joueur.ecrivain.close()
+        self.parties.remove(partie)
+
+    def gigue_moyenne_ms(self):
+        if self.nombre_ticks == 0:
+            return 0.0
+        return self.somme_gigues_ms / self.nombre_ticks
+
+
+# ===================================================================
+# CÔTÉ CLIENT
+# ===================================================================
+
+class ClientReseau:
+    """
+    Un client : garde une copie de la partie et la met à jour avec
+    les messages du serveur (sans jamais appliquer les règles lui-même)
+    """
+    def __init__(self):
+        self.numero = None
+        self.tick = 0
+        self.fps = FPS
+        self.noms = {}
+        self.couleurs = {}
+        self.serpents = {}    # numero -> liste de cases (la tête en premier)
+        self.scores = {}
+        self.triche = {}      # numero -> mode triche activé (nom en doré)
+        self.pommes = []
+        self.termine = False
+        self.lecteur = None
+        self.ecrivain = None
+
+    async def connecter(self, hote, port, nom, couleur=VERT):
+        self.lecteur, self.ecrivain = await asyncio.open_connection(hote, port)
+        self.ecrivain.write(encoder_message({"type": "bonjour", "nom": nom, "couleur": list(couleur)}))
+        await self.ecrivain.drain()
+
+    async def envoyer_direction(self, direction):
+        self.ecrivain.write(encoder_message({"type": "direction", "direction": direction.name}))
+        await self.ecrivain.drain()
+
+    async def recevoir(self):
+        """
+        Attend le prochain message du serveur et l'applique à la copie locale
+        Retourne le message (None si le serveur a fermé la connexion)
+        """
+        ligne = await self.lecteur.readline()
+        if not ligne:
+            self.termine = True
+            return None
+        message = decoder_message(ligne)
+        self.appliquer(message)
+        return message
+
+    def appliquer(self, message):
+        """
+        Met à jour la copie locale de la partie avec un message du serveur
+        """
+        type_message = message["type"]
+        if type_message == "bienvenue":
+            self.numero = str(message["numero"])
+        elif type_message == "etat":
+            self.tick = message["tick"]
+            self.fps = message.get("fps", self.fps)
+            self.termine = False
+            self.serpents = {}
+            for numero, joueur in message["joueurs"].items():
+                self.noms[numero] = joueur["nom"]
+                self.couleurs[numero] = tuple(joueur["couleur"])
+                self.serpents[numero] = [tuple(c) for c in joueur["serpent"]]
+                self.scores[numero] = joueur["score"]
+                self.triche[numero] = joueur.get("triche", False)
+            self.pommes = [tuple(p) for p in message["pommes"]]
+        elif type_message == "tick":
+            self.tick = message["tick"]
+            for numero, delta in message["joueurs"].items():
+                serpent = self.serpents[numero]
+                serpent.insert(0, tuple(delta["tete"]))
+                if delta.get("queue"):
+                    serpent.pop()
+                if "score" in delta:
+                    self.scores[numero] = delta["score"]
+                if "triche" in delta:
+                    self.triche[numero] = delta["triche"]
+            for pomme in message.get("pommes_mangees", []):
+                self.pommes.remove(tuple(pomme))
+            self.pommes.extend(tuple(p) for p in message.get("pommes_ajoutees", []))
+            for numero in message.get("morts", []):
+                self.serpents.pop(numero, None)
+        elif type_message == "fin":
+            self.scores.update(message["scores"])
+            self.termine = True
+
+    def fermer(self):
+        if self.ecrivain is not None:
+            self.ecrivain.close()
+
+
+def dessiner_vue_client(ecran, client):
+    """
+    Dessine la partie telle que le client la connaît : le serpent du joueur
+    (ou le premier serpent pour un spectateur) avec le panneau, puis les autres
+    """
+    principal = client.numero if client.numero in client.serpents else next(iter(client.serpents), None)
+    dessiner_partie(ecran, client.serpents.get(principal, []), client.pommes,
+                    client.noms.get(principal, ""), client.scores.get(principal, 0),
+                    client.couleurs.get(principal, VERT), client.triche.get(principal, False))
+    for numero, serpent in client.serpents.items():
+        if numero != principal:
+            dessiner_serpent(ecran, serpent, client.couleurs[numero])
+
+
+async def jouer_en_reseau(hote, port, nom, couleur=VERT):
+    """
+    Le client graphique : envoie les flèches du clavier au serveur et
+    redessine la partie avec les fonctions de dessin du jeu à chaque pas
+    """
+    ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
+    pygame.display.set_caption("🐍 Jeu Snake - En réseau")
+    client = ClientReseau()
+    await client.connecter(hote, port, nom, couleur)
+
+    async def lire_clavier():
+        while not client.termine:
+            for evenement in pygame.event.get():
+                if evenement.type == pygame.QUIT:
+                    client.fermer()
+                    client.termine = True
+                elif evenement.type == pygame.KEYDOWN and evenement.key in TOUCHES_DIRECTION:
+                    await client.envoyer_direction(TOUCHES_DIRECTION[evenement.key])
+            await asyncio.sleep(0.01)
+
+    tache_clavier = asyncio.create_task(lire_clavier())
+    while not client.termine:
+        message = await client.recevoir()
+        if message is None or message["type"] not in ("etat", "tick"):
+            continue
+        dessiner_vue_client(ecran, client)
+        mettre_a_jour_affichage(ecran, "reseau")
+
+    tache_clavier.cancel()
+    print("\n🏁 Partie terminée !")
+    for numero, score in sorted(client.scores.items(), key=lambda x: x[1], reverse=True):
+        print(f"{client.noms.get(numero, numero):20} - Score: {score}")
+    return client.scores.get(client.numero, 0)
+
+
+async def robot_reseau(hote, port, nom):
+    """
+    Un client automatique (sans fenêtre) qui évite les murs et les serpents
+    """
+    client = ClientReseau()
+    await client.connecter(hote, port, nom)
+    direction = Direction.DROITE
+    while not client.termine:
+        message = await client.recevoir()
+        if message is None or message["type"] not in ("etat", "tick"):
+            continue
+        serpent = client.serpents.get(client.numero)
+        if serpent:
+            autres = [s for n, s in client.serpents.items() if n != client.numero]
+            nouvelle = direction_sans_danger(serpent, direction, autres)
+            if nouvelle != direction:
+                direction = nouvelle
+                await client.envoyer_direction(direction)
+    client.fermer()
+    return client
+
+
+def lancer_robots(port, nombre_robots):
+    """
+    Fait jouer plusieurs robots en même temps (dans un autre processus que le serveur)
+    """
+    async def tous_les_robots():
+        await asyncio.gather(*[robot_reseau("127.0.0.1", port, f"robot{i}")
+                               for i in range(nombre_robots)])
+    asyncio.run(tous_les_robots())
+
+
+async def banc_d_essai(nombre_parties, joueurs_par_partie, fps, ticks_max):
+    """
+    Lance un serveur et des robots sur la même machine (boucle locale),
+    puis affiche la régularité des pas du serveur
+    Les robots tournent dans un autre processus pour ne pas fausser la mesure
+    """
+    serveur = ServeurSnake(joueurs_par_partie, fps, ticks_max)
+    port = await serveur.demarrer("127.0.0.1", 0)
+    processus = multiprocessing.Process(target=lancer_robots,
+                                        args=(port, nombre_parties * joueurs_par_partie))
+    processus.start()
+    await asyncio.get_running_loop().run_in_executor(None, processus.join)
+    await serveur.arreter()
+    print(f"{nombre_parties} parties, {serveur.nombre_ticks} pas")
+    print(f"Gigue moyenne : {serveur.gigue_moyenne_ms():.2f} ms, maximum : {serveur.gigue_max_ms:.2f} ms")
+    return serveur
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Jeu Snake en réseau")
+    sous_commandes = parseur.add_subparsers(dest="commande", required=True)
+
+    p_serveur = sous_commandes.add_parser("serveur", help="lancer un serveur")
+    p_serveur.add_argument("--port", type=int, default=PORT_PAR_DEFAUT)
+    p_serveur.add_argument("--joueurs", type=int, default=2, help="nombre de joueurs par partie")
+    p_serveur.add_argument("--fps", type=int, default=None)
+
+    p_client = sous_commandes.add_parser("client", help="rejoindre une partie")
+    p_client.add_argument("hote")
+    p_client.add_argument("--port", type=int, default=PORT_PAR_DEFAUT)
+    p_client.add_argument("--nom", default="Joueur")
+
+    p_banc = sous_commandes.add_parser("banc", help="mesurer le serveur avec des robots")
+    p_banc.add_argument("--parties", type=int, default=100)
+    p_banc.add_argument("--joueurs", type=int, default=2)
+    p_banc.add_argument("--fps", type=int, default=FPS)
+    p_banc.add_argument("--ticks", type=int, default=100, help="nombre de pas maximum par partie")
+
+    options = parseur.parse_args(arguments)
+
+    if options.commande == "serveur":
+        async def servir():
+            serveur = ServeurSnake(options.joueurs, options.fps)
+            port = await serveur.demarrer(port=options.port)
+            print(f"🌐 Serveur Snake prêt sur le port {port} ({options.joueurs} joueurs par partie)")
+            await serveur.serveur.serve_forever()
+        asyncio.run(servir())
+    elif options.commande == "client":
+        # Le serpent prend la couleur préférée du joueur (joueurs.json)
+        couleur = obtenir_couleur_rgb_joueur(charger_joueurs(), options.nom) or VERT
+        asyncio.run(jouer_en_reseau(options.hote, options.port, options.nom, couleur))
+        pygame.quit()
+    else:
+        asyncio.run(banc_d_essai(options.parties, options.joueurs, options.fps, options.ticks))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+====================================================================
+                LES ROBOTS (JOUEURS AUTOMATIQUES)
+====================================================================
+
+Un robot est une simple fonction : on lui donne la partie en cours,
+elle répond avec la direction à prendre.
+
+    def mon_robot(partie):
+        return Direction.HAUT
+
+Les robots servent à jouer des milliers de parties sans personne au
+clavier (tournoi.py), ou à remplir un serveur en réseau (reseau.py).
+On peut brancher son propre robot : "mon_module:mon_robot".
+
+La taille du plateau et les murs du niveau sont lus dans la partie
+(partie.largeur_plateau, partie.niveau) et pas dans les constantes de snake_game : avec --plateau, le plateau est
+plus grand que la fenêtre, et snake_game lancé directement est chargé
+une deuxième fois (ses variables modifiées ne sont pas visibles ici).
+====================================================================
+"""
+
+import importlib
+
+from snake_game import Direction, LARGEUR, HAUTEUR, HAUTEUR_PANNEAU, TAILLE_CASE
+
+
+def case_suivante(tete, direction):
+    """
+    La case où arrive la tête si elle avance dans cette direction
+    """
+    dx, dy = direction.value
+    return (tete[0] + dx * TAILLE_CASE, tete[1] + dy * TAILLE_CASE)
+
+
+def plateau_de(partie):
+    """
+    La taille (largeur, hauteur) en pixels du plateau de la partie
+    """
+    return (partie.largeur_plateau, partie.hauteur_plateau)
+
+
+def case_libre(case, serpent, obstacles=(), plateau=(LARGEUR, HAUTEUR), niveau=None):
+    """
+    True si la case est dans la zone de jeu, n'est pas un mur du niveau
+    et n'est occupée par aucun serpent
+    plateau : (largeur, hauteur) du plateau en pixels
+    """
+    x, y = case
+    return (0 <= x < plateau[0] and HAUTEUR_PANNEAU <= y < plateau[1] and
+            (niveau is None or not niveau.est_mur(case)) and
+            case not in serpent and all(case not in autre for autre in obstacles))
+
+
+def directions_sures(serpent, direction, obstacles=(), plateau=(LARGEUR, HAUTEUR), niveau=None):
+    """
+    Les directions (sans demi-tour) qui ne mènent pas tout de suite à une collision
+    """
+    dx, dy = direction.value
+    return [d for d in Direction
+            if d.value != (-dx, -dy) and case_libre(case_suivante(serpent[0], d), serpent, obstacles, plateau, niveau)]
+
+
+def direction_sans_danger(serpent, direction, obstacles=(), plateau=(LARGEUR, HAUTEUR), niveau=None):
+    """
+    Garde sa direction si la case suivante est libre, sinon tourne vers une case libre
+    """
+    if case_libre(case_suivante(serpent[0], direction), serpent, obstacles, plateau, niveau):
+        return direction
+    sures = directions_sures(serpent, direction, obstacles, plateau, niveau)
+    return sures[0] if sures else direction
+
+
+# ===================================================================
+# LES ROBOTS DISPONIBLES
+# ===================================================================
+
+def robot_tout_droit(partie):
+    """
+    Va toujours tout droit (finit dans le mur)
+    """
+    return partie.direction
+
+
+def robot_prudent(partie):
+    """
+    Va tout droit et ne tourne que pour éviter un obstacle
+    """
+    return direction_sans_danger(partie.serpent, partie.direction, plateau=plateau_de(partie), niveau=partie.niveau)
+
+
+def robot_gourmand(partie):
+    """
+    Va vers la pomme la plus proche, sans jamais foncer dans un obstacle
+    """
+    sures = directions_sures(partie.serpent, partie.direction, plateau=plateau_de(partie), niveau=partie.niveau)
+    if not sures:
+        return partie.direction
+
+    def distance_pomme(direction):
+        x, y = case_suivante(partie.serpent[0], direction)
+        return min(abs(x - px) + abs(y - py) for (px, py) in partie.pommes)
+
+    return min(sures, key=distance_pomme)
+
+
+def robot_hasard(partie):
+    """
+    Tourne au hasard de temps en temps, sans foncer dans un obstacle
+    (utilise le hasard de la partie : la partie reste reproductible)
+    """
+    sures = directions_sures(partie.serpent, partie.direction, plateau=plateau_de(partie), niveau=partie.niveau)
+    if not sures:
+        return partie.direction
+    if partie.direction in sures and partie.alea.random() < 0.8:
+        return partie.direction
+    return partie.alea.choice(sures)
+
+
+def cycle_hamiltonien(colonnes, lignes):
+    """
+    Un chemin qui passe une fois par chaque case (colonne, ligne) du plateau
+    et revient à son départ (il faut un nombre pair de colonnes ou de lignes) :
+
+        la ligne 0 de gauche à droite, puis des allers-retours verticaux
+        de la dernière colonne à la colonne 1 (lignes 1 à la fin), puis
+        la colonne 0 remonte jusqu'au départ
+    """
+    if colonnes % 2 and lignes % 2:
+        raise ValueError(f"Pas de cycle sur un plateau {colonnes}x{lignes} (tout est impair)")
+    if colonnes % 2:
+        # Même chemin sur le plateau tourné d'un quart de tour
+        return [(colonne, ligne) for ligne, colonne in cycle_hamiltonien(lignes, colonnes)]
+    cycle = [(colonne, 0) for colonne in range(colonnes)]
+    for colonne in range(colonnes - 1, 0, -1):
+        descente = (colonnes - 1 - colonne) % 2 == 0
+        rangees = range(1, lignes) if descente else range(lignes - 1, 0, -1)
+        cycle.extend((colonne, ligne) for ligne in rangees)
+    cycle.extend((0, ligne) for ligne in range(lignes - 1, 0, -1))
+    return cycle
+
+
+# Pour chaque taille de plateau : case (en pixels) -> la direction qui mène
+# à la case suivante du cycle
+directions_cycle = {}
+
+def preparer_directions_cycle(plateau):
+    """
+    Les directions du cycle pour un plateau de cette taille (calculées une seule fois)
+    """
+    if plateau not in directions_cycle:
+        largeur, hauteur = plateau
+        cycle = cycle_hamiltonien(largeur // TAILLE_CASE, (hauteur - HAUTEUR_PANNEAU) // TAILLE_CASE)
+        par_pas = {direction.value: direction for direction in Direction}
+        directions = {}
+        for (colonne, ligne), (suivante_colonne, suivante_ligne) in zip(cycle, cycle[1:] + cycle[:1]):
+            case = (colonne * TAILLE_CASE, HAUTEUR_PANNEAU + ligne * TAILLE_CASE)
+            directions[case] = par_pas[(suivante_colonne - colonne, suivante_ligne - ligne)]
+        directions_cycle[plateau] = directions
+    return directions_cycle[plateau]
+
+
+def robot_cycle(partie):
+    """
+    Suit un cycle qui passe par toutes les cases : ne perd jamais, et finit
+    par remplir tout le plateau (très long, mais parfait pour les essais)
+    """
+    plateau = plateau_de(partie)
+    direction = preparer_directions_cycle(plateau).get(partie.serpent[0])
+    # Le cycle ne connaît pas les murs du niveau : s'il mène dans un mur, on l'évite
+    if direction is not None and partie.niveau is not None and \
+            partie.niveau.est_mur(case_suivante(partie.serpent[0], direction)):
+        direction = None
+    if direction is None:
+        # Pas encore sur le cycle (au départ, sur la ligne du milieu) : tout droit
+        # (seulement dans ce cas : direction_sans_danger parcourt tout le serpent)
+        direction = direction_sans_danger(partie.serpent, partie.direction, plateau=plateau, niveau=partie.niveau)
+    return direction
+
+
+ROBOTS = {
+    "tout_droit": robot_tout_droit,
+    "prudent": robot_prudent,
+    "gourmand": robot_gourmand,
+    "hasard": robot_hasard,
+    "cycle": robot_cycle,
+}
+
+
+def trouver_robot(nom):
+    """
+    Retourne le robot qui porte ce nom, ou le robot "module:fonction" d'un autre fichier
+    """
+    if nom in ROBOTS:
+        return ROBOTS[nom]
+    if ":" in nom:
+        nom_module, nom_fonction = nom.split(":", 1)
+        return getattr(importlib.import_module(nom_module), nom_fonction)
+    raise ValueError(f"Robot inconnu: {nom} (robots disponibles : {', '.join(ROBOTS)})")
@@ -0,0 +1,125 @@
+"""
+====================================================================
+            SCÉNARIOS D'ESSAI : DES SERPENTS TRÈS LONGS
+====================================================================
+
+Atteindre 1 000 cases à la main prend des heures. Pour mesurer le jeu
+quand le plateau est presque plein, on fabrique directement une partie
+avec un serpent de la longueur voulue (jusqu'au plateau entier : 50 x 35
+= 1 750 cases).
+
+Le serpent est posé le long d'un "cycle hamiltonien" : un chemin qui
+passe une fois par chaque case et revient à son départ (voir
+robots.cycle_hamiltonien). La partie est donc toujours valable : la tête
+touche la case suivante du corps, rien ne se chevauche, et le robot
+"cycle" peut continuer à jouer sans jamais perdre.
+
+Avec la même longueur, le même nombre de pommes et la même graine, on
+obtient toujours exactement la même partie.
+
+Dans le jeu :   python snake_game.py --stress 1500 --robot cycle --turbo
+Mesurer :       python scenarios.py --longueurs 100 1000 1700 --pas 300
+====================================================================
+"""
+
+import argparse
+import random
+import time
+
+import pygame
+
+from snake_game import (Partie, avancer_partie, changer_direction, dessiner_partie, generer_pomme_pieges,
+                        LARGEUR, HAUTEUR, HAUTEUR_PANNEAU, TAILLE_CASE, VERT)
+from robots import cycle_hamiltonien, plateau_de, preparer_directions_cycle
+
+LONGUEURS_BANC = [100, 500, 1000, 1500, 1700]
+
+
+def preparer_partie(partie, longueur, nombre_pommes=1, graine=0, largeur_plateau=LARGEUR, hauteur_plateau=HAUTEUR):
+    """
+    Remplace le serpent et les pommes de la partie par un serpent de cette
+    longueur posé le long du cycle, et des pommes sur des cases libres
+    Le score reste à 0 : ces parties ne doivent pas battre de records
+
+    Avec longueur = toutes les cases, le plateau est plein : le prochain pas est un choc
+    """
+    colonnes = largeur_plateau // TAILLE_CASE
+    lignes = (hauteur_plateau - HAUTEUR_PANNEAU) // TAILLE_CASE
+    if not 1 <= longueur <= colonnes * lignes:
+        raise ValueError(f"Longueur {longueur} impossible sur un plateau de {colonnes * lignes} cases")
+    cycle = [(colonne * TAILLE_CASE, HAUTEUR_PANNEAU + ligne * TAILLE_CASE)
+             for colonne, ligne in cycle_hamiltonien(colonnes, lignes)]
+
+    # La queue au début du cycle, la tête à la case numéro longueur - 1
+    partie.serpent[:] = cycle[longueur - 1::-1]
+    libres = cycle[longueur:]
+    partie.pommes[:] = random.Random(graine).sample(libres, min(nombre_pommes, len(libres)))
+
+    # La direction qui mène à la case suivante du cycle (la Direction de la
+    # partie : snake_game peut être chargé deux fois, voir robots.py)
+    tete_x, tete_y = cycle[longueur - 1]
+    suivante_x, suivante_y = cycle[longueur % len(cycle)]
+    Direction = type(partie.direction)
+    partie.direction = partie.direction_demandee = Direction(((suivante_x - tete_x) // TAILLE_CASE,
+                                                              (suivante_y - tete_y) // TAILLE_CASE))
+    partie.score = 0
+    return partie
+
+
+def creer_partie(longueur, nombre_pommes=1, graine=0):
+    """
+    Une nouvelle partie (sans pièges) avec un serpent de cette longueur
+    """
+    return preparer_partie(Partie(False, random.Random(graine)), longueur, nombre_pommes, graine)
+
+
+def mesurer(longueur, nombre_pommes, nombre_pas, graine=0):
+    """
+    Temps moyen (en microsecondes) d'un pas des règles, d'une nouvelle pomme
+    et d'une image dessinée, avec un serpent de cette longueur
+    """
+    partie = creer_partie(longueur, nombre_pommes, graine)
+    # Le serpent est toujours sur le cycle : ses directions sont préparées
+    # avant de mesurer, pour ne compter que le temps des règles
+    directions = preparer_directions_cycle(plateau_de(partie))
+    debut = time.perf_counter()
+    for _ in range(nombre_pas):
+        changer_direction(partie, directions[partie.serpent[0]])
+        if avancer_partie(partie)["collision"] is not None:
+            # Plateau plein : on repart du même scénario
+            preparer_partie(partie, longueur, nombre_pommes, graine)
+    regles = time.perf_counter() - debut
+
+    debut = time.perf_counter()
+    for _ in range(nombre_pas):
+        generer_pomme_pieges(partie.serpent, piege=True, alea=partie.alea)
+    pommes = time.perf_counter() - debut
+
+    # Dans la fenêtre du jeu si elle existe (même format de pixels que dans le jeu)
+    surface = pygame.display.get_surface() or pygame.Surface((LARGEUR, HAUTEUR))
+    debut = time.perf_counter()
+    for _ in range(nombre_pas):
+        dessiner_partie(surface, partie.serpent, partie.pommes, "stress", partie.score, VERT, False)
+    dessin = time.perf_counter() - debut
+
+    return {"longueur": longueur, "regles_us": regles / nombre_pas * 1e6,
+            "pomme_us": pommes / nombre_pas * 1e6, "dessin_us": dessin / nombre_pas * 1e6}
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Mesurer le jeu avec des serpents très longs")
+    parseur.add_argument("--longueurs", type=int, nargs="+", default=LONGUEURS_BANC)
+    parseur.add_argument("--pommes", type=int, default=1, help="nombre de pommes sur le plateau")
+    parseur.add_argument("--pas", type=int, default=300, help="nombre de pas mesurés pour chaque longueur")
+    parseur.add_argument("--graine", type=int, default=0)
+    options = parseur.parse_args(arguments)
+    pygame.display.set_mode((LARGEUR, HAUTEUR))
+
+    print(f"{'longueur':>10}{'règles (µs)':>14}{'pomme (µs)':>13}{'dessin (µs)':>14}")
+    for longueur in options.longueurs:
+        resultat = mesurer(longueur, options.pommes, options.pas, options.graine)
+        print(f"{longueur:>10}{resultat['regles_us']:>14.1f}{resultat['pomme_us']:>13.1f}{resultat['dessin_us']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
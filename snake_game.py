@@ -24,27 +24,138 @@ import random
 from enum import Enum
 import json
 import os
+import argparse
+from itertools import islice, repeat
+import datetime
+import time
+
+from capture import CaptureImages, activer_pilote_sans_fenetre, FORMAT_BRUT, FORMAT_PNG
+from persistance import SauvegardeDifferee
+from son import Sons, preparer_melangeur
 
 # ===================================================================
 # ÉTAPE 2 : DÉFINIR LES CONSTANTES (les valeurs qui ne changent pas)
 # ===================================================================
 
 # Initialiser Pygame (obligatoire au démarrage)
+# Le son est réglé avant, pour qu'il arrive sans retard (voir son.py)
+preparer_melangeur()
 pygame.init()
 
 # Fichier pour sauvegarder les scores
 FICHIER_SCORES = "scores.json"
 FICHIER_JOUEURS = "joueurs.json"  # Nouveau fichier pour les métadonnées des joueurs
 
+# Les fichiers sont écrits en arrière-plan (voir persistance.py) :
+# le jeu ne se fige jamais en attendant le disque
+sauvegarde = SauvegardeDifferee()
+
+# Le classement servi aux écrans du hall (None = pas de serveur, voir --classement-http)
+serveur_classement = None
+
+# Historique des scores : pour que le fichier ne grossisse pas sans fin,
+# on ne garde le détail que des dernières parties et des meilleurs scores.
+# Les parties plus anciennes sont résumées par jour, puis par mois :
+# nombre de parties, total des points et meilleur score (rien n'est perdu
+# pour calculer le meilleur score, le nombre de parties et la moyenne).
+PARTIES_RECENTES_GARDEES = 50   # Dernières parties gardées en détail
+MEILLEURS_SCORES_GARDES = 10    # Meilleurs scores gardés pour chaque joueur
+JOURS_DETAILLES = 31            # Au-delà, les résumés par jour passent en résumés par mois
+
+def nouvel_historique():
+    """
+    Historique vide d'un joueur :
+      "recentes"  : les dernières parties [score, date]
+      "meilleurs" : les meilleurs scores, du plus grand au plus petit
+      "jours"     : résumés par jour {"2026-10-19": {"parties", "total", "meilleur"}}
+      "mois"      : résumés par mois {"2026-10": {...}}
+      "anciennes" : résumé des parties enregistrées avant qu'on note la date
+    """
+    return {"recentes": [], "meilleurs": [], "jours": {}, "mois": {}, "anciennes": None}
+
+def ajouter_au_resume(resume, parties, total, meilleur):
+    """
+    Ajoute des parties à un résumé (crée le résumé s'il n'existe pas encore)
+    """
+    if resume is None:
+        return {"parties": parties, "total": total, "meilleur": meilleur}
+    resume["parties"] += parties
+    resume["total"] += total
+    resume["meilleur"] = max(resume["meilleur"], meilleur)
+    return resume
+
+def ranger_historique(historique, aujourd_hui=None):
+    """
+    Applique les règles de conservation : les parties trop anciennes passent
+    dans les résumés par jour, et les vieux jours dans les résumés par mois
+    """
+    if aujourd_hui is None:
+        aujourd_hui = datetime.date.today()
+    
+    # Parties en trop : les plus anciennes vont dans les résumés
+    en_trop = len(historique["recentes"]) - PARTIES_RECENTES_GARDEES
+    if en_trop > 0:
+        for score, date in historique["recentes"][:en_trop]:
+            if date is None:
+                historique["anciennes"] = ajouter_au_resume(historique["anciennes"], 1, score, score)
+            else:
+                historique["jours"][date] = ajouter_au_resume(historique["jours"].get(date), 1, score, score)
+        del historique["recentes"][:en_trop]
+    
+    # Les jours trop vieux sont regroupés par mois ("2026-10-19" -> "2026-10")
+    limite = (aujourd_hui - datetime.timedelta(days=JOURS_DETAILLES)).isoformat()
+    for jour in [j for j in historique["jours"] if j < limite]:
+        resume = historique["jours"].pop(jour)
+        historique["mois"][jour[:7]] = ajouter_au_resume(historique["mois"].get(jour[:7]),
+                                                         resume["parties"], resume["total"], resume["meilleur"])
+    
+    # Garder seulement les meilleurs scores
+    historique["meilleurs"].sort(reverse=True)
+    del historique["meilleurs"][MEILLEURS_SCORES_GARDES:]
+    return historique
+
+def convertir_ancien_format(liste_scores):
+    """
+    Les anciens fichiers gardaient une simple liste de scores (sans date) :
+    on la transforme en historique
+    """
+    historique = nouvel_historique()
+    historique["recentes"] = [[score, None] for score in liste_scores]
+    historique["meilleurs"] = list(liste_scores)
+    return ranger_historique(historique)
+
+def resume_joueur(historique):
+    """
+    Retourne un résumé exact de toutes les parties d'un joueur :
+    {"parties": ..., "total": ..., "meilleur": ..., "moyenne": ...}
+    """
+    resume = {"parties": len(historique["recentes"]),
+              "total": sum(score for score, date in historique["recentes"]),
+              "meilleur": historique["meilleurs"][0] if historique["meilleurs"] else 0}
+    anciens = list(historique["jours"].values()) + list(historique["mois"].values())
+    if historique["anciennes"] is not None:
+        anciens.append(historique["anciennes"])
+    for ancien in anciens:
+        resume["parties"] += ancien["parties"]
+        resume["total"] += ancien["total"]
+    resume["moyenne"] = resume["total"] / resume["parties"] if resume["parties"] else 0
+    return resume
+
 # Fonctions pour gérer la sauvegarde des scores et des préférences des joueurs
 def charger_scores():
     """
     Charge les scores depuis le fichier JSON
     Si le fichier n'existe pas, retourne un dictionnaire vide
+    Retourne {nom: historique} (voir nouvel_historique)
     """
     if os.path.exists(FICHIER_SCORES):
         with open(FICHIER_SCORES, 'r') as f:
-            return json.load(f)
+            scores = json.load(f)
+        # Convertir les joueurs encore enregistrés avec l'ancien format (liste)
+        for nom, historique in scores.items():
+            if isinstance(historique, list):
+                scores[nom] = convertir_ancien_format(historique)
+        return scores
     return {}
 
 def charger_joueurs():
@@ -58,33 +169,39 @@ def charger_joueurs():
 
 def sauvegarder_joueurs(joueurs):
     """
-    Sauvegarde les informations des joueurs
+    Sauvegarde les informations des joueurs (écrites en arrière-plan)
     """
-    with open(FICHIER_JOUEURS, 'w') as f:
-        json.dump(joueurs, f, indent=2)
+    sauvegarde.marquer(FICHIER_JOUEURS, joueurs)
 
 def sauvegarder_scores(scores):
     """
-    Sauvegarde les scores dans le fichier JSON
+    Sauvegarde les scores dans le fichier JSON (écrits en arrière-plan)
     """
-    with open(FICHIER_SCORES, 'w') as f:
-        json.dump(scores, f, indent=2)
+    sauvegarde.marquer(FICHIER_SCORES, scores)
 
-def ajouter_score(scores, nom, score):
+def ajouter_score(scores, nom, score, date=None):
     """
-    Ajoute un score pour un joueur
+    Ajoute un score pour un joueur (avec la date du jour)
     """
+    if date is None:
+        date = datetime.date.today()
     if nom not in scores:
-        scores[nom] = []
-    scores[nom].append(score)
+        scores[nom] = nouvel_historique()
+    historique = scores[nom]
+    historique["recentes"].append([score, date.isoformat()])
+    historique["meilleurs"].append(score)
+    ranger_historique(historique, date)
     sauvegarder_scores(scores)
+    # Le classement sur le réseau est refait seulement maintenant (voir classement_http.py)
+    if serveur_classement is not None:
+        serveur_classement.mettre_a_jour(scores, nom)
 
 def obtenir_meilleur_score(scores, nom):
     """
     Retourne le meilleur score d'un joueur
     """
-    if nom in scores and scores[nom]:
-        return max(scores[nom])
+    if nom in scores:
+        return resume_joueur(scores[nom])["meilleur"]
     return 0
 
 def obtenir_couleur_joueur(joueurs, nom, couleurs_disponibles):
@@ -114,11 +231,30 @@ def sauvegarder_couleur_joueur(joueurs, nom, couleur_rgb):
     """
     Sauvegarde la couleur préférée d'un joueur
     """
+    # Rien à écrire si la couleur n'a pas changé
+    couleur_actuelle = joueurs.get(nom, {}).get("couleur")
+    if couleur_actuelle is not None and list(couleur_actuelle) == list(couleur_rgb):
+        return
     if nom not in joueurs:
         joueurs[nom] = {}
     joueurs[nom]["couleur"] = couleur_rgb
     sauvegarder_joueurs(joueurs)
 
+def calculer_classement(scores):
+    """
+    Retourne la liste (nom, meilleur score, nombre de parties) triée par score décroissant
+    """
+    # Créer une liste avec le meilleur score de chaque joueur
+    classement = []
+    for nom, historique in scores.items():
+        resume = resume_joueur(historique)
+        if resume["parties"]:
+            classement.append((nom, resume["meilleur"], resume["parties"]))
+    
+    # Trier par score décroissant
+    classement.sort(key=lambda x: x[1], reverse=True)
+    return classement
+
 def afficher_classement(scores):
     """
     Affiche le classement de tous les joueurs
@@ -127,15 +263,7 @@ def afficher_classement(scores):
         print("\n📊 Aucun score enregistré pour le moment.\n")
         return
     
-    # Créer une liste avec le meilleur score de chaque joueur
-    classement = []
-    for nom, liste_scores in scores.items():
-        if liste_scores:
-            meilleur = max(liste_scores)
-            classement.append((nom, meilleur, len(liste_scores)))
-    
-    # Trier par score décroissant
-    classement.sort(key=lambda x: x[1], reverse=True)
+    classement = calculer_classement(scores)
     
     print("\n" + "="*50)
     print("📊 CLASSEMENT DES MEILLEURS SCORES")
@@ -155,6 +283,12 @@ TAILLE_CASE = 20
 # Hauteur du panneau d'information en haut
 HAUTEUR_PANNEAU = 80
 
+# Taille du plateau de jeu (en pixels, comme la fenêtre)
+# Il peut être plus grand que la fenêtre : une caméra suit alors le serpent
+# (voir --plateau et camera.py)
+LARGEUR_PLATEAU = LARGEUR
+HAUTEUR_PLATEAU = HAUTEUR  # Comme HAUTEUR : le plateau commence sous le panneau
+
 # Couleurs (format RGB : Rouge, Vert, Bleu - valeurs 0 à 255)
 NOIR = (0, 0, 0)
 BLANC = (255, 255, 255)
@@ -166,6 +300,16 @@ BLEU = (100, 150, 255)   # Pour le texte
 # Plus la valeur est élevée, plus vite le jeu s'exécute
 FPS = 10
 
+# Réglages des pièges (pour les joueurs qui ne sont pas des amis)
+PROBA_POMME_BORD = 0.2      # 20% des pommes apparaissent près des bords
+PROBA_POINT_OUBLIE = 0.15   # 15% des pommes mangées ne rapportent rien
+
+# Points gagnés pour chaque pomme mangée
+POINTS_PAR_POMME = 10
+
+# Une pomme de plus sur l'écran tous les ... points
+POINTS_PAR_POMME_SUPPLEMENTAIRE = 200
+
 # Directions possibles du serpent
 class Direction(Enum):
     """
@@ -177,13 +321,84 @@ class Direction(Enum):
     GAUCHE = (-1, 0)    # X diminue = vers la gauche
     DROITE = (1, 0)     # X augmente = vers la droite
 
+# Quelle flèche du clavier donne quelle direction
+TOUCHES_DIRECTION = {
+    pygame.K_UP: Direction.HAUT,
+    pygame.K_DOWN: Direction.BAS,
+    pygame.K_LEFT: Direction.GAUCHE,
+    pygame.K_RIGHT: Direction.DROITE,
+}
+
 # ===================================================================
 # ÉTAPE 3 : CRÉER LA FENÊTRE DU JEU
 # ===================================================================
 
-# Créer la surface de jeu (la fenêtre où se dessine tout)
-ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
-pygame.display.set_caption("🐍 Jeu Snake - Apprendre à Programmer!")
+# La surface de jeu (la fenêtre où se dessine tout) est créée au
+# lancement du jeu, dans main(), avec pygame.display.set_mode()
+
+# Capture des images (None = pas de capture, voir l'option --capture)
+capture_images = None
+
+# Suivi des allocations (None = pas de suivi, voir l'option --allocations)
+suivi_allocations = None
+
+# Fenêtre agrandie (None = le jeu dessine directement dans la fenêtre,
+# voir les options --fenetre et --plein-ecran, et canevas.py)
+fenetre_agrandie = None
+
+def position_dans_jeu(position):
+    """
+    Position de la souris dans la fenêtre -> position dans l'image du jeu
+    (différentes seulement quand la fenêtre est agrandie)
+    """
+    if fenetre_agrandie is None:
+        return position
+    return fenetre_agrandie.vers_canevas(position)
+
+def mettre_a_jour_affichage(ecran, nom_ecran):
+    """
+    Affiche à l'écran ce qui vient d'être dessiné (pygame.display.flip)
+    En mode capture, l'image est aussi enregistrée avec le nom de l'écran
+    """
+    if fenetre_agrandie is not None:
+        fenetre_agrandie.presenter()
+    pygame.display.flip()
+    if capture_images is not None:
+        capture_images.capturer(ecran, nom_ecran)
+    if suivi_allocations is not None:
+        suivi_allocations.image(nom_ecran)
+
+# Temps d'attente maximum (en millisecondes) des écrans immobiles
+# (menu, pause, saisie du nom, fin de partie)
+ATTENTE_ECRAN_MS = 500
+
+def attendre_evenements(delai_ms=ATTENTE_ECRAN_MS):
+    """
+    Attend qu'il se passe quelque chose (touche, souris, fenêtre...) pendant
+    au plus delai_ms millisecondes, sans utiliser le processeur
+    Retourne la liste des événements reçus (vide si rien ne s'est passé)
+
+    Les écrans immobiles ne se redessinent que s'ils reçoivent un événement :
+    le programme dort le reste du temps au lieu de redessiner 30 fois par seconde
+    """
+    evt = pygame.event.wait(delai_ms)
+    if evt.type == pygame.NOEVENT:
+        # En mode capture, on demande quand même à l'écran de se redessiner
+        # pour que les images continuent d'arriver régulièrement
+        if capture_images is not None:
+            return [pygame.event.Event(pygame.VIDEOEXPOSE)]
+        return []
+    return [evt] + pygame.event.get()
+
+def attendre_evenements_utiles():
+    """
+    Attend, aussi longtemps qu'il le faut, au moins un événement qui peut
+    changer l'écran (les mouvements de souris sont ignorés)
+    """
+    while True:
+        evenements = [evt for evt in attendre_evenements() if evt.type != pygame.MOUSEMOTION]
+        if evenements:
+            return evenements
 
 # Créer une horloge pour contrôler la vitesse du jeu
 horloge = pygame.time.Clock()
@@ -191,6 +406,10 @@ horloge = pygame.time.Clock()
 # Police pour écrire du texte
 police = pygame.font.Font(None, 36)
 
+# Les polices du panneau de la partie, créées une seule fois (et pas à chaque image)
+police_nom_partie = pygame.font.Font(None, 35)
+police_score_partie = pygame.font.Font(None, 30)
+
 # ===================================================================
 # ÉTAPE 4 : INITIALISER LES VARIABLES DU JEU
 # ===================================================================
@@ -216,17 +435,18 @@ direction = Direction.DROITE
 direction_demandee = Direction.DROITE
 
 # Position de la pomme (aléatoire)
-def generer_pomme():
+def generer_pomme(alea=random):
     """
     FONCTION : bloc de code réutilisable qui effectue une action
     
     Cette fonction crée une nouvelle pomme à une position aléatoire
     on la met toujours sur une case (multiple de TAILLE_CASE)
+    alea : le générateur de hasard à utiliser (par défaut, le module random)
     """
     while True:
-        x = random.randint(0, (LARGEUR - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
+        x = alea.randint(0, (LARGEUR_PLATEAU - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
         # Générer y dans la zone de jeu seulement (pas dans le panneau)
-        y = random.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
+        y = alea.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR_PLATEAU - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
         pomme_pos = (x, y)
         # S'assurer que la pomme n'apparaît pas sur le serpent
         # Note: On ne peut pas toujours éviter le serpent, donc on prend juste une position aléatoire
@@ -241,7 +461,7 @@ def calculer_nombre_pommes(score):
     """
     # Le nombre de pommes est 1 + (score // 100)
     # Donc: 0-99 pts = 1 pomme, 100-199 pts = 1 pomme, 200-299 pts = 2 pommes, etc.
-    return 1 + (score // 200)
+    return 1 + (score // POINTS_PAR_POMME_SUPPLEMENTAIRE)
 
 def est_joueur_piege(nom_joueur):
     """
@@ -250,48 +470,190 @@ def est_joueur_piege(nom_joueur):
     joueurs_amis = ["poussmouss", "madmax"]  # Les bons copains
     return nom_joueur.lower() not in joueurs_amis
 
-def generer_pomme_pieges(serpent_actuel, piege=False):
+def generer_pomme_pieges(serpent_actuel, piege=False, alea=random, niveau=None):
     """
     Génère une pomme. Si piege=True, 20% des pommes sont près des bords
+    alea : le générateur de hasard à utiliser (par défaut, le module random)
+    niveau : avec des murs, la pomme va sur une case libre qu'on peut atteindre (voir niveaux.py)
     """
+    if niveau is not None:
+        return niveau.generer_pomme(serpent_actuel, piege, alea, PROBA_POMME_BORD)
     while True:
-        if piege and random.random() < 0.2:
+        if piege and alea.random() < PROBA_POMME_BORD:
             # 20% : placer la pomme près des bords (en évitant le panneau)
-            bord_choisi = random.choice(['haut', 'bas', 'gauche', 'droite'])
+            bord_choisi = alea.choice(['haut', 'bas', 'gauche', 'droite'])
             if bord_choisi == 'haut':
-                x = random.randint(0, (LARGEUR - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
+                x = alea.randint(0, (LARGEUR_PLATEAU - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
                 # Les 2 premières lignes après le panneau
-                y = random.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR_PANNEAU // TAILLE_CASE + 2)) * TAILLE_CASE
+                y = alea.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR_PANNEAU // TAILLE_CASE + 2)) * TAILLE_CASE
             elif bord_choisi == 'bas':
-                x = random.randint(0, (LARGEUR - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
-                y = random.randint((HAUTEUR // TAILLE_CASE - 3), (HAUTEUR // TAILLE_CASE - 1)) * TAILLE_CASE  # Les 2 dernières lignes
+                x = alea.randint(0, (LARGEUR_PLATEAU - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
+                y = alea.randint((HAUTEUR_PLATEAU // TAILLE_CASE - 3), (HAUTEUR_PLATEAU // TAILLE_CASE - 1)) * TAILLE_CASE  # Les 2 dernières lignes
             elif bord_choisi == 'gauche':
-                x = random.randint(0, 2) * TAILLE_CASE  # Les 2 premières colonnes
+                x = alea.randint(0, 2) * TAILLE_CASE  # Les 2 premières colonnes
                 # Y dans la zone de jeu seulement
-                y = random.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
+                y = alea.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR_PLATEAU - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
             else:  # droite
-                x = random.randint((LARGEUR // TAILLE_CASE - 3), (LARGEUR // TAILLE_CASE - 1)) * TAILLE_CASE  # Les 2 dernières colonnes
+                x = alea.randint((LARGEUR_PLATEAU // TAILLE_CASE - 3), (LARGEUR_PLATEAU // TAILLE_CASE - 1)) * TAILLE_CASE  # Les 2 dernières colonnes
                 # Y dans la zone de jeu seulement
-                y = random.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
+                y = alea.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR_PLATEAU - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
         else:
             # 80% : placement aléatoire normal (dans la zone de jeu, pas le panneau)
-            x = random.randint(0, (LARGEUR - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
-            y = random.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
+            x = alea.randint(0, (LARGEUR_PLATEAU - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
+            y = alea.randint((HAUTEUR_PANNEAU // TAILLE_CASE), (HAUTEUR_PLATEAU - TAILLE_CASE) // TAILLE_CASE) * TAILLE_CASE
         
         pomme_pos = (x, y)
         return pomme_pos
 
-def initialiser_pommes(nombre_pommes, serpent_actuel, piege=False):
+def initialiser_pommes(nombre_pommes, serpent_actuel, piege=False, alea=random, niveau=None):
     """
     Crée une liste de pommes à partir du nombre demandé
     Si piege=True, 20% des pommes seront près des bords
     """
     pommes = []
     for _ in range(nombre_pommes):
-        pomme = generer_pomme_pieges(serpent_actuel, piege=piege)
+        pomme = generer_pomme_pieges(serpent_actuel, piege=piege, alea=alea, niveau=niveau)
         pommes.append(pomme)
     return pommes
 
+# ===================================================================
+# LES RÈGLES DU JEU : FAIRE AVANCER UNE PARTIE D'UNE CASE
+# ===================================================================
+# Les règles sont rangées ici (et pas dans la boucle du jeu) pour qu'on
+# puisse faire tourner une partie sans fenêtre : serveur réseau, tests...
+
+class Partie:
+    """
+    Tout ce qui décrit une partie en cours : le serpent, les pommes,
+    la direction et le score
+    """
+    def __init__(self, piege_joueur=False, alea=random, pommes=None, niveau=None):
+        # Position de départ au milieu de l'écran, alignée avec la grille
+        start_x = (LARGEUR_PLATEAU // 2) // TAILLE_CASE * TAILLE_CASE
+        start_y = (HAUTEUR_PLATEAU // 2) // TAILLE_CASE * TAILLE_CASE
+        # La taille du plateau de cette partie (pour les robots, voir robots.py)
+        self.largeur_plateau = LARGEUR_PLATEAU
+        self.hauteur_plateau = HAUTEUR_PLATEAU
+        
+        self.serpent = [
+            (start_x, start_y),                          # La tête
+            (start_x - TAILLE_CASE, start_y),            # Le corps
+            (start_x - 2 * TAILLE_CASE, start_y)        # La queue
+        ]
+        self.direction = Direction.DROITE
+        self.direction_demandee = Direction.DROITE
+        self.score = 0
+        self.piege_joueur = piege_joueur
+        self.mode_triche = False  # Mode triche (activable avec backtick)
+        self.alea = alea
+        # Les murs du niveau (None = seulement les bords du plateau, voir niveaux.py)
+        self.niveau = niveau
+        
+        # Générer les pommes initiales (1 au début), sauf si on nous donne
+        # une liste de pommes déjà existante (partagée entre plusieurs serpents)
+        if pommes is None:
+            pommes = initialiser_pommes(1, self.serpent, piege=self.pieges_actifs(), alea=alea, niveau=niveau)
+        self.pommes = pommes
+    
+    def pieges_actifs(self):
+        """
+        Les pièges ne s'appliquent que si le joueur est piégé et que le mode triche est OFF
+        """
+        return not self.mode_triche and self.piege_joueur
+
+def changer_direction(partie, nouvelle_direction):
+    """
+    Demande une nouvelle direction pour le prochain pas
+    On ne peut pas faire demi-tour (aller vers le bas si on va vers le haut, etc.)
+    """
+    dx, dy = partie.direction.value
+    if nouvelle_direction.value != (-dx, -dy):
+        partie.direction_demandee = nouvelle_direction
+
+def avancer_partie(partie, autres_serpents=()):
+    """
+    Fait avancer le serpent d'une case et applique les règles du jeu
+    autres_serpents : les serpents des autres joueurs (à ne pas toucher non plus)
+    
+    Retourne un dictionnaire qui décrit ce qui a changé pendant ce pas :
+      "collision"       : None, "mur" ou "serpent"
+      "tete"            : la nouvelle tête ajoutée
+      "queue"           : la case de queue retirée (None si le serpent a grandi)
+      "pommes_mangees"  : les pommes enlevées
+      "pommes_ajoutees" : les nouvelles pommes
+      "point_oublie"    : True si un piège a fait oublier les points
+    """
+    changements = {"collision": None, "tete": None, "queue": None,
+                   "pommes_mangees": [], "pommes_ajoutees": [], "point_oublie": False}
+    serpent = partie.serpent
+    pommes = partie.pommes
+    
+    # Mettre à jour la direction
+    partie.direction = partie.direction_demandee
+    
+    # Calculer la nouvelle position de la tête
+    # La tête est à l'index 0 de la liste
+    tete_x, tete_y = serpent[0]
+    dx, dy = partie.direction.value  # .value donne (x, y) de la direction
+    
+    nouvelle_tete = (tete_x + dx * TAILLE_CASE, tete_y + dy * TAILLE_CASE)
+    
+    # Vérifier les COLLISIONS avec les murs (y compris le panneau en haut)
+    # Avec un niveau, la carte des murs contient aussi les bords : une seule lecture
+    if partie.niveau is not None:
+        if partie.niveau.est_mur(nouvelle_tete):
+            changements["collision"] = "mur"
+            return changements
+    elif (nouvelle_tete[0] < 0 or nouvelle_tete[0] >= LARGEUR_PLATEAU or
+          nouvelle_tete[1] < HAUTEUR_PANNEAU or nouvelle_tete[1] >= HAUTEUR_PLATEAU):
+        changements["collision"] = "mur"
+        return changements
+    
+    # Vérifier la collision avec soi-même (et avec les autres serpents)
+    if nouvelle_tete in serpent or any(nouvelle_tete in autre for autre in autres_serpents):
+        changements["collision"] = "serpent"
+        return changements
+    
+    # Ajouter la nouvelle tête au début du serpent
+    serpent.insert(0, nouvelle_tete)
+    changements["tete"] = nouvelle_tete
+    
+    # Vérifier si le serpent a mangé une pomme
+    pomme_mangee = False
+    for i, pomme in enumerate(pommes):
+        if nouvelle_tete == pomme:
+            # On a mangé une pomme !
+            # Si mode triche est OFF et c'est un joueur à piéger, oublier 15% du temps de compter les points
+            if partie.pieges_actifs() and partie.alea.random() < PROBA_POINT_OUBLIE:
+                changements["point_oublie"] = True
+            else:
+                partie.score += POINTS_PAR_POMME
+            pomme_mangee = True
+            pommes.pop(i)  # Enlever la pomme mangée
+            changements["pommes_mangees"].append(pomme)
+            # Ajouter une nouvelle pomme
+            nouvelle_pomme = generer_pomme_pieges(serpent, piege=partie.pieges_actifs(), alea=partie.alea,
+                                                  niveau=partie.niveau)
+            pommes.append(nouvelle_pomme)
+            changements["pommes_ajoutees"].append(nouvelle_pomme)
+            
+            # Vérifier si on doit ajouter une pomme supplémentaire
+            nombre_pommes_attendues = calculer_nombre_pommes(partie.score)
+            if len(pommes) < nombre_pommes_attendues:
+                if partie.niveau is None:
+                    nouvelle_pomme = generer_pomme(alea=partie.alea)
+                else:
+                    nouvelle_pomme = partie.niveau.generer_pomme(serpent, False, partie.alea, PROBA_POMME_BORD)
+                pommes.append(nouvelle_pomme)
+                changements["pommes_ajoutees"].append(nouvelle_pomme)
+            break
+    
+    # Si on n'a pas mangé, on retire la queue (sinon le serpent grandit)
+    if not pomme_mangee:
+        changements["queue"] = serpent.pop()
+    
+    return changements
+
 pomme = generer_pomme()
 
 # FONCTION : Demander le nom du joueur et la couleur du serpent dans une fenêtre
@@ -391,10 +753,10 @@ def demander_nom_joueur(ecran, scores_existants=None, joueurs_existants=None):
         instructions = pygame.font.Font(None, 25).render("← → pour changer la couleur | ENTRÉE pour confirmer", True, BLANC)
         ecran.blit(instructions, (LARGEUR // 2 - instructions.get_width() // 2, 530))
         
-        pygame.display.flip()
+        mettre_a_jour_affichage(ecran, "nom")
         
-        # Gérer les événements clavier
-        for evt in pygame.event.get():
+        # Gérer les événements clavier (on dort jusqu'à la prochaine touche)
+        for evt in attendre_evenements_utiles():
             if evt.type == pygame.QUIT:
                 return None, None
             if evt.type == pygame.KEYDOWN:
@@ -422,8 +784,6 @@ def demander_nom_joueur(ecran, scores_existants=None, joueurs_existants=None):
                     if len(nom) < 20:  # Limite de 20 caractères
                         if evt.unicode.isalnum() or evt.unicode.isspace():
                             nom += evt.unicode
-        
-        horloge.tick(30)
     
     # Garder la couleur sélectionnée par l'utilisateur (pas de rechargement)
     nom_final = nom.strip() if nom.strip() else "Joueur"
@@ -441,6 +801,10 @@ def afficher_transition_compte_a_rebours(ecran, titre, duree_secondes=3):
     jeu_actif = True
     
     while jeu_actif and (pygame.time.get_ticks() - debut) < duree_ms:
+        # Calculer le compte à rebours
+        temps_restant_ms = duree_ms - (pygame.time.get_ticks() - debut)
+        secondes_restantes = max(1, int(temps_restant_ms / 1000) + 1)
+        
         ecran.fill(NOIR)
         
         # Afficher le titre
@@ -451,20 +815,20 @@ def afficher_transition_compte_a_rebours(ecran, titre, duree_secondes=3):
         texte_prep = pygame.font.Font(None, 35).render("Préparez-vous...", True, BLANC)
         ecran.blit(texte_prep, (LARGEUR // 2 - texte_prep.get_width() // 2, 330))
         
-        # Calculer et afficher le compte à rebours
-        temps_restant_ms = duree_ms - (pygame.time.get_ticks() - debut)
-        secondes_restantes = max(1, int(temps_restant_ms / 1000) + 1)
-        
+        # Afficher le compte à rebours
         texte_compte = pygame.font.Font(None, 120).render(str(secondes_restantes), True, (255, 215, 0))
         ecran.blit(texte_compte, (LARGEUR // 2 - texte_compte.get_width() // 2, 420))
         
-        pygame.display.flip()
-        
-        for evt in pygame.event.get():
-            if evt.type == pygame.QUIT:
-                jeu_actif = False
+        mettre_a_jour_affichage(ecran, "compte_a_rebours")
         
-        horloge.tick(60)
+        # Dormir jusqu'à ce que le chiffre change (ou qu'un événement arrive)
+        while jeu_actif:
+            temps_restant_ms = duree_ms - (pygame.time.get_ticks() - debut)
+            if temps_restant_ms <= 0 or max(1, int(temps_restant_ms / 1000) + 1) != secondes_restantes:
+                break
+            for evt in attendre_evenements(temps_restant_ms % 1000 + 1):
+                if evt.type == pygame.QUIT:
+                    jeu_actif = False
     
     return jeu_actif
 
@@ -502,7 +866,7 @@ def afficher_feu_artifice(ecran, duree_secondes=2):
         texte = pygame.font.Font(None, 80).render("🎉 RECORD! 🎉", True, (255, 215, 0))
         ecran.blit(texte, (LARGEUR // 2 - texte.get_width() // 2, 150))
         
-        pygame.display.flip()
+        mettre_a_jour_affichage(ecran, "feu_artifice")
         
         # Gérer les événements
         for evt in pygame.event.get():
@@ -537,10 +901,10 @@ def afficher_ecran_pause(ecran, nom_joueur, score_actuel):
         instructions = pygame.font.Font(None, 30).render("Appuyez sur ESPACE pour reprendre | ESC pour quitter", True, (100, 255, 100))
         ecran.blit(instructions, (LARGEUR // 2 - instructions.get_width() // 2, 550))
         
-        pygame.display.flip()
+        mettre_a_jour_affichage(ecran, "pause")
         
-        # Attendre l'entrée de l'utilisateur
-        for evt in pygame.event.get():
+        # Attendre l'entrée de l'utilisateur (sans redessiner pour rien)
+        for evt in attendre_evenements_utiles():
             if evt.type == pygame.QUIT:
                 return "quitter"
             if evt.type == pygame.KEYDOWN:
@@ -548,8 +912,6 @@ def afficher_ecran_pause(ecran, nom_joueur, score_actuel):
                     return "reprendre"
                 elif evt.key == pygame.K_ESCAPE:
                     return "quitter"
-        
-        horloge.tick(30)
 
 # FONCTION : Afficher le menu de démarrage
 def afficher_menu(ecran, scores):
@@ -564,6 +926,13 @@ def afficher_menu(ecran, scores):
     bouton_x = LARGEUR // 2 - bouton_largeur // 2
     bouton_y = HAUTEUR - 120
     
+    def est_sur_bouton(position):
+        return (bouton_x < position[0] < bouton_x + bouton_largeur and
+                bouton_y < position[1] < bouton_y + bouton_hauteur)
+    
+    # Position de la souris (mise à jour par les événements MOUSEMOTION)
+    position_souris = position_dans_jeu(pygame.mouse.get_pos())
+    
     while en_menu:
         ecran.fill(NOIR)
         
@@ -579,9 +948,10 @@ def afficher_menu(ecran, scores):
         # Créer et afficher le classement
         if scores:
             classement = []
-            for nom, liste_scores in scores.items():
-                if liste_scores:
-                    meilleur = max(liste_scores)
+            for nom, historique in scores.items():
+                resume = resume_joueur(historique)
+                if resume["parties"]:
+                    meilleur = resume["meilleur"]
                     classement.append((nom, meilleur))
             
             classement.sort(key=lambda x: x[1], reverse=True)
@@ -596,9 +966,7 @@ def afficher_menu(ecran, scores):
             ecran.blit(texte_vide, (LARGEUR // 2 - texte_vide.get_width() // 2, 160))
         
         # Dessiner le bouton "Démarrer le jeu"
-        souris = pygame.mouse.get_pos()
-        souris_sur_bouton = (bouton_x < souris[0] < bouton_x + bouton_largeur and 
-                             bouton_y < souris[1] < bouton_y + bouton_hauteur)
+        souris_sur_bouton = est_sur_bouton(position_souris)
         
         couleur_bouton = (100, 255, 100) if souris_sur_bouton else VERT
         pygame.draw.rect(ecran, couleur_bouton, (bouton_x, bouton_y, bouton_largeur, bouton_hauteur))
@@ -608,17 +976,24 @@ def afficher_menu(ecran, scores):
         ecran.blit(texte_bouton, (bouton_x + bouton_largeur // 2 - texte_bouton.get_width() // 2,
                                   bouton_y + bouton_hauteur // 2 - texte_bouton.get_height() // 2))
         
-        pygame.display.flip()
-        
-        # Gérer les événements
-        for evt in pygame.event.get():
-            if evt.type == pygame.QUIT:
-                return False
-            if evt.type == pygame.MOUSEBUTTONDOWN:
-                if souris_sur_bouton:
-                    en_menu = False
-        
-        horloge.tick(30)
+        mettre_a_jour_affichage(ecran, "menu")
+        
+        # Gérer les événements : on dort jusqu'à ce qu'il se passe quelque chose
+        # Le menu n'est redessiné que si la souris entre ou sort du bouton
+        a_redessiner = False
+        while en_menu and not a_redessiner:
+            for evt in attendre_evenements():
+                if evt.type == pygame.QUIT:
+                    return False
+                if evt.type == pygame.MOUSEBUTTONDOWN:
+                    if est_sur_bouton(position_dans_jeu(evt.pos)):
+                        en_menu = False
+                elif evt.type == pygame.MOUSEMOTION:
+                    position_souris = position_dans_jeu(evt.pos)
+                    if est_sur_bouton(position_souris) != souris_sur_bouton:
+                        a_redessiner = True
+                else:
+                    a_redessiner = True
     
     return True
 
@@ -673,10 +1048,10 @@ def afficher_ecran_fin(ecran, nom, score_final, meilleur):
         ecran.blit(texte_option2, (LARGEUR // 2 - texte_option2.get_width() // 2, 420))
         ecran.blit(texte_option3, (LARGEUR // 2 - texte_option3.get_width() // 2, 460))
         
-        pygame.display.flip()
+        mettre_a_jour_affichage(ecran, "fin")
         
-        # Attendre un choix
-        for evt in pygame.event.get():
+        # Attendre un choix (sans redessiner tant que rien ne se passe)
+        for evt in attendre_evenements_utiles():
             if evt.type == pygame.QUIT:
                 return "quitter"
             if evt.type == pygame.KEYDOWN:
@@ -686,338 +1061,695 @@ def afficher_ecran_fin(ecran, nom, score_final, meilleur):
                     choix = "autre_joueur"
                 elif evt.key == pygame.K_q:
                     choix = "quitter"
-        
-        horloge.tick(30)
     
     # Retourner le choix du joueur
     return choix
 
-# Score
-score = 0
+# Les images des cases, fabriquées une seule fois pour chaque couleur :
+# pendant la partie, dessiner une case revient à copier une petite image
+# (rien de nouveau n'est créé à chaque image du jeu)
+cases_serpent = {}
+case_pomme = None
 
-# Charger tous les scores enregistrés
-tous_les_scores = charger_scores()
+def fabriquer_case(couleur):
+    """
+    Un carré de la couleur demandée, avec une bordure noire
+    """
+    case = pygame.Surface((TAILLE_CASE, TAILLE_CASE))
+    case.fill(NOIR)
+    case.fill(couleur, (1, 1, TAILLE_CASE - 2, TAILLE_CASE - 2))
+    return case
 
-# Charger les informations des joueurs (couleurs préférées, etc.)
-tous_les_joueurs = charger_joueurs()
+def obtenir_cases_serpent(couleur_serpent):
+    """
+    Les images (corps, tête) du serpent de cette couleur, la tête en plus clair
+    """
+    # Les couleurs lues dans joueurs.json sont des listes
+    if type(couleur_serpent) is not tuple:
+        couleur_serpent = tuple(couleur_serpent)
+    cases = cases_serpent.get(couleur_serpent)
+    if cases is None:
+        # La tête a une couleur plus claire (on augmente la luminosité)
+        couleur_tete = tuple(min(c + 100, 255) for c in couleur_serpent)
+        cases = cases_serpent[couleur_serpent] = (fabriquer_case(couleur_serpent), fabriquer_case(couleur_tete))
+    return cases
 
-# ===================================================================
-# BOUCLE DE JEU PRINCIPALE (gère plusieurs parties)
-# ===================================================================
+def obtenir_case_pomme():
+    global case_pomme
+    if case_pomme is None:
+        case_pomme = pygame.Surface((TAILLE_CASE, TAILLE_CASE))
+        case_pomme.fill(ROUGE)
+    return case_pomme
 
-continuer_jeu = True
-nom_joueur = ""
-meilleur_score = 0
-couleur_serpent = VERT  # Couleur par défaut
-demander_nouveau_nom = True
+# FONCTION : Dessiner un serpent
+def dessiner_case_serpent(ecran, position, couleur_serpent, est_tete=False):
+    """
+    Dessine un carré du serpent à cette position de l'écran, la tête en plus clair
+    """
+    ecran.blit(obtenir_cases_serpent(couleur_serpent)[1 if est_tete else 0], position)
 
-# Afficher le menu de démarrage avec le classement
-if not afficher_menu(ecran, tous_les_scores):
-    continuer_jeu = False
+def dessiner_serpent(ecran, serpent, couleur_serpent):
+    """
+    Dessine tous les carrés d'un serpent, la tête en plus clair
+    """
+    corps, tete = obtenir_cases_serpent(couleur_serpent)
+    # Toutes les cases du corps en un seul appel, puis la tête par-dessus
+    ecran.blits(zip(repeat(corps), islice(serpent, 1, None)), doreturn=False)
+    ecran.blit(tete, serpent[0])
 
-# Vider la file d'événements
-pygame.event.clear()
+# Les textes du panneau déjà rendus : le nom ne change jamais pendant une
+# partie et le score rarement, inutile de refaire leur image à chaque fois
+textes_panneau = {}
+TEXTES_PANNEAU_MAX = 64
 
-while continuer_jeu:
-    # Demander le nom du joueur que s'il faut (pas au redémarrage)
-    if demander_nouveau_nom:
-        # Vider la file d'événements avant de demander le nom
-        pygame.event.clear()
-        resultat = demander_nom_joueur(ecran, tous_les_scores, tous_les_joueurs)
-        
-        if resultat is None or resultat[0] is None:
-            # L'utilisateur a fermé la fenêtre
-            continuer_jeu = False
-            break
-        
-        nom_joueur, couleur_serpent = resultat
-        
-        # Sauvegarder la couleur choisie du joueur
-        sauvegarder_couleur_joueur(tous_les_joueurs, nom_joueur, couleur_serpent)
-        
-        # Récupérer le meilleur score du joueur
-        meilleur_score = obtenir_meilleur_score(tous_les_scores, nom_joueur)
-        
-        # Afficher un message de bienvenue dans le terminal
-        print(f"\n🎮 Bon jeu {nom_joueur} ! 🐍")
-        print(f"Ton meilleur score précédent : {meilleur_score}\n")
-        
-        # Afficher un écran de transition avec compte à rebours
-        if not afficher_transition_compte_a_rebours(ecran, f"Bienvenue {nom_joueur}!", 3):
-            continuer_jeu = False
-            break
-        
-        # Prochain tour, on ne demandera pas le nom à moins que l'utilisateur choisisse "autre_joueur"
-        demander_nouveau_nom = False
-    else:
-        # Quand on rejoue avec le même joueur, recharger sa couleur sauvegardée
-        couleur_sauvegardee = obtenir_couleur_rgb_joueur(tous_les_joueurs, nom_joueur)
-        if couleur_sauvegardee:
-            couleur_serpent = couleur_sauvegardee
-    
-    if not continuer_jeu:
-        break
-    
-    # ===================================================================
-    # ÉTAPE 5 : BOUCLE PRINCIPALE DU JEU (une seule partie)
-    # ===================================================================
+def texte_panneau(police_texte, modele, valeur, couleur):
     """
-    CONCEPT : BOUCLE
-    Une boucle répète le même code indéfiniment (while True).
-    Ici, on répète FPS fois par seconde :
-      1. Vérifier les événements (touches du clavier)
-      2. Mettre à jour la position
-      3. Vérifier les collisions
-      4. Dessiner l'écran
+    L'image du texte modele.format(valeur), rendue seulement la première fois
     """
+    cle = (police_texte, modele, valeur, couleur)
+    image = textes_panneau.get(cle)
+    if image is None:
+        if len(textes_panneau) >= TEXTES_PANNEAU_MAX:
+            textes_panneau.clear()
+        image = textes_panneau[cle] = police_texte.render(modele.format(valeur), True, couleur)
+    return image
+
+# FONCTION : Dessiner une image de la partie en cours
+def dessiner_partie(ecran, serpent, pommes, nom_joueur, score, couleur_serpent, mode_triche, camera=None,
+                    pas_par_seconde=None, niveau=None):
+    """
+    Dessine le panneau d'information, le serpent et les pommes
+    (ne met pas à jour l'affichage : voir mettre_a_jour_affichage)
+    camera : sur un plateau plus grand que la fenêtre, la caméra qui suit
+             le serpent (voir camera.py) ; seules les cases visibles sont dessinées
+    pas_par_seconde : en mode turbo, le nombre de pas joués par seconde (voir turbo.py)
+    niveau : les murs du niveau, copiés depuis leur image toute prête (voir niveaux.py)
+    """
+    # Remplir le fond avec du noirf
+    ecran.fill(NOIR)
     
-    # Réinitialiser les variables pour la nouvelle partie
-    score = 0
-    jeu_actif = True
-    jeu_pause = False
-    mode_triche = False  # Mode triche (activable avec backtick)
+    # Dessiner le panneau d'information en haut (gris foncé)
+    pygame.draw.rect(ecran, (40, 40, 40), (0, 0, LARGEUR, HAUTEUR_PANNEAU))
+    # Ligne de séparation entre le panneau et le jeu
+    pygame.draw.line(ecran, (100, 100, 100), (0, HAUTEUR_PANNEAU), (LARGEUR, HAUTEUR_PANNEAU), 2)
     
-    # Vérifier si on doit piéger le joueur (s'il n'est pas Zoé ou un ami) - sera utilisé si mode_triche est OFF
-    piege_joueur = est_joueur_piege(nom_joueur)
-    fps_jeu = FPS + 2 if (piege_joueur and not mode_triche) else FPS  # +2 FPS si piégé et pas en mode triche
+    # Afficher le nom du joueur au centre du panneau (haut)
+    # En couleur dorée si mode triche, sinon vert
+    couleur_nom = (255, 200, 0) if mode_triche else (100, 255, 100)
+    texte_nom = texte_panneau(police_nom_partie, "Joueur: {}", nom_joueur, couleur_nom)
+    ecran.blit(texte_nom, (LARGEUR // 2 - texte_nom.get_width() // 2, 15))
     
-    # Réinitialiser la position du serpent
-    start_x = (LARGEUR // 2) // TAILLE_CASE * TAILLE_CASE
-    start_y = (HAUTEUR // 2) // TAILLE_CASE * TAILLE_CASE
+    # Afficher le score au centre du panneau (bas)
+    texte_score = texte_panneau(police_score_partie, "Score: {}", score, BLEU)
+    ecran.blit(texte_score, (LARGEUR // 2 - texte_score.get_width() // 2, 45))
     
-    serpent = [
-        (start_x, start_y),                          # La tête
-        (start_x - TAILLE_CASE, start_y),            # Le corps
-        (start_x - 2 * TAILLE_CASE, start_y)        # La queue
-    ]
+    # Mode turbo : le rythme réel, à droite du panneau
+    if pas_par_seconde is not None:
+        texte_rythme = texte_panneau(police_score_partie, "Pas/s: {}", round(pas_par_seconde), (255, 200, 0))
+        ecran.blit(texte_rythme, (LARGEUR - 20 - texte_rythme.get_width(), 30))
+    
+    if camera is None:
+        # Les murs du niveau : une seule copie d'image
+        if niveau is not None:
+            ecran.blit(niveau.couche_murs(), (0, HAUTEUR_PANNEAU))
+        
+        # Dessiner le serpent
+        dessiner_serpent(ecran, serpent, couleur_serpent)
+        
+        # Dessiner toutes les pommes (en rouge)
+        ecran.blits(zip(repeat(obtenir_case_pomme()), pommes), doreturn=False)
+        return
     
-    # Réinitialiser la direction
-    direction = Direction.DROITE
-    direction_demandee = Direction.DROITE
+    # Avec une caméra : seulement ce qui est visible, sans déborder sur le panneau
+    ecran.set_clip((0, HAUTEUR_PANNEAU, LARGEUR, HAUTEUR - HAUTEUR_PANNEAU))
+    if niveau is not None:
+        # La partie visible de l'image des murs (le reste est coupé)
+        ecran.blit(niveau.couche_murs(), camera.vers_ecran((0, HAUTEUR_PANNEAU)))
+    for case in camera.cases_visibles(camera.serpent):
+        dessiner_case_serpent(ecran, camera.vers_ecran(case), couleur_serpent)
+    if camera.visible(serpent[0]):
+        dessiner_case_serpent(ecran, camera.vers_ecran(serpent[0]), couleur_serpent, est_tete=True)
+    for pomme in camera.cases_visibles(camera.pommes):
+        ecran.blit(obtenir_case_pomme(), camera.vers_ecran(pomme))
+    ecran.set_clip(None)
+
+def lire_taille_plateau(texte):
+    """
+    Transforme "120x80" en (120, 80) : le nombre de cases du plateau
+    Le plateau ne peut pas être plus petit que la fenêtre
+    """
+    try:
+        colonnes, lignes = (int(nombre) for nombre in texte.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"taille de plateau invalide: {texte} (exemple: 120x80)")
+    colonnes_min = LARGEUR // TAILLE_CASE
+    lignes_min = (HAUTEUR - HAUTEUR_PANNEAU) // TAILLE_CASE
+    if colonnes < colonnes_min or lignes < lignes_min:
+        raise argparse.ArgumentTypeError(f"le plateau doit faire au moins {colonnes_min}x{lignes_min}")
+    return colonnes, lignes
+
+def lire_taille_fenetre(texte):
+    """
+    Transforme "3000x2340" en (3000, 2340) : la taille de la fenêtre en pixels
+    """
+    try:
+        largeur, hauteur = (int(nombre) for nombre in texte.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"taille de fenêtre invalide: {texte} (exemple: 2000x1560)")
+    if largeur <= 0 or hauteur <= 0:
+        raise argparse.ArgumentTypeError(f"taille de fenêtre invalide: {texte}")
+    return largeur, hauteur
+
+def changer_taille_plateau(colonnes, lignes):
+    """
+    Change la taille du plateau (en nombre de cases)
+    """
+    global LARGEUR_PLATEAU, HAUTEUR_PLATEAU
+    LARGEUR_PLATEAU = colonnes * TAILLE_CASE
+    HAUTEUR_PLATEAU = HAUTEUR_PANNEAU + lignes * TAILLE_CASE
+
+def lire_options(arguments=None):
+    """
+    Lit les options de la ligne de commande
+    Exemple : python snake_game.py --capture images --format-capture png
+    """
+    parseur = argparse.ArgumentParser(description="Jeu Snake")
+    parseur.add_argument("--capture", metavar="DOSSIER",
+                         help="enregistrer les images du jeu dans ce dossier (sans fenêtre)")
+    parseur.add_argument("--format-capture", choices=[FORMAT_BRUT, FORMAT_PNG], default=FORMAT_BRUT,
+                         help="format des images capturées (flux brut ou PNG)")
+    parseur.add_argument("--images-max", type=int, default=None,
+                         help="fermer le jeu après ce nombre d'images capturées")
+    parseur.add_argument("--spectateurs", nargs="?", const="127.0.0.1", metavar="HOTE",
+                         help="publier la partie vers le service de diffusion aux spectateurs")
+    parseur.add_argument("--profile", nargs="?", const="profil", metavar="PREFIXE",
+                         help="mesurer où le jeu passe son temps (écrit PREFIXE.folded et PREFIXE.txt)")
+    parseur.add_argument("--allocations", action="store_true",
+                         help="mesurer les allocations et les pauses du ramasse-miettes, image par image")
+    parseur.add_argument("--telemetrie", nargs="?", const="telemetrie", metavar="DOSSIER",
+                         help="écrire les mesures de chaque partie (fichier tournant et fichier Prometheus)")
+    parseur.add_argument("--fantome", action="store_true",
+                         help="faire la course contre le fantôme de son meilleur score")
+    parseur.add_argument("--classement-http", nargs="?", type=int, const=8080, metavar="PORT",
+                         help="servir le classement en JSON aux écrans du hall (port 8080 par défaut)")
+    parseur.add_argument("--sans-son", action="store_true", help="jouer sans les sons")
+    parseur.add_argument("--mode-enfant", action="store_true",
+                         help="après un choc, revenir 3 secondes en arrière au lieu de perdre")
+    parseur.add_argument("--robot", metavar="NOM",
+                         help="un robot joue à la place du clavier (voir robots.py), ex: gourmand")
+    parseur.add_argument("--turbo", nargs="?", type=float, const=0, metavar="MULTIPLICATEUR",
+                         help="jouer plus vite que FPS (sans limite par défaut) en ne dessinant qu'une partie des pas")
+    parseur.add_argument("--turbo-images", type=int, default=30, metavar="M",
+                         help="en mode turbo, dessiner au plus M images par seconde")
+    parseur.add_argument("--turbo-pas", type=int, default=None, metavar="N",
+                         help="en mode turbo, dessiner un pas sur N")
+    parseur.add_argument("--stress", type=int, metavar="LONGUEUR",
+                         help="commencer avec un serpent de cette longueur posé sur tout le plateau (voir scenarios.py)")
+    parseur.add_argument("--stress-pommes", type=int, default=1, metavar="N",
+                         help="avec --stress, le nombre de pommes sur le plateau")
+    parseur.add_argument("--fenetre", type=lire_taille_fenetre, metavar="LARGEURxHAUTEUR",
+                         help="ouvrir une fenêtre plus grande (le jeu est agrandi), ex: 2000x1560")
+    parseur.add_argument("--plein-ecran", action="store_true",
+                         help="jouer sur tout l'écran (le jeu est agrandi)")
+    parseur.add_argument("--niveau", metavar="NOM",
+                         help="jouer avec les murs du niveau NOM fourni avec le jeu (ou d'un fichier)")
+    parseur.add_argument("--plateau", type=lire_taille_plateau, metavar="COLONNESxLIGNES",
+                         help="jouer sur un plateau plus grand que la fenêtre, ex: 120x80")
+    options = parseur.parse_args(arguments)
+    if options.fantome and options.plateau:
+        parseur.error("--fantome ne marche que sur le plateau normal")
+    if options.fantome and options.niveau:
+        parseur.error("--fantome ne marche que sur le plateau sans murs")
+    colonnes, lignes = options.plateau or (LARGEUR // TAILLE_CASE, (HAUTEUR - HAUTEUR_PANNEAU) // TAILLE_CASE)
+    if options.stress is not None:
+        if not 1 <= options.stress <= colonnes * lignes:
+            parseur.error(f"--stress : la longueur doit aller de 1 à {colonnes * lignes} (les cases du plateau)")
+        if colonnes % 2 and lignes % 2:
+            parseur.error("--stress : il faut un nombre pair de colonnes ou de lignes (voir robots.cycle_hamiltonien)")
+    if options.stress and options.niveau:
+        parseur.error("--stress remplit tout le plateau : pas de murs possibles")
+    if options.fantome and options.stress:
+        parseur.error("--fantome ne marche qu'avec le serpent de départ normal")
+    if options.turbo is not None and options.turbo < 0:
+        parseur.error("--turbo : le multiplicateur doit être positif")
+    if options.turbo_images < 1:
+        parseur.error("--turbo-images : il faut au moins une image par seconde")
+    if options.turbo_pas is not None and options.turbo_pas < 1:
+        parseur.error("--turbo-pas : il faut dessiner au moins un pas sur 1")
+    if options.robot:
+        from robots import trouver_robot
+        try:
+            trouver_robot(options.robot)
+        except (ValueError, ImportError, AttributeError) as erreur:
+            parseur.error(f"--robot : {erreur}")
+    # Le niveau est chargé tout de suite : un nom inconnu ou un niveau faux est une erreur d'option
+    options.niveau_charge = None
+    if options.niveau:
+        from niveaux import charger_niveau, niveaux_disponibles
+        try:
+            options.niveau_charge = charger_niveau(options.niveau, colonnes * TAILLE_CASE,
+                                                   HAUTEUR_PANNEAU + lignes * TAILLE_CASE)
+        except OSError:
+            parseur.error(f"--niveau : niveau {options.niveau} introuvable "
+                          f"(niveaux disponibles : {', '.join(niveaux_disponibles())})")
+        except ValueError as erreur:
+            parseur.error(f"--niveau : {erreur}")
+    return options
+
+def main(arguments=None):
+    """
+    Lance le jeu : menu, puis parties successives jusqu'à ce que le joueur quitte
+    """
+    global capture_images, serveur_classement, suivi_allocations, fenetre_agrandie
+    options = lire_options(arguments)
+
+    # Profilage : on note régulièrement ce que fait le jeu (voir profilage.py)
+    profileur = None
+    if options.profile:
+        from profilage import ProfileurEchantillons
+        profileur = ProfileurEchantillons()
+        profileur.demarrer()
+
+    # Allocations et pauses du ramasse-miettes, écran par écran (voir allocations.py)
+    if options.allocations:
+        from allocations import SuiviAllocations
+        suivi_allocations = SuiviAllocations()
+        suivi_allocations.demarrer()
+
+    # En mode capture, on dessine en mémoire sans ouvrir de fenêtre
+    if options.capture:
+        activer_pilote_sans_fenetre()
+        capture_images = CaptureImages(options.capture, options.format_capture, options.images_max)
+
+    # Un robot joue à la place du clavier (voir robots.py)
+    robot = None
+    if options.robot:
+        from robots import trouver_robot
+        robot = trouver_robot(options.robot)
+
+    # Plateau plus grand que la fenêtre
+    if options.plateau:
+        changer_taille_plateau(*options.plateau)
     
-    # Générer les pommes initiales (1 au début)
-    # Appliquer les pièges seulement si mode_triche est OFF
-    pommes = initialiser_pommes(1, serpent, piege=(not mode_triche and piege_joueur))
+    # Les murs du niveau, compilés une seule fois dans lire_options (voir niveaux.py)
+    niveau = options.niveau_charge
     
-    while jeu_actif:
-        
-        # --- GESTION DE LA PAUSE ---
-        while jeu_pause:
-            resultat_pause = afficher_ecran_pause(ecran, nom_joueur, score)
-            if resultat_pause == "reprendre":
-                jeu_pause = False
-            elif resultat_pause == "quitter":
-                jeu_actif = False
+    # Diffusion de la partie aux spectateurs (voir spectateurs.py)
+    publicateur = None
+    if options.spectateurs:
+        from spectateurs import PublicateurSpectateurs
+        publicateur = PublicateurSpectateurs(options.spectateurs)
+
+    # Créer la surface de jeu (la fenêtre où se dessine tout)
+    if options.fenetre or options.plein_ecran:
+        # Le jeu dessine dans un canevas de LARGEUR x HAUTEUR, agrandi à la taille de la fenêtre
+        from canevas import FenetreAgrandie
+        fenetre_agrandie = FenetreAgrandie(options.fenetre, options.plein_ecran)
+        ecran = fenetre_agrandie.canevas
+    else:
+        ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
+    pygame.display.set_caption("🐍 Jeu Snake - Apprendre à Programmer!")
+    
+    # Préparer tous les sons une fois pour toutes
+    sons = Sons(actif=not options.sans_son)
+
+    # Score
+    score = 0
+
+    # Charger tous les scores enregistrés
+    tous_les_scores = charger_scores()
+
+    # Charger les informations des joueurs (couleurs préférées, etc.)
+    tous_les_joueurs = charger_joueurs()
+    
+    # Mesures de chaque partie pour surveiller les bornes (voir telemetrie.py)
+    telemetrie = None
+    if options.telemetrie:
+        from telemetrie import Telemetrie
+        telemetrie = Telemetrie(options.telemetrie)
+
+    # Classement pour les écrans du hall (voir classement_http.py)
+    if options.classement_http:
+        from classement_http import ServeurClassement
+        serveur_classement = ServeurClassement(tous_les_scores, port=options.classement_http)
+        serveur_classement.demarrer()
+        print(f"🌐 Classement disponible sur le port {serveur_classement.port}")
+
+    # ===================================================================
+    # BOUCLE DE JEU PRINCIPALE (gère plusieurs parties)
+    # ===================================================================
+
+    continuer_jeu = True
+    nom_joueur = ""
+    meilleur_score = 0
+    couleur_serpent = VERT  # Couleur par défaut
+    demander_nouveau_nom = True
+
+    # Afficher le menu de démarrage avec le classement
+    if not afficher_menu(ecran, tous_les_scores):
+        continuer_jeu = False
+
+    # Vider la file d'événements
+    pygame.event.clear()
+
+    while continuer_jeu:
+        # Demander le nom du joueur que s'il faut (pas au redémarrage)
+        if demander_nouveau_nom:
+            # Vider la file d'événements avant de demander le nom
+            pygame.event.clear()
+            resultat = demander_nom_joueur(ecran, tous_les_scores, tous_les_joueurs)
+            
+            if resultat is None or resultat[0] is None:
+                # L'utilisateur a fermé la fenêtre
+                continuer_jeu = False
                 break
+            
+            nom_joueur, couleur_serpent = resultat
+            
+            # Sauvegarder la couleur choisie du joueur
+            sauvegarder_couleur_joueur(tous_les_joueurs, nom_joueur, couleur_serpent)
+            
+            # Récupérer le meilleur score du joueur
+            meilleur_score = obtenir_meilleur_score(tous_les_scores, nom_joueur)
+            
+            # Afficher un message de bienvenue dans le terminal
+            print(f"\n🎮 Bon jeu {nom_joueur} ! 🐍")
+            print(f"Ton meilleur score précédent : {meilleur_score}\n")
+            
+            # Afficher un écran de transition avec compte à rebours
+            if not afficher_transition_compte_a_rebours(ecran, f"Bienvenue {nom_joueur}!", 3):
+                continuer_jeu = False
+                break
+            
+            # Prochain tour, on ne demandera pas le nom à moins que l'utilisateur choisisse "autre_joueur"
+            demander_nouveau_nom = False
+        else:
+            # Quand on rejoue avec le même joueur, recharger sa couleur sauvegardée
+            couleur_sauvegardee = obtenir_couleur_rgb_joueur(tous_les_joueurs, nom_joueur)
+            if couleur_sauvegardee:
+                couleur_serpent = tuple(couleur_sauvegardee)
         
-        if not jeu_actif:
+        if not continuer_jeu:
             break
         
-        # --- ÉVÉNEMENTS (Que fait l'utilisateur ?) ---
-        for evenement in pygame.event.get():
-            """
-            Les événements sont les actions de l'utilisateur :
-            - Appuyer sur une touche
-            - Fermer la fenêtre
-            - Cliquer avec la souris (non utilisé ici)
-            """
+        # ===================================================================
+        # ÉTAPE 5 : BOUCLE PRINCIPALE DU JEU (une seule partie)
+        # ===================================================================
+        """
+        CONCEPT : BOUCLE
+        Une boucle répète le même code indéfiniment (while True).
+        Ici, on répète FPS fois par seconde :
+          1. Vérifier les événements (touches du clavier)
+          2. Mettre à jour la position
+          3. Vérifier les collisions
+          4. Dessiner l'écran
+        """
+        
+        # Réinitialiser les variables pour la nouvelle partie
+        jeu_actif = True
+        jeu_pause = False
+        
+        # Vérifier si on doit piéger le joueur (s'il n'est pas Zoé ou un ami) - sera utilisé si mode_triche est OFF
+        piege_joueur = est_joueur_piege(nom_joueur)
+        fps_jeu = FPS + 2 if piege_joueur else FPS  # +2 FPS si piégé (le mode triche est OFF au départ)
+        
+        # Nouvelle partie : serpent au milieu, direction DROITE, 1 pomme, score 0
+        partie = Partie(piege_joueur, niveau=niveau)
+        # Les parties d'essai (un robot joue, ou le serpent de --stress) ne
+        # vont ni dans les scores, ni dans le classement, ni dans le fantôme
+        partie_officielle = not (robot or options.stress)
+        
+        # Scénario d'essai : un serpent très long déjà posé sur le plateau (voir scenarios.py)
+        if options.stress:
+            from scenarios import preparer_partie
+            preparer_partie(partie, options.stress, options.stress_pommes,
+                            largeur_plateau=LARGEUR_PLATEAU, hauteur_plateau=HAUTEUR_PLATEAU)
+        if publicateur is not None:
+            publicateur.debut_partie(partie, nom_joueur, couleur_serpent)
+        
+        # Course contre le fantôme : rejouer le record et enregistrer cette partie (voir fantome.py)
+        fantome = enregistreur = None
+        if options.fantome:
+            from fantome import ouvrir_fantome, EnregistreurFantome
+            fantome = ouvrir_fantome(nom_joueur)
+            if partie_officielle:
+                enregistreur = EnregistreurFantome(nom_joueur, partie.serpent)
+        
+        # Plateau plus grand que la fenêtre : une caméra suit le serpent (voir camera.py)
+        camera = None
+        if LARGEUR_PLATEAU > LARGEUR or HAUTEUR_PLATEAU > HAUTEUR:
+            from camera import Camera
+            camera = Camera(partie, LARGEUR_PLATEAU, HAUTEUR_PLATEAU)
+        
+        # Mode enfant : on se souvient des derniers pas pour revenir en arrière (voir rembobinage.py)
+        rembobinage = None
+        if options.mode_enfant:
+            from rembobinage import Rembobinage, SECONDES_REMBOBINAGE
+            rembobinage = Rembobinage(partie, SECONDES_REMBOBINAGE * fps_jeu)
+        
+        mesures = telemetrie.nouvelle_partie(fps_jeu) if telemetrie is not None else None
+        collision = None
+        
+        # Mode turbo : plus de pas par seconde, et pas tous dessinés (voir turbo.py)
+        turbo = None
+        if options.turbo is not None:
+            from turbo import Turbo
+            turbo = Turbo(options.turbo, options.turbo_images, options.turbo_pas)
+        
+        while jeu_actif:
             
-            if evenement.type == pygame.QUIT:
-                # L'utilisateur a cliqué sur la croix pour fermer
-                print("⚠️ pygame.QUIT EVENT - Setting jeu_actif = False")
-                jeu_actif = False
+            # --- GESTION DE LA PAUSE ---
+            if jeu_pause and mesures is not None:
+                mesures.pause()
+            while jeu_pause:
+                resultat_pause = afficher_ecran_pause(ecran, nom_joueur, partie.score)
+                if resultat_pause == "reprendre":
+                    jeu_pause = False
+                elif resultat_pause == "quitter":
+                    jeu_actif = False
+                    break
             
-            # Événement KEYDOWN = une touche est appuyée
-            if evenement.type == pygame.KEYDOWN:
-                
-                # FLÈCHE HAUT
-                if evenement.key == pygame.K_UP:
-                    # On ne peut pas aller vers le haut si on va vers le bas
-                    if direction != Direction.BAS:
-                        direction_demandee = Direction.HAUT
-                
-                # FLÈCHE BAS
-                elif evenement.key == pygame.K_DOWN:
-                    if direction != Direction.HAUT:
-                        direction_demandee = Direction.BAS
-                
-                # FLÈCHE GAUCHE
-                elif evenement.key == pygame.K_LEFT:
-                    if direction != Direction.DROITE:
-                        direction_demandee = Direction.GAUCHE
-                
-                # FLÈCHE DROITE
-                elif evenement.key == pygame.K_RIGHT:
-                    if direction != Direction.GAUCHE:
-                        direction_demandee = Direction.DROITE
-                
-                # ESPACE pour mettre en pause
-                elif evenement.key == pygame.K_SPACE:
-                    jeu_pause = not jeu_pause
-                
-                # BACKTICK (`) pour activer/désactiver le mode triche
-                elif evenement.key == pygame.K_BACKQUOTE:
-                    mode_triche = not mode_triche
-                    print(f"Mode triche: {'ACTIVÉ' if mode_triche else 'DÉSACTIVÉ'}")
+            if not jeu_actif:
+                break
+            
+            # --- ÉVÉNEMENTS (Que fait l'utilisateur ?) ---
+            for evenement in pygame.event.get():
+                """
+                Les événements sont les actions de l'utilisateur :
+                - Appuyer sur une touche
+                - Fermer la fenêtre
+                - Cliquer avec la souris (non utilisé ici)
+                """
                 
-                # ESC pour quitter
-                elif evenement.key == pygame.K_ESCAPE:
+                if evenement.type == pygame.QUIT:
+                    # L'utilisateur a cliqué sur la croix pour fermer
+                    print("⚠️ pygame.QUIT EVENT - Setting jeu_actif = False")
                     jeu_actif = False
-        
-        # --- MISE À JOUR (Que se passe-t-il dans le jeu ?) ---
-        
-        # Mettre à jour la direction
-        direction = direction_demandee
-        
-        # Calculer la nouvelle position de la tête
-        # La tête est à l'index 0 de la liste
-        tete_x, tete_y = serpent[0]
-        dx, dy = direction.value  # .value donne (x, y) de la direction
-        
-        nouvelle_tete = (tete_x + dx * TAILLE_CASE, tete_y + dy * TAILLE_CASE)
-        
-        # Vérifier les COLLISIONS avec les murs (y compris le panneau en haut)
-        if (nouvelle_tete[0] < 0 or nouvelle_tete[0] >= LARGEUR or
-            nouvelle_tete[1] < HAUTEUR_PANNEAU or nouvelle_tete[1] >= HAUTEUR):
-            print(f"\n💥 Collision avec un mur! Score: {score}")
-            # Mettre à jour le meilleur score
-            if score > meilleur_score:
-                meilleur_score = score
-            jeu_actif = False
-            break
-        
-        # Vérifier la collision avec soi-même
-        if nouvelle_tete in serpent:
-            print(f"\n💥 Vous avez touché vous-même! Score: {score}")
-            # Mettre à jour le meilleur score
-            if score > meilleur_score:
-                meilleur_score = score
-            jeu_actif = False
-            break
-        
-        # Ajouter la nouvelle tête au début du serpent
-        serpent.insert(0, nouvelle_tete)
-        
-        # Vérifier si le serpent a mangé une pomme
-        pomme_mangee = False
-        for i, pomme in enumerate(pommes):
-            if nouvelle_tete == pomme:
-                # On a mangé une pomme !
-                # Si mode triche est OFF et c'est un joueur à piéger, oublier 15% du temps de compter les points
-                if not mode_triche and piege_joueur and random.random() < 0.15:
-                    print(f"Oups! 👻 Point oublié...")
-                else:
-                    score += 10
-                pomme_mangee = True
-                pommes.pop(i)  # Enlever la pomme mangée
-                # Ajouter une nouvelle pomme
-                pommes.append(generer_pomme_pieges(serpent, piege=(not mode_triche and piege_joueur)))
-                print(f"Miam! Pomme mangée. Score: {score}")
                 
-                # Vérifier si on doit ajouter une pomme supplémentaire
-                nombre_pommes_attendues = calculer_nombre_pommes(score)
-                if len(pommes) < nombre_pommes_attendues:
-                    pommes.append(generer_pomme())
+                # Événement KEYDOWN = une touche est appuyée
+                if evenement.type == pygame.KEYDOWN:
+                    
+                    # FLÈCHES : changer de direction (pas de demi-tour possible)
+                    if evenement.key in TOUCHES_DIRECTION:
+                        changer_direction(partie, TOUCHES_DIRECTION[evenement.key])
+                    
+                    # ESPACE pour mettre en pause
+                    elif evenement.key == pygame.K_SPACE:
+                        jeu_pause = not jeu_pause
+                    
+                    # BACKTICK (`) pour activer/désactiver le mode triche
+                    elif evenement.key == pygame.K_BACKQUOTE:
+                        partie.mode_triche = not partie.mode_triche
+                        print(f"Mode triche: {'ACTIVÉ' if partie.mode_triche else 'DÉSACTIVÉ'}")
+                    
+                    # ESC pour quitter
+                    elif evenement.key == pygame.K_ESCAPE:
+                        jeu_actif = False
+            
+            # --- MISE À JOUR (Que se passe-t-il dans le jeu ?) ---
+            
+            # Le robot choisit sa direction (on reprend notre Direction : robots.py
+            # a pu charger une autre copie de ce fichier)
+            if robot is not None:
+                changer_direction(partie, Direction(robot(partie).value))
+            
+            # Avancer d'une case en appliquant les règles du jeu
+            score_avant = partie.score
+            changements = avancer_partie(partie)
+            if publicateur is not None and changements["collision"] is None:
+                publicateur.tick(partie, changements, score_avant)
+            if enregistreur is not None and changements["collision"] is None:
+                enregistreur.noter(changements)
+            if camera is not None and changements["collision"] is None:
+                camera.noter(changements)
+                camera.suivre(partie.serpent[0])
+            if fantome is not None:
+                fantome.avancer()
+            if rembobinage is not None and changements["collision"] is None:
+                rembobinage.noter(changements)
+            if mesures is not None:
+                mesures.noter(changements)
+            
+            # Mode enfant : après un choc, on revient en arrière et on met en pause
+            if (changements["collision"] is not None and rembobinage is not None
+                    and rembobinage.pas_disponibles() > 0):
+                pas_defaits = rembobinage.rembobiner(SECONDES_REMBOBINAGE * fps_jeu)
+                print(f"⏪ Oups ! Retour {SECONDES_REMBOBINAGE} secondes en arrière")
+                # Le fantôme et les mesures reculent aussi (des pas défaits, plus le choc)
+                if fantome is not None:
+                    fantome.reculer(pas_defaits + 1)
+                if mesures is not None:
+                    mesures.reculer(pas_defaits + 1)
+                # Une partie rembobinée ne devient pas un fantôme
+                if enregistreur is not None:
+                    enregistreur.abandonner()
+                    enregistreur = None
+                if camera is not None:
+                    camera = Camera(partie, LARGEUR_PLATEAU, HAUTEUR_PLATEAU)
+                if publicateur is not None:
+                    publicateur.envoyer(publicateur.image_cle(partie))
+                jeu_pause = True
+                continue
+            
+            if changements["collision"] is not None:
+                collision = changements["collision"]
+                sons.jouer("mort")
+                if changements["collision"] == "mur":
+                    print(f"\n💥 Collision avec un mur! Score: {partie.score}")
+                else:
+                    print(f"\n💥 Vous avez touché vous-même! Score: {partie.score}")
+                # Mettre à jour le meilleur score
+                if partie.score > meilleur_score:
+                    meilleur_score = partie.score
+                    sons.jouer("record")
+                jeu_actif = False
                 break
+            
+            if changements["pommes_mangees"]:
+                sons.jouer("manger")
+                if changements["point_oublie"]:
+                    print(f"Oups! 👻 Point oublié...")
+                print(f"Miam! Pomme mangée. Score: {partie.score}")
+            
+            # Mode turbo : seulement certains pas sont dessinés
+            if turbo is not None and not turbo.pas_joue():
+                horloge.tick(turbo.rythme(fps_jeu))
+                continue
+            
+            # --- DESSINER (Afficher l'écran) ---
+            
+            dessiner_partie(ecran, partie.serpent, partie.pommes, nom_joueur, partie.score, couleur_serpent, partie.mode_triche, camera,
+                            turbo.pas_par_seconde if turbo is not None else None, niveau)
+            if fantome is not None:
+                fantome.dessiner(ecran)
+            
+            # Mettre à jour l'affichage
+            mettre_a_jour_affichage(ecran, "partie")
+            
+            # Contrôler la vitesse (FPS fois par seconde)
+            duree_image = horloge.tick(fps_jeu if turbo is None else turbo.rythme(fps_jeu))
+            if mesures is not None and turbo is None:
+                mesures.image(duree_image)
+        
+        # ===================================================================
+        # FIN DE LA PARTIE : AFFICHER LE RÉSULTAT ET DEMANDER LA SUITE
+        # ===================================================================
+        
+        if publicateur is not None:
+            publicateur.fin_partie(partie)
+        if fantome is not None:
+            fantome.fermer()
+        # (avant ajouter_score : le meilleur score est encore celui d'avant cette partie)
+        if enregistreur is not None and enregistreur.terminer(
+                partie.score, obtenir_meilleur_score(tous_les_scores, nom_joueur)):
+            print("👻 Nouveau fantôme enregistré !")
+        
+        # Sauvegarder le score du joueur
+        score = partie.score
+        if partie_officielle:
+            debut_ajout = time.perf_counter()
+            ajouter_score(tous_les_scores, nom_joueur, score)
+            if mesures is not None:
+                mesures.duree_ajouter_score = time.perf_counter() - debut_ajout
+        if mesures is not None:
+            telemetrie.terminer(mesures, partie, collision)
+        
+        # Afficher l'écran de fin avec le score et demander le choix
+        choix = afficher_ecran_fin(ecran, nom_joueur, score, meilleur_score)
+        
+        # IMPORTANT : Vider la file d'événements Pygame pour éviter les conflits
+        # Cela empêche les touches pressées précédemment de rester en mémoire
+        pygame.event.clear()
         
-        # Si on n'a pas mangé, on retire la queue (sinon le serpent grandit)
-        if not pomme_mangee:
-            serpent.pop()
-        
-        # --- DESSINER (Afficher l'écran) ---
-        
-        # Remplir le fond avec du noirf
-        ecran.fill(NOIR)
-        
-        # Dessiner le panneau d'information en haut (gris foncé)
-        pygame.draw.rect(ecran, (40, 40, 40), (0, 0, LARGEUR, HAUTEUR_PANNEAU))
-        # Ligne de séparation entre le panneau et le jeu
-        pygame.draw.line(ecran, (100, 100, 100), (0, HAUTEUR_PANNEAU), (LARGEUR, HAUTEUR_PANNEAU), 2)
-        
-        # Afficher le nom du joueur au centre du panneau (haut)
-        # En couleur dorée si mode triche, sinon vert
-        couleur_nom = (255, 200, 0) if mode_triche else (100, 255, 100)
-        texte_nom = pygame.font.Font(None, 35).render(f"Joueur: {nom_joueur}", True, couleur_nom)
-        ecran.blit(texte_nom, (LARGEUR // 2 - texte_nom.get_width() // 2, 15))
-        
-        # Afficher le score au centre du panneau (bas)
-        texte_score = pygame.font.Font(None, 30).render(f"Score: {score}", True, BLEU)
-        ecran.blit(texte_score, (LARGEUR // 2 - texte_score.get_width() // 2, 45))
-        
-        # Dessiner le serpent
-        for i, (x, y) in enumerate(serpent):
-            # La tête est plus brillante (on augmente la luminosité)
-            if i == 0:
-                # La tête a une couleur plus claire
-                couleur = tuple(min(c + 100, 255) for c in couleur_serpent)
-            else:
-                # Le corps utilise la couleur choisie
-                couleur = couleur_serpent
-            # Dessiner un carré (rect = rectangle)
-            pygame.draw.rect(ecran, couleur, (x, y, TAILLE_CASE, TAILLE_CASE))
-            # Ajouter une bordure noire
-            pygame.draw.rect(ecran, NOIR, (x, y, TAILLE_CASE, TAILLE_CASE), 1)
-        
-        # Dessiner toutes les pommes (en rouge)
-        for pomme in pommes:
-            pygame.draw.rect(ecran, ROUGE, (pomme[0], pomme[1], TAILLE_CASE, TAILLE_CASE))
-        
-        # Mettre à jour l'affichage
-        pygame.display.flip()
+        # Traiter le choix du joueur
+        if choix == "quitter":
+            continuer_jeu = False
+        elif choix == "autre_joueur":
+            # Afficher le classement avant la nouvelle partie
+            afficher_classement(tous_les_scores)
+            
+            # Demander un nouveau nom au prochain tour
+            demander_nouveau_nom = True
+            # Vider complètement la file d'événements
+            pygame.event.clear()
+            continue
+        elif choix == "rejouer":
+            # Afficher la transition avec compte à rebours pour "Rejouer"
+            try:
+                transition_ok = afficher_transition_compte_a_rebours(ecran, f"Bon jeu {nom_joueur}!", 3)
+                if not transition_ok:
+                    continuer_jeu = False
+                    break
+            except Exception as e:
+                print(f"⚠️ Erreur pendant la transition: {e}")
+                continuer_jeu = False
+                break
+            # Vider la file d'événements après la transition
+            pygame.event.clear()
+            # Relancer le jeu avec le même joueur
+            continue
         
-        # Contrôler la vitesse (FPS fois par seconde)
-        horloge.tick(fps_jeu)
-    
     # ===================================================================
-    # FIN DE LA PARTIE : AFFICHER LE RÉSULTAT ET DEMANDER LA SUITE
+    # FERMER LE JEU
     # ===================================================================
+
+    # Afficher le classement final
+    afficher_classement(tous_les_scores)
+
+    if publicateur is not None:
+        publicateur.fermer()
     
-    # Sauvegarder le score du joueur
-    ajouter_score(tous_les_scores, nom_joueur, score)
-    
-    # Afficher l'écran de fin avec le score et demander le choix
-    choix = afficher_ecran_fin(ecran, nom_joueur, score, meilleur_score)
-    
-    # IMPORTANT : Vider la file d'événements Pygame pour éviter les conflits
-    # Cela empêche les touches pressées précédemment de rester en mémoire
-    pygame.event.clear()
-    
-    # Traiter le choix du joueur
-    if choix == "quitter":
-        continuer_jeu = False
-    elif choix == "autre_joueur":
-        # Afficher le classement avant la nouvelle partie
-        afficher_classement(tous_les_scores)
-        
-        # Demander un nouveau nom au prochain tour
-        demander_nouveau_nom = True
-        # Vider complètement la file d'événements
-        pygame.event.clear()
-        continue
-    elif choix == "rejouer":
-        # Afficher la transition avec compte à rebours pour "Rejouer"
-        try:
-            transition_ok = afficher_transition_compte_a_rebours(ecran, f"Bon jeu {nom_joueur}!", 3)
-            if not transition_ok:
-                continuer_jeu = False
-                break
-        except Exception as e:
-            print(f"⚠️ Erreur pendant la transition: {e}")
-            continuer_jeu = False
-            break
-        # Vider la file d'événements après la transition
-        pygame.event.clear()
-        # Relancer le jeu avec le même joueur
-        continue
+    if telemetrie is not None:
+        telemetrie.fermer()
     
-# ===================================================================
-# FERMER LE JEU
-# ===================================================================
+    if serveur_classement is not None:
+        serveur_classement.arreter()
+        serveur_classement = None
+
+    # Écrire les derniers scores et couleurs avant de quitter
+    sauvegarde.arreter()
+
+    if capture_images is not None:
+        capture_images.fermer()
+        print(f"📷 {capture_images.nombre_images} images capturées dans {options.capture}")
+        capture_images = None
+
+    if profileur is not None:
+        profileur.arreter()
+        print(profileur.enregistrer(options.profile))
+        print(f"⏱️ Profil écrit dans {options.profile}.folded et {options.profile}.txt")
+
+    if suivi_allocations is not None:
+        suivi_allocations.arreter()
+        print(suivi_allocations.rapport())
+        suivi_allocations = None
+
+    fenetre_agrandie = None
 
-# Afficher le classement final
-afficher_classement(tous_les_scores)
+    pygame.quit()
+    print("Merci d'avoir joué! À bientôt!")
 
-pygame.quit()
-print("Merci d'avoir joué! À bientôt!")
+if __name__ == "__main__":
+    main()
 
 
@@ -0,0 +1,99 @@
+"""
+====================================================================
+            LES SONS DU JEU (SANS DÉCALAGE)
+====================================================================
+
+Pour qu'un son arrive au moment exact où le serpent mange la pomme :
+
+1. Le mélangeur de Pygame utilise un petit tampon (256 échantillons,
+   environ 6 ms) : par défaut, le tampon est plus grand et le son
+   arrive avec un retard qu'on entend.
+2. Tous les sons sont préparés UNE fois au démarrage et gardés en
+   mémoire : pendant la partie, on ne lit jamais de fichier.
+3. Chaque son a son propre canal réservé : jouer un son ne cherche pas
+   de canal libre et ne coupe jamais un autre son du jeu.
+
+Les sons sont fabriqués par le programme (des petites notes). Pour
+utiliser ses propres sons, il suffit de mettre un fichier
+sons/manger.wav, sons/mort.wav ou sons/record.wav (ou .ogg).
+====================================================================
+"""
+
+import math
+import os
+from array import array
+
+import pygame
+
+FREQUENCE_SON = 44100   # Échantillons par seconde
+TAMPON_SON = 256        # Échantillons par tampon (petit = peu de retard)
+DOSSIER_SONS = "sons"
+VOLUME = 0.3
+
+# Les effets du jeu : des notes (fréquence en Hz, durée en secondes)
+EFFETS = {
+    "manger": [(880, 0.05), (1320, 0.07)],
+    "mort": [(440, 0.12), (330, 0.12), (220, 0.25)],
+    "record": [(523, 0.1), (659, 0.1), (784, 0.1), (1047, 0.3)],
+}
+
+
+def preparer_melangeur():
+    """
+    Règle le mélangeur avec un petit tampon (à appeler AVANT pygame.init)
+    """
+    pygame.mixer.pre_init(FREQUENCE_SON, -16, 2, TAMPON_SON)
+
+
+def fabriquer_son(notes):
+    """
+    Fabrique un son à partir de notes, au format du mélangeur
+    (échantillons de 16 bits, un par canal audio)
+    """
+    frequence, _, canaux_audio = pygame.mixer.get_init()
+    echantillons = array('h')
+    for note, duree in notes:
+        nombre = int(frequence * duree)
+        for i in range(nombre):
+            # Une onde douce qui s'éteint doucement à la fin de la note (pas de "clic")
+            attenuation = min(1.0, (nombre - i) / (frequence * 0.01))
+            valeur = int(32767 * VOLUME * attenuation * math.sin(2 * math.pi * note * i / frequence))
+            echantillons.extend([valeur] * canaux_audio)
+    return pygame.mixer.Sound(buffer=echantillons.tobytes())
+
+
+def charger_son(nom, dossier=DOSSIER_SONS):
+    """
+    Le fichier du joueur s'il existe (décodé maintenant, une seule fois),
+    sinon le son fabriqué
+    """
+    for extension in (".wav", ".ogg"):
+        chemin = os.path.join(dossier, nom + extension)
+        if os.path.exists(chemin):
+            return pygame.mixer.Sound(chemin)
+    return fabriquer_son(EFFETS[nom])
+
+
+class Sons:
+    """
+    Les sons prêts à jouer, chacun sur son canal réservé
+    Sans carte son (ou avec --sans-son), jouer() ne fait rien
+    """
+    def __init__(self, actif=True, dossier=DOSSIER_SONS):
+        self.actif = actif and pygame.mixer.get_init() is not None
+        self.sons = {}
+        self.canaux = {}
+        if not self.actif:
+            return
+        # Les premiers canaux sont réservés aux sons du jeu
+        pygame.mixer.set_reserved(len(EFFETS))
+        for numero, nom in enumerate(EFFETS):
+            self.sons[nom] = charger_son(nom, dossier)
+            self.canaux[nom] = pygame.mixer.Channel(numero)
+
+    def jouer(self, nom):
+        """
+        Lance le son sans attendre (le mélangeur le joue pendant que le jeu continue)
+        """
+        if self.actif:
+            self.canaux[nom].play(self.sons[nom])
@@ -0,0 +1,351 @@
+"""
+====================================================================
+            DIFFUSION DES PARTIES AUX SPECTATEURS
+====================================================================
+
+Pour montrer une partie en direct sur d'autres écrans (tournois,
+salle d'attente...), le jeu PUBLIE ce qui change à chaque pas vers
+un petit service de diffusion (sur la même machine, ou sur une autre
+avec --publication 0.0.0.0).
+
+    jeu  --(UDP, sans jamais attendre)-->  service  --(TCP)-->  spectateurs
+
+- Le jeu envoie des messages UDP : si personne n'écoute, tant pis,
+  le joueur n'est jamais ralenti.
+- Le service transforme chaque message en octets UNE seule fois et
+  envoie ces mêmes octets à tous les spectateurs.
+- Un spectateur trop lent perd des images : il attend alors la
+  prochaine "image clé" (l'état complet de la partie) pour repartir.
+- Le jeu envoie une image clé régulièrement : un spectateur qui arrive
+  en cours de partie reçoit la dernière image clé et les changements
+  qui ont suivi, et voit donc tout de suite la bonne partie.
+- Une image clé trop grosse pour un seul message UDP (serpent immense
+  sur un grand plateau) est envoyée en plusieurs morceaux, que le
+  service recolle avant de la diffuser.
+
+Les messages sont les mêmes que ceux du jeu en réseau (reseau.py).
+
+Lancer le service :   python spectateurs.py service
+Jouer en publiant :   python snake_game.py --spectateurs
+Service ailleurs :    python spectateurs.py service --publication 0.0.0.0
+                      python snake_game.py --spectateurs 192.168.1.20
+Regarder :            python spectateurs.py regarder 192.168.1.10
+====================================================================
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+
+import pygame
+
+PORT_PUBLICATION = 5556     # Le jeu envoie ses messages ici (UDP)
+PORT_SPECTATEURS = 5557     # Les spectateurs se connectent ici (TCP)
+
+# Le jeu envoie l'état complet de la partie tous les ... pas
+INTERVALLE_IMAGE_CLE = 50
+
+# Au-delà de cette quantité d'octets en attente, un spectateur est trop lent
+TAMPON_MAX_SPECTATEUR = 64 * 1024
+
+# Un message UDP ne peut pas dépasser 65 507 octets : au-delà de cette
+# taille, le message est découpé en morceaux de ... caractères
+# (un caractère prend au plus 7 octets une fois remis dans un message)
+TAILLE_MAX_DATAGRAMME = 60000
+TAILLE_MORCEAU = 8000
+
+# Longueur maximale d'une ligne reçue par un spectateur (une image clé entière)
+TAILLE_MAX_LIGNE = 16 * 1024 * 1024
+
+# Place pour les messages UDP reçus par le service : tous les morceaux
+# d'une grosse image clé arrivent d'un coup
+TAMPON_RECEPTION = 1024 * 1024
+
+
+def encoder_message(message):
+    """
+    Transforme un message en une ligne d'octets (même format que reseau.py)
+    """
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# ===================================================================
+# CÔTÉ JEU : PUBLIER LA PARTIE
+# ===================================================================
+
+class PublicateurSpectateurs:
+    """
+    Envoie les changements de la partie au service de diffusion, sans jamais
+    bloquer la boucle du jeu (UDP non bloquant, les erreurs sont ignorées)
+    """
+    def __init__(self, hote="127.0.0.1", port=PORT_PUBLICATION):
+        self.adresse = (hote, port)
+        self.prise = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.prise.setblocking(False)
+        self.numero_tick = 0
+        self.nom = ""
+        self.couleur = (0, 255, 0)
+        self.mode_triche = False
+
+    def envoyer(self, message):
+        donnees = encoder_message(message)
+        if len(donnees) <= TAILLE_MAX_DATAGRAMME:
+            self.envoyer_datagramme(donnees)
+            return
+        # Trop gros pour un seul message UDP : en morceaux, recollés par le service
+        texte = donnees.decode("utf-8")
+        morceaux = [texte[debut:debut + TAILLE_MORCEAU] for debut in range(0, len(texte), TAILLE_MORCEAU)]
+        for numero, morceau in enumerate(morceaux):
+            self.envoyer_datagramme(encoder_message({"type": "morceau", "tick": self.numero_tick, "numero": numero,
+                                                     "total": len(morceaux), "texte": morceau}))
+
+    def envoyer_datagramme(self, donnees):
+        try:
+            self.prise.sendto(donnees, self.adresse)
+        except OSError:
+            # Service absent ou occupé : on perd ce message, le jeu continue
+            pass
+
+    def image_cle(self, partie):
+        """
+        Tout l'état de la partie (pour les spectateurs qui arrivent)
+        """
+        return {
+            "type": "etat",
+            "tick": self.numero_tick,
+            "joueurs": {"0": {"nom": self.nom, "couleur": list(self.couleur),
+                              "serpent": [list(c) for c in partie.serpent],
+                              "score": partie.score, "triche": partie.mode_triche}},
+            "pommes": [list(p) for p in partie.pommes],
+        }
+
+    def debut_partie(self, partie, nom, couleur):
+        self.numero_tick = 0
+        self.nom = nom
+        self.couleur = couleur
+        self.mode_triche = partie.mode_triche
+        self.envoyer(self.image_cle(partie))
+
+    def tick(self, partie, changements, score_avant):
+        """
+        Publie ce qui a changé pendant ce pas (changements : le résultat d'avancer_partie)
+        """
+        self.numero_tick += 1
+        if self.numero_tick % INTERVALLE_IMAGE_CLE == 0:
+            self.envoyer(self.image_cle(partie))
+            self.mode_triche = partie.mode_triche
+            return
+
+        delta = {"tete": list(changements["tete"])}
+        if changements["queue"] is not None:
+            delta["queue"] = True
+        if partie.score != score_avant:
+            delta["score"] = partie.score
+        # Le nom s'affiche en doré quand le mode triche est activé
+        if partie.mode_triche != self.mode_triche:
+            self.mode_triche = partie.mode_triche
+            delta["triche"] = partie.mode_triche
+        message = {"type": "tick", "tick": self.numero_tick, "joueurs": {"0": delta}}
+        if changements["pommes_mangees"]:
+            message["pommes_mangees"] = [list(p) for p in changements["pommes_mangees"]]
+        if changements["pommes_ajoutees"]:
+            message["pommes_ajoutees"] = [list(p) for p in changements["pommes_ajoutees"]]
+        self.envoyer(message)
+
+    def fin_partie(self, partie):
+        self.envoyer({"type": "fin", "tick": self.numero_tick, "scores": {"0": partie.score}})
+
+    def fermer(self):
+        self.prise.close()
+
+
+# ===================================================================
+# LE SERVICE DE DIFFUSION
+# ===================================================================
+
+class Spectateur:
+    """
+    Un spectateur connecté au service
+    """
+    def __init__(self, ecrivain, synchronise=True):
+        self.ecrivain = ecrivain
+        # False quand il a perdu des images (ou n'en a encore reçu aucune) :
+        # il attend la prochaine image clé
+        self.synchronise = synchronise
+        self.images_perdues = 0
+
+
+class DiffuseurSpectateurs(asyncio.DatagramProtocol):
+    """
+    Reçoit les messages du jeu (UDP) et les renvoie à tous les spectateurs (TCP)
+    """
+    def __init__(self):
+        self.spectateurs = []
+        # Dernière image clé et changements reçus depuis (déjà en octets)
+        self.derniere_image_cle = None
+        self.depuis_image_cle = []
+        self.messages_recus = 0
+        # Les morceaux du message découpé en cours de réception : (tick, total) -> {numero: texte}
+        self.morceaux = {}
+
+    # --- Messages du jeu ---
+
+    def datagram_received(self, donnees, adresse):
+        try:
+            message = json.loads(donnees)
+            type_message = message["type"]
+        except (ValueError, KeyError, TypeError):
+            return
+        if type_message == "morceau":
+            donnees = self.recoller(message)
+            if donnees is None:
+                return
+            try:
+                type_message = json.loads(donnees)["type"]
+            except (ValueError, KeyError, TypeError):
+                return
+        self.messages_recus += 1
+
+        # On garde de quoi mettre à jour un spectateur qui arrive
+        if type_message == "etat":
+            self.derniere_image_cle = donnees
+            self.depuis_image_cle = []
+        elif self.derniere_image_cle is not None:
+            self.depuis_image_cle.append(donnees)
+
+        self.diffuser(donnees, type_message == "etat")
+
+    def recoller(self, morceau):
+        """
+        Range un morceau ; retourne le message entier (en octets) quand tous les morceaux sont là
+        Un morceau perdu : le message est abandonné dès que le suivant commence
+        """
+        try:
+            cle = (morceau["tick"], morceau["total"])
+            if cle not in self.morceaux:
+                self.morceaux = {cle: {}}
+            self.morceaux[cle][morceau["numero"]] = morceau["texte"]
+        except (KeyError, TypeError):
+            return None
+        recus = self.morceaux[cle]
+        if len(recus) < cle[1]:
+            return None
+        self.morceaux = {}
+        try:
+            return "".join(recus[numero] for numero in range(cle[1])).encode("utf-8")
+        except KeyError:
+            return None
+
+    def diffuser(self, donnees, est_image_cle):
+        """
+        Envoie les mêmes octets à tous les spectateurs
+        Un spectateur trop lent saute ce message et attend la prochaine image clé
+        """
+        for spectateur in self.spectateurs:
+            if est_image_cle:
+                spectateur.synchronise = True
+            elif not spectateur.synchronise:
+                spectateur.images_perdues += 1
+                continue
+            if spectateur.ecrivain.transport.get_write_buffer_size() > TAMPON_MAX_SPECTATEUR:
+                spectateur.synchronise = False
+                spectateur.images_perdues += 1
+                continue
+            spectateur.ecrivain.write(donnees)
+
+    # --- Spectateurs ---
+
+    async def accueillir_spectateur(self, lecteur, ecrivain):
+        # Arrivé avant la première image clé : les changements ne lui serviraient à rien
+        spectateur = Spectateur(ecrivain, synchronise=self.derniere_image_cle is not None)
+        # Mettre tout de suite le nouveau venu à jour
+        if self.derniere_image_cle is not None:
+            ecrivain.write(self.derniere_image_cle)
+            for donnees in self.depuis_image_cle:
+                ecrivain.write(donnees)
+        self.spectateurs.append(spectateur)
+        try:
+            # Les spectateurs n'envoient rien : on attend juste qu'ils partent
+            await lecteur.read()
+        except ConnectionError:
+            pass
+        self.spectateurs.remove(spectateur)
+        ecrivain.close()
+
+
+async def demarrer_service(hote_spectateurs="0.0.0.0", port_spectateurs=PORT_SPECTATEURS,
+                           port_publication=PORT_PUBLICATION, hote_publication="127.0.0.1"):
+    """
+    Démarre le service de diffusion
+    hote_publication : d'où le jeu peut publier ("127.0.0.1" = la même machine seulement,
+    "0.0.0.0" = le jeu peut tourner sur une autre machine)
+    Retourne (diffuseur, serveur TCP des spectateurs, transport UDP)
+    """
+    boucle = asyncio.get_running_loop()
+    transport, diffuseur = await boucle.create_datagram_endpoint(
+        DiffuseurSpectateurs, local_addr=(hote_publication, port_publication))
+    transport.get_extra_info("socket").setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, TAMPON_RECEPTION)
+    serveur = await asyncio.start_server(diffuseur.accueillir_spectateur,
+                                         hote_spectateurs, port_spectateurs)
+    return diffuseur, serveur, transport
+
+
+# ===================================================================
+# CÔTÉ SPECTATEUR : REGARDER LA PARTIE
+# ===================================================================
+
+async def regarder(hote, port=PORT_SPECTATEURS):
+    """
+    Affiche en direct la partie diffusée, avec les fonctions de dessin du jeu
+    """
+    from snake_game import LARGEUR, HAUTEUR, mettre_a_jour_affichage
+    from reseau import ClientReseau, dessiner_vue_client
+
+    ecran = pygame.display.set_mode((LARGEUR, HAUTEUR))
+    pygame.display.set_caption("🐍 Jeu Snake - Spectateur")
+    client = ClientReseau()
+    # Une image clé peut être bien plus longue que la limite habituelle d'une ligne (64 Ko)
+    client.lecteur, client.ecrivain = await asyncio.open_connection(hote, port, limit=TAILLE_MAX_LIGNE)
+
+    while True:
+        message = await client.recevoir()
+        if message is None:
+            break
+        for evenement in pygame.event.get():
+            if evenement.type == pygame.QUIT:
+                client.fermer()
+                return
+        if message["type"] in ("etat", "tick") and client.serpents:
+            dessiner_vue_client(ecran, client)
+            mettre_a_jour_affichage(ecran, "spectateur")
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Diffusion des parties aux spectateurs")
+    sous_commandes = parseur.add_subparsers(dest="commande", required=True)
+    p_service = sous_commandes.add_parser("service", help="lancer le service de diffusion")
+    p_service.add_argument("--port", type=int, default=PORT_SPECTATEURS)
+    p_service.add_argument("--publication", default="127.0.0.1", metavar="HOTE",
+                           help="adresse où le jeu publie (0.0.0.0 si le jeu tourne sur une autre machine)")
+    p_service.add_argument("--port-publication", type=int, default=PORT_PUBLICATION)
+    p_regarder = sous_commandes.add_parser("regarder", help="regarder la partie en direct")
+    p_regarder.add_argument("hote")
+    p_regarder.add_argument("--port", type=int, default=PORT_SPECTATEURS)
+    options = parseur.parse_args(arguments)
+
+    if options.commande == "service":
+        async def servir():
+            diffuseur, serveur, transport = await demarrer_service(
+                port_spectateurs=options.port, port_publication=options.port_publication,
+                hote_publication=options.publication)
+            print(f"📺 Service de diffusion prêt (spectateurs sur le port {options.port})")
+            await serveur.serve_forever()
+        asyncio.run(servir())
+    else:
+        asyncio.run(regarder(options.hote, options.port))
+        pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+====================================================================
+            TÉLÉMÉTRIE : LES MESURES DE CHAQUE PARTIE
+====================================================================
+
+Sur une salle pleine de bornes, on veut savoir lesquelles saccadent,
+où les parties durent longtemps, ou si l'écriture des scores est lente.
+Avec l'option --telemetrie, chaque partie terminée laisse une ligne de
+mesures :
+
+    durée, nombre de pas, pommes mangées, points oubliés (pièges),
+    longueur finale, images en retard (par rapport à fps_jeu) et
+    temps passé dans ajouter_score
+
+Les lignes vont dans deux fichiers du dossier telemetrie/ :
+- parties.jsonl : une ligne JSON par partie. Quand le fichier devient
+  trop gros, il est renommé en parties.jsonl.1 (puis .2...) et un
+  nouveau commence (on garde au plus quelques fichiers) ;
+- snake.prom : les totaux au format texte de Prometheus, réécrit à
+  chaque fin de partie (à lire avec le "textfile collector" de
+  node_exporter).
+
+Pendant la partie, on ne fait que compter (quelques additions par pas) ;
+les fichiers ne sont écrits qu'à la fin de la partie.
+====================================================================
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import socket
+import time
+from collections import deque
+
+from snake_game import POINTS_PAR_POMME
+
+DOSSIER_TELEMETRIE = "telemetrie"
+TAILLE_MAX_FICHIER = 1024 * 1024   # Octets avant de commencer un nouveau fichier
+FICHIERS_GARDES = 5
+
+# Les derniers repas gardés pour pouvoir les défaire (mode enfant, voir rembobinage.py)
+REPAS_GARDES = 100
+
+
+class MesuresPartie:
+    """
+    Les compteurs d'une partie, mis à jour à chaque pas
+    """
+    def __init__(self, fps_jeu):
+        self.debut = time.monotonic()
+        self.periode_ms = 1000 // fps_jeu if fps_jeu else 0
+        self.pas = 0
+        self.pommes_mangees = 0
+        self.points_oublies = 0
+        self.images_en_retard = 0
+        self.duree_ajouter_score = 0.0
+        # (numéro du pas, pommes mangées, points oubliés) des derniers pas où on a mangé
+        self.repas = deque(maxlen=REPAS_GARDES)
+        # La première image suit le compte à rebours : on ne la mesure pas
+        self.ignorer_image = True
+
+    def noter(self, changements):
+        """
+        Après chaque pas (avancer_partie)
+        """
+        self.pas += 1
+        if changements["pommes_mangees"]:
+            pommes = len(changements["pommes_mangees"])
+            oublies = POINTS_PAR_POMME if changements["point_oublie"] else 0
+            self.pommes_mangees += pommes
+            self.points_oublies += oublies
+            self.repas.append((self.pas, pommes, oublies))
+
+    def reculer(self, nombre_pas):
+        """
+        Les nombre_pas derniers pas ont été défaits (rembobinage) : on ne les compte plus
+        """
+        self.pas -= nombre_pas
+        while self.repas and self.repas[-1][0] > self.pas:
+            _, pommes, oublies = self.repas.pop()
+            self.pommes_mangees -= pommes
+            self.points_oublies -= oublies
+
+    def image(self, duree_ms):
+        """
+        Après chaque horloge.tick : duree_ms est la durée de l'image
+        Une image deux fois trop longue compte pour une image en retard
+        """
+        if self.ignorer_image or not self.periode_ms:
+            self.ignorer_image = False
+            return
+        if duree_ms >= self.periode_ms + self.periode_ms // 2:
+            self.images_en_retard += (duree_ms + self.periode_ms // 2) // self.periode_ms - 1
+
+    def pause(self):
+        """
+        La partie est en pause : l'image suivante ne compte pas
+        """
+        self.ignorer_image = True
+
+    def resultat(self, partie, collision):
+        return {
+            "fin": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "borne": socket.gethostname(),
+            "duree_s": round(time.monotonic() - self.debut, 3),
+            "pas": self.pas,
+            "score": partie.score,
+            "pommes_mangees": self.pommes_mangees,
+            "points_oublies": self.points_oublies,
+            "longueur": len(partie.serpent),
+            "images_en_retard": self.images_en_retard,
+            "ajouter_score_s": round(self.duree_ajouter_score, 6),
+            "collision": collision,
+        }
+
+
+# Les totaux exportés pour Prometheus : nom -> (champ du résultat, aide)
+COMPTEURS = {
+    "snake_parties_total": (None, "Parties terminées"),
+    "snake_pas_total": ("pas", "Pas joués"),
+    "snake_pommes_mangees_total": ("pommes_mangees", "Pommes mangées"),
+    "snake_points_oublies_total": ("points_oublies", "Points oubliés à cause des pièges"),
+    "snake_images_en_retard_total": ("images_en_retard", "Images affichées en retard sur fps_jeu"),
+    "snake_duree_parties_secondes_total": ("duree_s", "Durée totale des parties"),
+    "snake_ajouter_score_secondes_total": ("ajouter_score_s", "Temps passé dans ajouter_score"),
+}
+DERNIERE_PARTIE = {
+    "snake_derniere_partie_longueur": ("longueur", "Longueur du serpent à la fin de la dernière partie"),
+    "snake_derniere_partie_duree_secondes": ("duree_s", "Durée de la dernière partie"),
+    "snake_ajouter_score_max_secondes": (None, "Le plus long ajouter_score depuis le lancement"),
+}
+
+
+class Telemetrie:
+    """
+    Écrit les mesures des parties terminées (fichier tournant + fichier Prometheus)
+    """
+    def __init__(self, dossier=DOSSIER_TELEMETRIE, taille_max=TAILLE_MAX_FICHIER, fichiers_gardes=FICHIERS_GARDES):
+        os.makedirs(dossier, exist_ok=True)
+        self.chemin_prometheus = os.path.join(dossier, "snake.prom")
+        # Le fichier tournant : le module logging sait déjà le faire
+        self.journal = logging.getLogger(f"snake.telemetrie.{os.path.abspath(dossier)}")
+        self.journal.propagate = False
+        self.journal.setLevel(logging.INFO)
+        self.fichier = logging.handlers.RotatingFileHandler(
+            os.path.join(dossier, "parties.jsonl"), maxBytes=taille_max,
+            backupCount=fichiers_gardes - 1, encoding="utf-8")
+        self.journal.addHandler(self.fichier)
+        self.totaux = dict.fromkeys(COMPTEURS, 0)
+        self.ajouter_score_max = 0.0
+        self.derniere = None
+
+    def nouvelle_partie(self, fps_jeu):
+        return MesuresPartie(fps_jeu)
+
+    def terminer(self, mesures, partie, collision=None):
+        """
+        La partie est finie : écrit sa ligne et met à jour les totaux
+        """
+        resultat = mesures.resultat(partie, collision)
+        self.journal.info(json.dumps(resultat, separators=(",", ":")))
+        for nom, (champ, _) in COMPTEURS.items():
+            self.totaux[nom] += 1 if champ is None else resultat[champ]
+        self.ajouter_score_max = max(self.ajouter_score_max, resultat["ajouter_score_s"])
+        self.derniere = resultat
+        self.ecrire_prometheus()
+        return resultat
+
+    def texte_prometheus(self):
+        borne = socket.gethostname().replace("\\", "\\\\").replace('"', '\\"')
+        etiquette = f'{{borne="{borne}"}}'
+        lignes = []
+        for nom, (_, aide) in COMPTEURS.items():
+            lignes += [f"# HELP {nom} {aide}", f"# TYPE {nom} counter",
+                       f"{nom}{etiquette} {self.totaux[nom]:g}"]
+        if self.derniere is not None:
+            for nom, (champ, aide) in DERNIERE_PARTIE.items():
+                valeur = self.ajouter_score_max if champ is None else self.derniere[champ]
+                lignes += [f"# HELP {nom} {aide}", f"# TYPE {nom} gauge", f"{nom}{etiquette} {valeur:g}"]
+        return "\n".join(lignes) + "\n"
+
+    def ecrire_prometheus(self):
+        # Écrit à côté puis remplace : le collecteur ne lit jamais un fichier à moitié écrit
+        temporaire = self.chemin_prometheus + ".tmp"
+        with open(temporaire, "w", encoding="utf-8") as f:
+            f.write(self.texte_prometheus())
+        os.replace(temporaire, self.chemin_prometheus)
+
+    def fermer(self):
+        self.journal.removeHandler(self.fichier)
+        self.fichier.close()
@@ -0,0 +1,86 @@
+"""
+Tests du suivi des allocations : une partie en régime établi n'alloue presque rien
+"""
+import gc
+import random
+
+import snake_game
+from allocations import SuiviAllocations
+from snake_game import Partie, Direction, avancer_partie, changer_direction, dessiner_partie
+
+# Octets alloués au plus pendant un pas de jeu (règles + dessin)
+# Il reste le dictionnaire des changements et la nouvelle tête
+BUDGET_OCTETS_PAR_PAS = 1500
+
+TOURS = [Direction.BAS, Direction.GAUCHE, Direction.HAUT, Direction.DROITE]
+
+
+def tourner_en_rond(ecran, partie, suivi, nombre_pas):
+    """Le serpent tourne en carré sans rien manger : chaque pas ressemble au précédent"""
+    alloues, croissances = [], []
+    for pas in range(nombre_pas):
+        if pas % 8 == 0:
+            changer_direction(partie, TOURS[(pas // 8) % 4])
+        assert avancer_partie(partie)["collision"] is None
+        dessiner_partie(ecran, partie.serpent, partie.pommes, "zoé", partie.score, (0, 255, 0), False)
+        # Des entiers seulement : le ramasse-miettes ne suit pas les entiers
+        octets, croissance = suivi.image("partie")
+        alloues.append(octets)
+        croissances.append(croissance)
+    return alloues, croissances
+
+
+def test_une_partie_reste_sous_le_budget_d_allocations(ecran):
+    partie = Partie(False, random.Random(1))
+    # La pomme dans un coin, loin du carré du serpent
+    partie.pommes[:] = [(0, snake_game.HAUTEUR_PANNEAU)]
+    # Les premières images préparent les cases et les textes
+    chauffe = SuiviAllocations()
+    chauffe.demarrer()
+    tourner_en_rond(ecran, partie, chauffe, 16)
+    chauffe.arreter()
+    # On part d'un ramasse-miettes qui vient de passer (les autres tests ont alloué)
+    gc.collect()
+
+    suivi = SuiviAllocations()
+    suivi.demarrer()
+    try:
+        alloues, croissances = tourner_en_rond(ecran, partie, suivi, 200)
+    finally:
+        suivi.arreter()
+
+    assert max(alloues) < BUDGET_OCTETS_PAR_PAS
+    # Rien ne s'accumule : aucune raison pour le ramasse-miettes de passer
+    assert sum(croissances) <= 0
+    assert suivi.ecrans["partie"].collectes == [0, 0, 0]
+
+
+def test_le_rapport_range_les_mesures_par_ecran(monkeypatch, ecran):
+    suivi = SuiviAllocations()
+    monkeypatch.setattr(snake_game, "suivi_allocations", suivi)
+    suivi.demarrer()
+    try:
+        for _ in range(3):
+            snake_game.mettre_a_jour_affichage(ecran, "menu")
+        gros = [bytearray(10000) for _ in range(5)]
+        snake_game.mettre_a_jour_affichage(ecran, "partie")
+    finally:
+        suivi.arreter()
+
+    assert suivi.ecrans["menu"].images == 3
+    assert suivi.ecrans["partie"].pic_max >= 50000
+    assert suivi.ecrans["partie"].croissance >= 50000
+    rapport = suivi.rapport()
+    assert "menu" in rapport and "partie" in rapport
+    del gros
+
+
+def test_le_ramasse_miettes_est_compte():
+    suivi = SuiviAllocations()
+    suivi.demarrer()
+    try:
+        gc.collect()
+        suivi.image("fin")
+    finally:
+        suivi.arreter()
+    assert suivi.ecrans["fin"].collectes[2] == 1
@@ -0,0 +1,99 @@
+"""
+Tests de la caméra : grand plateau, suivi de la tête et cases visibles
+"""
+import random
+
+import snake_game
+from camera import Camera, IndexSpatial, HAUTEUR_VUE, LARGEUR_VUE
+from snake_game import (Partie, Direction, avancer_partie, changer_direction, dessiner_partie,
+                        LARGEUR, HAUTEUR, HAUTEUR_PANNEAU, TAILLE_CASE)
+
+
+def grand_plateau(monkeypatch, colonnes=300, lignes=300):
+    monkeypatch.setattr(snake_game, "LARGEUR_PLATEAU", colonnes * TAILLE_CASE)
+    monkeypatch.setattr(snake_game, "HAUTEUR_PLATEAU", HAUTEUR_PANNEAU + lignes * TAILLE_CASE)
+
+
+def test_le_serpent_traverse_le_grand_plateau(monkeypatch):
+    grand_plateau(monkeypatch)
+    partie = Partie(False, random.Random(1))
+    camera = Camera(partie, snake_game.LARGEUR_PLATEAU, snake_game.HAUTEUR_PLATEAU)
+    changer_direction(partie, Direction.BAS)
+    for _ in range(100):
+        changements = avancer_partie(partie)
+        assert changements["collision"] is None
+        camera.noter(changements)
+        camera.suivre(partie.serpent[0])
+    # Bien plus bas que la fenêtre, et la caméra a suivi
+    assert partie.serpent[0][1] > HAUTEUR * 3
+    assert camera.visible(partie.serpent[0])
+    # Elle glisse doucement : après un virage, elle fait une partie du chemin seulement
+    changer_direction(partie, Direction.DROITE)
+    for _ in range(10):
+        camera.noter(avancer_partie(partie))
+    avant = camera.x
+    camera.suivre(partie.serpent[0])
+    assert avant < camera.x < camera.cible(partie.serpent[0])[0]
+
+
+def test_la_camera_ne_sort_pas_du_plateau(monkeypatch):
+    grand_plateau(monkeypatch, 100, 80)
+    partie = Partie()
+    camera = Camera(partie, snake_game.LARGEUR_PLATEAU, snake_game.HAUTEUR_PLATEAU)
+    assert camera.cible((0, HAUTEUR_PANNEAU)) == (0, HAUTEUR_PANNEAU)
+    coin = (snake_game.LARGEUR_PLATEAU - TAILLE_CASE, snake_game.HAUTEUR_PLATEAU - TAILLE_CASE)
+    assert camera.cible(coin) == (snake_game.LARGEUR_PLATEAU - LARGEUR_VUE,
+                                  snake_game.HAUTEUR_PLATEAU - HAUTEUR_VUE)
+
+
+def test_seules_les_cases_visibles_sont_dessinees(monkeypatch, ecran):
+    grand_plateau(monkeypatch)
+    # Un serpent immense qui remplit tout le plateau, ligne par ligne
+    serpent = [(x * TAILLE_CASE, HAUTEUR_PANNEAU + y * TAILLE_CASE)
+               for y in range(300) for x in range(300)]
+    partie = Partie(pommes=[serpent[0]])
+    partie.serpent = serpent
+    camera = Camera(partie, snake_game.LARGEUR_PLATEAU, snake_game.HAUTEUR_PLATEAU)
+    camera.x, camera.y = 2000, 3000
+
+    visibles = camera.cases_visibles(camera.serpent)
+    cases_ecran = (LARGEUR_VUE // TAILLE_CASE + 1) * (HAUTEUR_VUE // TAILLE_CASE + 1)
+    assert 0 < len(visibles) <= cases_ecran
+    assert all(camera.visible(case) for case in visibles)
+
+    # L'index ne regarde que les blocs qui touchent l'écran
+    regardees = list(camera.serpent.cases_dans(2000, 3000, LARGEUR_VUE, HAUTEUR_VUE))
+    assert len(regardees) < 3 * cases_ecran
+
+    dessiner_partie(ecran, partie.serpent, partie.pommes, "Zoé", 0, (0, 255, 0), False, camera)
+    # Le serpent couvre toute la vue, le panneau reste intact
+    assert ecran.get_at((LARGEUR // 2 + 5, HAUTEUR // 2 + 5))[:3] == (0, 255, 0)
+    assert ecran.get_at((5, 5))[:3] == (40, 40, 40)
+
+
+def test_l_index_compte_les_cases_en_double():
+    index = IndexSpatial([(40, 100), (40, 100)])
+    index.retirer((40, 100))
+    assert list(index.cases_dans(0, 0, LARGEUR, HAUTEUR)) == [(40, 100)]
+    index.retirer((40, 100))
+    assert list(index.cases_dans(0, 0, LARGEUR, HAUTEUR)) == []
+
+
+def test_les_robots_connaissent_la_taille_du_grand_plateau(monkeypatch):
+    from robots import robot_cycle, robot_prudent
+    grand_plateau(monkeypatch, colonnes=120, lignes=80)
+    partie = Partie(False, random.Random(1))
+    # Le robot prudent traverse tout le plateau, bien au-delà de la fenêtre
+    for _ in range(55):
+        changer_direction(partie, robot_prudent(partie))
+        assert avancer_partie(partie)["collision"] is None
+    assert partie.serpent[0][0] > LARGEUR
+
+    # Le robot cycle suit le cycle du grand plateau : des allers-retours sur toute la hauteur
+    partie = Partie(False, random.Random(1))
+    lignes_vues = set()
+    for _ in range(400):
+        changer_direction(partie, robot_cycle(partie))
+        assert avancer_partie(partie)["collision"] is None
+        lignes_vues.add((partie.serpent[0][1] - HAUTEUR_PANNEAU) // TAILLE_CASE)
+    assert {1, 79} <= lignes_vues
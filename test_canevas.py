@@ -0,0 +1,78 @@
+"""
+Tests de la fenêtre agrandie : le jeu dessine en 1000 x 780, la fenêtre montre le canevas agrandi
+"""
+import pygame
+
+import snake_game
+from canevas import FenetreAgrandie, calculer_destination
+from pilote import jouer_scenario, touche, taper, clic
+
+BOUTON_DEMARRER = (snake_game.LARGEUR // 2, snake_game.HAUTEUR - 90)
+
+
+def test_facteur_entier_et_bandes_noires():
+    assert calculer_destination((1000, 780)) == (1, pygame.Rect(0, 0, 1000, 780))
+    # Écran 4K : x2 (x3 ne tient pas en hauteur), centré
+    facteur, destination = calculer_destination((3840, 2160))
+    assert facteur == 2
+    assert destination.size == (2000, 1560) and destination.center == (1920, 1080)
+    # Fenêtre plus petite : on rétrécit
+    facteur, destination = calculer_destination((500, 500))
+    assert facteur == 0.5 and destination.size == (500, 390)
+
+
+def test_le_canevas_est_agrandi_dans_la_fenetre():
+    fenetre = FenetreAgrandie((3000, 2340))
+    fenetre.canevas.fill((0, 0, 0))
+    fenetre.canevas.set_at((10, 20), (255, 0, 0))
+    fenetre.presenter()
+    ecran = pygame.display.get_surface()
+    assert fenetre.facteur == 3
+    # Le pixel est devenu un carré de 3 x 3
+    assert all(ecran.get_at((30 + dx, 60 + dy))[:3] == (255, 0, 0) for dx in range(3) for dy in range(3))
+    assert ecran.get_at((33, 60))[:3] == (0, 0, 0)
+    assert fenetre.vers_canevas((31, 62)) == (10, 20)
+
+    # La fenêtre change de taille : seul le facteur change
+    pygame.display.set_mode((2000, 1700), pygame.RESIZABLE)
+    fenetre.presenter()
+    assert fenetre.facteur == 2 and fenetre.destination.topleft == (0, 70)
+    assert pygame.display.get_surface().get_at((20, 110))[:3] == (255, 0, 0)
+
+
+def test_le_dessin_ne_depend_pas_de_la_taille_de_la_fenetre(monkeypatch):
+    agrandissements = []
+    agrandir = pygame.transform.scale
+
+    def compter(*arguments):
+        agrandissements.append(arguments[1])
+        return agrandir(*arguments)
+
+    monkeypatch.setattr(pygame.transform, "scale", compter)
+    partie = snake_game.Partie()
+    canevas = []
+    for taille in ((1000, 780), (3000, 2340)):
+        fenetre = FenetreAgrandie(taille)
+        agrandissements.clear()
+        for _ in range(5):
+            snake_game.dessiner_partie(fenetre.canevas, partie.serpent, partie.pommes, "zoé", 0, (0, 255, 0), False)
+            fenetre.presenter()
+        canevas.append(pygame.image.tobytes(fenetre.canevas, "RGB"))
+        # Seule la présentation dépend de la fenêtre : une copie simple en x1,
+        # un seul agrandissement par image en x3
+        assert agrandissements == ([] if fenetre.facteur == 1 else [(3000, 2340)] * 5)
+    # Le jeu a dessiné exactement la même image dans les deux cas
+    assert canevas[0] == canevas[1]
+
+
+def test_le_menu_comprend_la_souris_dans_la_grande_fenetre(tmp_path, monkeypatch, ecran):
+    monkeypatch.chdir(tmp_path)
+    # Le bouton "DÉMARRER" est deux fois plus loin dans une fenêtre x2
+    scenario = [
+        ("menu", [clic((BOUTON_DEMARRER[0] * 2, BOUTON_DEMARRER[1] * 2))]),
+        ("nom", taper("Zoé") + [touche(pygame.K_RETURN)]),
+        ("fin", [touche(pygame.K_q, "q")]),
+    ]
+    pilote = jouer_scenario(scenario, ["--fenetre", "2000x1560"])
+    assert pilote.etapes == []
+    assert snake_game.fenetre_agrandie is None
@@ -0,0 +1,54 @@
+"""
+Tests de la capture d'images (sans fenêtre) et comparaison avec les images de référence
+"""
+import os
+
+import pygame
+
+import snake_game
+from capture import CaptureImages, lire_flux_brut, images_identiques, FORMAT_PNG, NOM_FLUX_BRUT
+
+DOSSIER_GOLDEN = os.path.join(os.path.dirname(__file__), "golden")
+
+
+def dessiner_partie_reference(surface):
+    """Dessine une partie toujours identique (serpent, pommes et panneau)"""
+    serpent = [(500, 420), (480, 420), (460, 420), (460, 440)]
+    pommes = [(100, 200), (900, 700)]
+    snake_game.dessiner_partie(surface, serpent, pommes, "zoe", 120, (0, 100, 255), False)
+
+
+def test_image_partie_identique_a_la_reference():
+    surface = pygame.Surface((snake_game.LARGEUR, snake_game.HAUTEUR))
+    dessiner_partie_reference(surface)
+    reference = pygame.image.load(os.path.join(DOSSIER_GOLDEN, "partie.png"))
+    assert images_identiques(surface, reference)
+
+
+def test_flux_brut_relu_a_l_identique(tmp_path):
+    capture = CaptureImages(str(tmp_path))
+    surface = pygame.Surface((snake_game.LARGEUR, snake_game.HAUTEUR))
+    dessiner_partie_reference(surface)
+    capture.capturer(surface, "partie")
+    surface.fill(snake_game.NOIR)
+    capture.capturer(surface, "fin")
+    capture.fermer()
+
+    images = list(lire_flux_brut(os.path.join(str(tmp_path), NOM_FLUX_BRUT)))
+    assert [(numero, nom) for numero, nom, _ in images] == [(0, "partie"), (1, "fin")]
+    assert images_identiques(images[1][2], surface)
+    reference = pygame.image.load(os.path.join(DOSSIER_GOLDEN, "partie.png"))
+    assert images_identiques(images[0][2], reference)
+
+
+def test_capture_png_et_nombre_max(tmp_path):
+    pygame.event.clear()
+    capture = CaptureImages(str(tmp_path), FORMAT_PNG, nombre_max=2)
+    surface = pygame.Surface((40, 30))
+    for _ in range(5):
+        capture.capturer(surface, "menu")
+    capture.fermer()
+
+    assert sorted(os.listdir(str(tmp_path))) == ["000000_menu.png", "000001_menu.png"]
+    # Le jeu est prévenu qu'il doit se fermer
+    assert any(evt.type == pygame.QUIT for evt in pygame.event.get())
@@ -0,0 +1,88 @@
+"""
+Tests du classement sur le réseau : réponses préparées, étiquettes (ETag) et 304
+"""
+import http.client
+import json
+
+import pytest
+
+import snake_game
+from classement_http import ServeurClassement, adresse_joueur, etiquette_connue
+
+
+@pytest.fixture
+def serveur(tmp_path, monkeypatch):
+    # Les scores sont écrits dans le dossier du test, pas dans le vrai scores.json
+    monkeypatch.chdir(tmp_path)
+    sauvegarde = snake_game.SauvegardeDifferee(intervalle=60)
+    monkeypatch.setattr(snake_game, "sauvegarde", sauvegarde)
+    scores = {}
+    snake_game.ajouter_score(scores, "Zoé", 120)
+    snake_game.ajouter_score(scores, "Max", 80)
+    serveur = ServeurClassement(scores, hote="127.0.0.1", port=0)
+    serveur.demarrer()
+    monkeypatch.setattr(snake_game, "serveur_classement", serveur)
+    yield serveur, scores
+    serveur.arreter()
+    sauvegarde.arreter()
+
+
+def demander(serveur, chemin, etiquette=None):
+    connexion = http.client.HTTPConnection("127.0.0.1", serveur.port, timeout=5)
+    entetes = {"If-None-Match": etiquette} if etiquette else {}
+    connexion.request("GET", chemin, headers=entetes)
+    reponse = connexion.getresponse()
+    contenu = reponse.read()
+    connexion.close()
+    return reponse.status, reponse.getheader("ETag"), contenu
+
+
+def test_classement_et_etiquette(serveur):
+    serveur, scores = serveur
+    code, etiquette, contenu = demander(serveur, "/classement")
+    assert code == 200
+    classement = json.loads(contenu)["classement"]
+    assert [(ligne["rang"], ligne["nom"], ligne["meilleur"]) for ligne in classement] == \
+        [(1, "Zoé", 120), (2, "Max", 80)]
+
+    # Rien n'a changé : 304 sans contenu
+    code, etiquette_304, contenu = demander(serveur, "/classement", etiquette)
+    assert (code, etiquette_304, contenu) == (304, etiquette, b"")
+
+    # Un nouveau score : nouvelle étiquette et nouveau classement
+    snake_game.ajouter_score(scores, "Max", 300)
+    code, nouvelle_etiquette, contenu = demander(serveur, "/classement", etiquette)
+    assert code == 200 and nouvelle_etiquette != etiquette
+    assert json.loads(contenu)["classement"][0]["nom"] == "Max"
+
+
+def test_page_d_un_joueur(serveur):
+    serveur, scores = serveur
+    code, _, contenu = demander(serveur, adresse_joueur("Zoé"))
+    assert code == 200
+    page = json.loads(contenu)
+    assert (page["nom"], page["parties"], page["meilleur"]) == ("Zoé", 1, 120)
+
+    assert demander(serveur, adresse_joueur("Personne"))[0] == 404
+
+
+def test_l_instantane_n_est_refait_que_pour_un_nouveau_score(serveur):
+    serveur, scores = serveur
+    avant = serveur.instantane.reponses
+    for _ in range(20):
+        demander(serveur, "/classement")
+    assert serveur.instantane.reponses is avant
+    snake_game.ajouter_score(scores, "Zoé", 10)
+    assert serveur.instantane.reponses is not avant
+    # La page de Max n'a pas été refaite
+    assert serveur.instantane.reponses["/joueurs/Max"] is avant["/joueurs/Max"]
+
+
+def test_les_etiquettes_sont_comparees_en_entier():
+    assert etiquette_connue('"abc"', '"abc"')
+    assert etiquette_connue('"abc"', '"xyz", W/"abc"')
+    assert etiquette_connue('"abc"', "*")
+    # Une autre étiquette qui contient celle-ci n'est pas la même
+    assert not etiquette_connue('"abc"', '"abc"x')
+    assert not etiquette_connue('"abc"', '"x", ""abc""')
+    assert not etiquette_connue('"abc"', "")
@@ -0,0 +1,127 @@
+"""
+Tests de l'écran partagé : des parties indépendantes, dessinées en un seul passage
+"""
+import time
+
+import pygame
+import pytest
+
+import snake_game
+from ecran_partage import (RenduPartage, creer_joueurs, disposer_vues, jouer_ecran_partage, main,
+                           COULEURS_PAR_DEFAUT, HAUTEUR_VUE, LARGEUR_VUE)
+from pilote import HorlogeVirtuelle, touche
+from snake_game import Direction, avancer_partie, changer_direction
+
+
+def test_les_vues_ne_se_chevauchent_pas():
+    for nombre in (2, 3, 4):
+        vues = disposer_vues(nombre)
+        assert len(vues) == nombre
+        fenetre = pygame.Rect(0, snake_game.HAUTEUR_PANNEAU, snake_game.LARGEUR,
+                              snake_game.HAUTEUR - snake_game.HAUTEUR_PANNEAU)
+        assert all(fenetre.contains(vue) for vue in vues)
+        assert not any(vue.colliderect(autre) for i, vue in enumerate(vues) for autre in vues[i + 1:])
+
+
+@pytest.fixture
+def sauvegarde(tmp_path, monkeypatch):
+    # Les scores sont écrits dans le dossier du test, pas dans le vrai scores.json
+    monkeypatch.chdir(tmp_path)
+    sauvegarde = snake_game.SauvegardeDifferee(intervalle=60)
+    monkeypatch.setattr(snake_game, "sauvegarde", sauvegarde)
+    yield sauvegarde
+    sauvegarde.arreter()
+
+
+def test_chaque_joueur_a_sa_partie_et_ses_touches(sauvegarde, monkeypatch, ecran):
+    monkeypatch.setattr(snake_game, "horloge", HorlogeVirtuelle())
+    # Le joueur 2 (Z Q S D) monte ; le joueur 1 va tout droit jusqu'au mur
+    pygame.event.clear()
+    pygame.event.post(touche(pygame.K_z))
+    scores = {}
+    resultats = jouer_ecran_partage(ecran, ["Zoé", "Max"], {"Max": {"couleur": [255, 0, 255]}}, scores, graine=1)
+    assert set(resultats) == {"Zoé", "Max"}
+    assert set(scores) == {"Zoé", "Max"}
+
+    joueurs = creer_joueurs(["Zoé", "Max"], {"Max": {"couleur": [255, 0, 255]}}, graine=1)
+    assert joueurs[0].couleur == COULEURS_PAR_DEFAUT[0]
+    assert joueurs[1].couleur == (255, 0, 255)
+    # Même graine : les mêmes pommes, mais des listes différentes
+    assert joueurs[0].partie.pommes == joueurs[1].partie.pommes
+    assert joueurs[0].partie.pommes is not joueurs[1].partie.pommes
+    changer_direction(joueurs[1].partie, joueurs[1].touches[pygame.K_z])
+    avancer_partie(joueurs[0].partie)
+    avancer_partie(joueurs[1].partie)
+    assert joueurs[0].partie.direction == Direction.DROITE
+    assert joueurs[1].partie.direction == Direction.HAUT
+
+
+def test_chaque_serpent_est_dessine_dans_sa_vue(ecran):
+    joueurs = creer_joueurs(["A", "B", "C", "D"], {}, graine=3)
+    joueurs[2].vivant = False
+    RenduPartage(joueurs).dessiner(ecran, joueurs)
+    for joueur in joueurs:
+        tete = joueur.vers_vue(joueur.partie.serpent[0])
+        corps = joueur.vers_vue(joueur.partie.serpent[1])
+        assert joueur.vue.collidepoint(tete)
+        couleur = ecran.get_at((corps[0] + 3, corps[1] + 3))[:3]
+        if joueur.vivant:
+            assert couleur == joueur.couleur
+        else:
+            # Sous le voile, le serpent est plus sombre
+            assert couleur != joueur.couleur
+
+
+class EcranCompteur(pygame.Surface):
+    """Une fenêtre qui compte ses appels à blits et les images copiées"""
+
+    def __init__(self):
+        super().__init__((snake_game.LARGEUR, snake_game.HAUTEUR))
+        self.appels_blits = 0
+        self.images_copiees = 0
+        self.appels_blit = 0
+
+    def blits(self, copies, doreturn=True):
+        copies = list(copies)
+        self.appels_blits += 1
+        self.images_copiees += len(copies)
+        return super().blits(copies, doreturn)
+
+    def blit(self, *arguments, **options):
+        self.appels_blit += 1
+        return super().blit(*arguments, **options)
+
+
+def test_toutes_les_vues_sont_copiees_en_un_seul_appel():
+    assert (LARGEUR_VUE, HAUTEUR_VUE) == (snake_game.LARGEUR // 2, (snake_game.HAUTEUR - snake_game.HAUTEUR_PANNEAU) // 2)
+    joueurs = creer_joueurs(["A", "B", "C", "D"], {}, graine=4)
+    # Des serpents assez longs pour que le dessin des cases compte
+    for joueur in joueurs:
+        x, y = joueur.partie.serpent[0]
+        joueur.partie.serpent = [(x - i * snake_game.TAILLE_CASE, y) for i in range(20)]
+    joueurs[3].vivant = False
+    rendu = RenduPartage(joueurs)
+    ecran = EcranCompteur()
+    for _ in range(10):
+        rendu.dessiner(ecran, joueurs)
+    # Un seul appel par image : le panneau, toutes les cases, les pommes et le voile
+    cases = sum(len(joueur.partie.serpent) + len(joueur.partie.pommes) for joueur in joueurs)
+    assert ecran.appels_blits == 10
+    assert ecran.images_copiees == 10 * (1 + cases + 1)
+    assert ecran.appels_blit == 0
+
+
+def test_profilage_de_l_ecran_partage(sauvegarde, monkeypatch):
+    class HorlogeLente(HorlogeVirtuelle):
+        def tick(self, fps=0):
+            time.sleep(0.003)
+            return super().tick(fps)
+
+    monkeypatch.setattr(snake_game, "horloge", HorlogeLente())
+    monkeypatch.setattr(pygame, "quit", lambda: None)
+    pygame.event.clear()
+    main(["Zoé", "Max", "--graine", "1", "--profile", "essai"])
+    with open("essai.txt") as f:
+        assert "=== partage" in f.read()
+    with open("essai.folded") as f:
+        assert all(ligne.startswith("partage;") for ligne in f)
@@ -0,0 +1,61 @@
+"""
+Tests des écrans immobiles : ils ne se redessinent que lorsqu'il se passe quelque chose
+"""
+import pygame
+
+import snake_game
+
+
+class CompteurImages:
+    """Remplace la capture : compte simplement les images affichées"""
+
+    def __init__(self):
+        self.noms = []
+
+    def capturer(self, surface, nom_ecran):
+        self.noms.append(nom_ecran)
+
+
+def lancer_avec_compteur(monkeypatch, evenements, fonction, *arguments):
+    """Lance l'écran en lui donnant les événements un par un, comme s'ils arrivaient séparément"""
+    compteur = CompteurImages()
+    monkeypatch.setattr(snake_game, "capture_images", compteur)
+    monkeypatch.setattr(snake_game, "attendre_evenements", lambda delai_ms=0: [evenements.pop(0)])
+    resultat = fonction(*arguments)
+    return resultat, compteur.noms
+
+
+def test_pause_ignore_la_souris(monkeypatch, ecran):
+    evenements = []
+    for position in [(10, 10), (20, 20), (30, 30)]:
+        evenements.append(pygame.event.Event(pygame.MOUSEMOTION, pos=position, rel=(1, 1), buttons=(0, 0, 0)))
+    evenements.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, unicode=" ", mod=0))
+
+    resultat, images = lancer_avec_compteur(monkeypatch, evenements, snake_game.afficher_ecran_pause, ecran, "zoe", 40)
+    assert resultat == "reprendre"
+    assert images == ["pause"]
+
+
+def test_menu_redessine_seulement_quand_la_souris_entre_sur_le_bouton(monkeypatch, ecran):
+    bouton = (snake_game.LARGEUR // 2, snake_game.HAUTEUR - 90)
+    evenements = []
+    for position in [(10, 10), (20, 20), bouton, (bouton[0] + 1, bouton[1])]:
+        evenements.append(pygame.event.Event(pygame.MOUSEMOTION, pos=position, rel=(1, 1), buttons=(0, 0, 0)))
+    evenements.append(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=bouton, button=1))
+
+    resultat, images = lancer_avec_compteur(monkeypatch, evenements, snake_game.afficher_menu, ecran,
+                                            {"zoe": snake_game.convertir_ancien_format([10])})
+    assert resultat is True
+    # Une image au départ, une quand la souris arrive sur le bouton
+    assert images == ["menu", "menu"]
+
+
+def test_saisie_du_nom_redessine_a_chaque_touche(monkeypatch, ecran):
+    evenements = []
+    for lettre in "zoe":
+        evenements.append(pygame.event.Event(pygame.KEYDOWN, key=ord(lettre), unicode=lettre, mod=0))
+    evenements.append(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN, unicode="\r", mod=0))
+
+    resultat, images = lancer_avec_compteur(monkeypatch, evenements, snake_game.demander_nom_joueur, ecran, {}, {})
+    assert resultat == ("zoe", (0, 255, 0))
+    assert images == ["nom"] * 4
@@ -0,0 +1,83 @@
+"""
+Tests du fantôme : un record enregistré se rejoue exactement, en peu d'octets
+"""
+import os
+import random
+import time
+
+import fantome
+from fantome import EnregistreurFantome, ouvrir_fantome, chemin_fantome
+from robots import robot_gourmand
+from snake_game import Partie, avancer_partie, changer_direction
+
+
+def jouer_en_enregistrant(nom, graine):
+    """
+    Joue une partie de robot en l'enregistrant, retourne (partie, serpents à chaque pas)
+    """
+    partie = Partie(False, random.Random(graine))
+    enregistreur = EnregistreurFantome(nom, partie.serpent)
+    serpents = []
+    while len(serpents) < 3000:
+        changer_direction(partie, robot_gourmand(partie))
+        changements = avancer_partie(partie)
+        if changements["collision"] is not None:
+            break
+        enregistreur.noter(changements)
+        serpents.append(list(partie.serpent))
+    enregistreur.terminer(partie.score)
+    return partie, serpents
+
+
+def test_le_fantome_rejoue_le_record(tmp_path, monkeypatch):
+    monkeypatch.setattr(fantome, "DOSSIER_FANTOMES", str(tmp_path))
+    partie, serpents = jouer_en_enregistrant("Zoé", 3)
+    assert partie.score > 0
+
+    # Environ un octet par pas
+    taille = os.path.getsize(chemin_fantome("Zoé"))
+    assert taille < fantome.ENTETE.size + 10 + len(serpents) * 1.1
+
+    lecteur = ouvrir_fantome("Zoé")
+    assert lecteur.score == partie.score
+    for serpent in serpents:
+        lecteur.avancer()
+        assert lecteur.cases() == serpent
+    lecteur.avancer()
+    assert lecteur.termine
+    lecteur.fermer()
+
+
+def test_un_moins_bon_score_ne_remplace_pas_le_fantome(tmp_path, monkeypatch):
+    monkeypatch.setattr(fantome, "DOSSIER_FANTOMES", str(tmp_path))
+    assert ouvrir_fantome("Zoé") is None
+    partie, _ = jouer_en_enregistrant("Zoé", 3)
+    enregistreur = EnregistreurFantome("Zoé", Partie().serpent)
+    assert not enregistreur.terminer(0)
+    assert ouvrir_fantome("Zoé").score == partie.score
+    assert os.listdir(tmp_path) == [os.path.basename(chemin_fantome("Zoé"))]
+
+
+def test_le_premier_fantome_doit_battre_le_meilleur_score(tmp_path, monkeypatch):
+    monkeypatch.setattr(fantome, "DOSSIER_FANTOMES", str(tmp_path))
+    # Pas encore de fantôme, mais un meilleur score de 500 dans scores.json
+    enregistreur = EnregistreurFantome("Zoé", Partie().serpent)
+    assert not enregistreur.terminer(200, meilleur_score=500)
+    assert ouvrir_fantome("Zoé") is None
+    enregistreur = EnregistreurFantome("Zoé", Partie().serpent)
+    assert enregistreur.terminer(600, meilleur_score=500)
+    assert ouvrir_fantome("Zoé").score == 600
+
+
+def test_dessiner_le_fantome_est_rapide(tmp_path, monkeypatch, ecran):
+    monkeypatch.setattr(fantome, "DOSSIER_FANTOMES", str(tmp_path))
+    _, serpents = jouer_en_enregistrant("Zoé", 3)
+    lecteur = ouvrir_fantome("Zoé")
+    debut = time.perf_counter()
+    for _ in serpents:
+        lecteur.avancer()
+        lecteur.dessiner(ecran)
+    par_image = (time.perf_counter() - debut) / len(serpents)
+    lecteur.fermer()
+    # Bien moins qu'une image à 60 images par seconde
+    assert par_image < 0.002
@@ -1,72 +1,69 @@
-#!/usr/bin/env python3
 """
-Test script pour simuler le flux complet du jeu
+Test du parcours complet du jeu (menu, nom, partie, autre joueur, quitter),
+joué par le pilote automatique : sans fenêtre, sans attendre, toujours pareil
 """
-import subprocess
+import json
 import time
-import sys
 
-# Start the game in a subprocess
-print("🎮 Lancement du jeu Snake...")
-proc = subprocess.Popen(
-    ['python3', 'snake_game.py'],
-    stdin=subprocess.PIPE,
-    stdout=subprocess.PIPE,
-    stderr=subprocess.STDOUT,
-    text=True,
-    bufsize=1
-)
+import pygame
 
-try:
-    # Simulate:
-    # 1. Wait for menu and click "DÉMARRER"
-    print("⏳ En attente du menu...")
-    time.sleep(2)
-    proc.stdin.write('\n')  # Simulate ENTER
-    proc.stdin.flush()
-    
-    # 2. Wait for name request and type a name
-    print("⏳ En attente de la demande de nom...")
-    time.sleep(1)
-    proc.stdin.write('TestJoueur\n')  # Type name
-    proc.stdin.flush()
-    
-    # 3. Wait for color selection
-    print("⏳ En attente de la sélection de couleur...")
-    time.sleep(1)
-    proc.stdin.write('\n')  # Press ENTER to confirm color
-    proc.stdin.flush()
-    
-    # 4. Play for a bit (the game auto-crashes after 2 seconds due to collision)
-    print("⏳ Partie en cours...")
-    time.sleep(3)
-    
-    # 5. Try to press 'A' for "Autre joueur"
-    print("⏳ Appui sur [A] pour 'Autre joueur'...")
-    proc.stdin.write('a\n')  # Lowercase to simulate user input
-    proc.stdin.flush()
-    
-    # 6. Wait for name request again
-    print("⏳ En attente de nouveau joueur...")
-    time.sleep(2)
-    proc.stdin.write('Joueur2\n')
-    proc.stdin.flush()
-    
-    # 7. Wait and finish
-    print("⏳ Fin du test...")
-    time.sleep(1)
-    
-except Exception as e:
-    print(f"❌ Erreur: {e}")
-finally:
-    proc.terminate()
-    output, _ = proc.communicate()
-    
-    print("\n" + "="*60)
-    print("📋 OUTPUT DU JEU:")
-    print("="*60)
-    # Print last 50 lines
-    lines = output.split('\n')
-    for line in lines[-50:]:
-        if line.strip():
-            print(line)
+import snake_game
+from pilote import jouer_scenario, touche, taper, clic
+
+BOUTON_DEMARRER = (snake_game.LARGEUR // 2, snake_game.HAUTEUR - 90)
+
+SCENARIO = [
+    ("menu", [clic(BOUTON_DEMARRER)]),
+    ("nom", taper("TestJoueur") + [touche(pygame.K_RETURN)]),
+    # La partie se termine seule : le serpent va tout droit dans le mur
+    ("fin", [touche(pygame.K_a, "a")]),
+    ("nom", taper("Joueur2") + [touche(pygame.K_RIGHT), touche(pygame.K_RETURN)]),
+    ("fin", [touche(pygame.K_q, "q")]),
+]
+
+
+def test_parcours_complet(tmp_path, monkeypatch, ecran):
+    monkeypatch.chdir(tmp_path)
+    debut = time.perf_counter()
+    pilote = jouer_scenario(SCENARIO)
+    duree = time.perf_counter() - debut
+
+    # Tout le scénario a été joué, dans l'ordre
+    assert pilote.etapes == []
+    ecrans = [nom for i, nom in enumerate(pilote.ecrans) if i == 0 or pilote.ecrans[i - 1] != nom]
+    assert ecrans == ["menu", "nom", "compte_a_rebours", "partie", "fin",
+                      "nom", "compte_a_rebours", "partie", "fin"]
+    # Deux comptes à rebours de 3 secondes et deux parties... en temps virtuel
+    assert pilote.horloge.get_ticks() > 6000
+    assert duree < 5
+
+    # Les scores et couleurs des deux joueurs sont enregistrés
+    scores = json.load(open("scores.json"))
+    assert set(scores) == {"TestJoueur", "Joueur2"}
+    joueurs = json.load(open("joueurs.json"))
+    assert joueurs["Joueur2"]["couleur"] == [0, 100, 255]
+
+
+def test_le_parcours_est_toujours_le_meme(tmp_path, monkeypatch, ecran):
+    monkeypatch.chdir(tmp_path)
+    premier = jouer_scenario(SCENARIO[:2] + [("fin", [touche(pygame.K_q, "q")])], graine=7)
+    (tmp_path / "scores.json").unlink()
+    (tmp_path / "joueurs.json").unlink()
+    second = jouer_scenario(SCENARIO[:2] + [("fin", [touche(pygame.K_q, "q")])], graine=7)
+    assert premier.ecrans == second.ecrans
+    assert premier.horloge.get_ticks() == second.horloge.get_ticks()
+
+
+def test_mode_enfant_continue_apres_un_choc(tmp_path, monkeypatch, ecran):
+    monkeypatch.chdir(tmp_path)
+    scenario = SCENARIO[:2] + [
+        # Choc contre le mur : retour en arrière et pause
+        ("pause", [touche(pygame.K_SPACE, " ")]),
+        ("partie", [touche(pygame.K_UP)]),
+        # Deuxième choc (en haut) : cette fois on quitte depuis la pause
+        ("pause", [touche(pygame.K_ESCAPE)]),
+        ("fin", [touche(pygame.K_q, "q")]),
+    ]
+    pilote = jouer_scenario(scenario, ["--mode-enfant"])
+    assert pilote.etapes == []
+    assert pilote.ecrans.count("pause") == 2
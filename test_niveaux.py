@@ -0,0 +1,122 @@
+"""
+Tests des niveaux : carte des murs, pommes seulement sur les cases accessibles, image des murs
+"""
+import random
+
+import pygame
+import pytest
+
+import snake_game
+from niveaux import charger_niveau, compiler_niveau, COULEUR_MUR
+from pilote import jouer_scenario, touche, taper, clic
+from snake_game import Partie, Direction, avancer_partie, changer_direction, TAILLE_CASE, HAUTEUR_PANNEAU
+
+# Un mur juste au-dessus du départ, et une pièce fermée en haut à gauche
+NIVEAU_ESSAI = "\n".join([
+    "#####",
+    "#...#",
+    "#####",
+] + ["."] * 11 + [
+    "." * 25 + "#",
+])
+
+
+def case(colonne, ligne):
+    return (colonne * TAILLE_CASE, HAUTEUR_PANNEAU + ligne * TAILLE_CASE)
+
+
+def test_la_carte_des_murs_contient_les_bords():
+    niveau = compiler_niveau(NIVEAU_ESSAI)
+    assert niveau.est_mur(case(0, 0)) and niveau.est_mur(case(25, 14))
+    assert not niveau.est_mur(case(1, 1)) and not niveau.est_mur(case(26, 14))
+    # Hors du plateau : c'est aussi un mur
+    for dehors in (case(-1, 5), case(50, 5), case(5, -1), case(5, 35)):
+        assert niveau.est_mur(dehors)
+
+
+def test_les_pommes_vont_seulement_sur_les_cases_accessibles():
+    niveau = compiler_niveau(NIVEAU_ESSAI)
+    piece_fermee = {case(1, 1), case(2, 1), case(3, 1)}
+    assert not piece_fermee & set(niveau.accessibles)
+    # 13 murs et les 3 cases de la pièce fermée
+    assert len(niveau.accessibles) == 50 * 35 - 13 - 3
+
+    alea = random.Random(4)
+    serpent = Partie(niveau=niveau).serpent
+    for piege in (False, True):
+        for _ in range(2000):
+            pomme = niveau.generer_pomme(serpent, piege, alea, 0.5)
+            assert not niveau.est_mur(pomme)
+            assert pomme not in piece_fermee and pomme not in serpent
+
+
+def test_la_tete_touche_un_mur_du_niveau():
+    niveau = compiler_niveau(NIVEAU_ESSAI)
+    partie = Partie(False, random.Random(1), niveau=niveau)
+    # Le départ est en (25, 15) : le mur du niveau est juste au-dessus
+    assert partie.serpent[0] == case(25, 15)
+    assert avancer_partie(partie)["collision"] is None
+    changer_direction(partie, Direction.HAUT)
+    assert avancer_partie(partie)["collision"] is None
+    changer_direction(partie, Direction.GAUCHE)
+    assert avancer_partie(partie)["collision"] == "mur"
+    assert partie.serpent[0] == case(26, 14)
+
+
+def test_les_robots_voient_les_murs_du_niveau():
+    from robots import robot_cycle, robot_gourmand, robot_prudent
+    niveau = charger_niveau("murs")
+    for robot in (robot_prudent, robot_gourmand, robot_cycle):
+        partie = Partie(False, random.Random(0), niveau=niveau)
+        for _ in range(300):
+            changer_direction(partie, robot(partie))
+            assert avancer_partie(partie)["collision"] is None, robot.__name__
+
+
+def test_le_depart_doit_etre_libre_et_le_niveau_pas_trop_grand():
+    with pytest.raises(ValueError):
+        compiler_niveau("\n" * 15 + "." * 26 + "#")
+    with pytest.raises(ValueError):
+        compiler_niveau("." * 51)
+
+
+def test_les_murs_sont_dessines_une_fois(ecran):
+    niveau = charger_niveau("boites")
+    partie = Partie(niveau=niveau)
+    for _ in range(2):
+        snake_game.dessiner_partie(ecran, partie.serpent, partie.pommes, "zoé", 0, (0, 255, 0), False, niveau=niveau)
+    couche = niveau.couche_murs()
+    assert niveau.couche_murs() is couche
+    x, y = case(*niveau.murs_cases[0])
+    assert ecran.get_at((x + TAILLE_CASE // 2, y + TAILLE_CASE // 2))[:3] == COULEUR_MUR
+
+
+def test_une_partie_avec_un_niveau(tmp_path, monkeypatch, ecran):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "essai.txt").write_text(NIVEAU_ESSAI)
+    scenario = [
+        ("menu", [clic((snake_game.LARGEUR // 2, snake_game.HAUTEUR - 90))]),
+        ("nom", taper("zoé") + [touche(pygame.K_RETURN)]),
+        # Tout droit jusqu'au bord droit : le mur de la bordure de la carte
+        ("fin", [touche(pygame.K_q, "q")]),
+    ]
+    pilote = jouer_scenario(scenario, ["--niveau", str(tmp_path / "essai.txt")])
+    assert pilote.etapes == []
+    assert pilote.ecrans.count("partie") == 24
+
+
+def test_les_niveaux_du_jeu_se_chargent_depuis_n_importe_quel_dossier(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert charger_niveau("boites").murs_cases
+    options = snake_game.lire_options(["--niveau", "murs"])
+    assert options.niveau_charge.murs_cases == charger_niveau("murs").murs_cases
+
+
+@pytest.mark.parametrize("contenu", [None, "." * 51, "\n" * 15 + "." * 26 + "#"])
+def test_un_niveau_faux_est_refuse_par_les_options(tmp_path, capsys, contenu):
+    chemin = tmp_path / "faux.txt"
+    if contenu is not None:
+        chemin.write_text(contenu)
+    with pytest.raises(SystemExit):
+        snake_game.lire_options(["--niveau", str(chemin) if contenu is not None else "inconnu"])
+    assert "--niveau" in capsys.readouterr().err
@@ -0,0 +1,91 @@
+"""
+Tests de la sauvegarde différée : écriture en arrière-plan, rien d'écrit pour rien
+"""
+import json
+import threading
+import time
+
+import persistance
+from persistance import SauvegardeDifferee
+
+
+def test_rien_n_est_ecrit_si_le_contenu_ne_change_pas(tmp_path):
+    chemin = str(tmp_path / "joueurs.json")
+    sauvegarde = SauvegardeDifferee(intervalle=60)
+    assert sauvegarde.marquer(chemin, {"zoe": {"couleur": [0, 255, 0]}})
+    sauvegarde.vider()
+    assert not sauvegarde.marquer(chemin, {"zoe": {"couleur": [0, 255, 0]}})
+    sauvegarde.arreter()
+    assert sauvegarde.nombre_ecritures == 1
+    assert json.loads(open(chemin).read()) == {"zoe": {"couleur": [0, 255, 0]}}
+
+
+def test_les_modifications_sont_regroupees_et_ecrites_a_l_arret(tmp_path):
+    chemin = str(tmp_path / "scores.json")
+    sauvegarde = SauvegardeDifferee(intervalle=60)
+    scores = {}
+    for score in range(10):
+        scores.setdefault("zoe", []).append(score)
+        sauvegarde.marquer(chemin, scores)
+    # Rien n'est encore écrit : on attend la fin de l'intervalle
+    assert sauvegarde.nombre_ecritures == 0
+    sauvegarde.arreter()
+    assert sauvegarde.nombre_ecritures == 1
+    assert json.loads(open(chemin).read()) == {"zoe": list(range(10))}
+
+
+def test_le_fichier_va_dans_le_dossier_du_moment_du_marquage(tmp_path, monkeypatch):
+    (tmp_path / "ailleurs").mkdir()
+    monkeypatch.chdir(tmp_path)
+    sauvegarde = SauvegardeDifferee(intervalle=60)
+    sauvegarde.marquer("scores.json", {"zoe": [10]})
+    # Le dossier courant change avant l'écriture
+    monkeypatch.chdir(tmp_path / "ailleurs")
+    sauvegarde.arreter()
+    assert json.loads((tmp_path / "scores.json").read_text()) == {"zoe": [10]}
+    assert not (tmp_path / "ailleurs" / "scores.json").exists()
+
+
+def test_l_ecriture_se_fait_en_arriere_plan(tmp_path, monkeypatch):
+    fils = []
+    ecrire = persistance.ecrire_fichier
+
+    def ecrire_lentement(chemin, texte):
+        fils.append(threading.current_thread().name)
+        time.sleep(0.2)  # Disque très lent
+        ecrire(chemin, texte)
+
+    monkeypatch.setattr(persistance, "ecrire_fichier", ecrire_lentement)
+    sauvegarde = SauvegardeDifferee(intervalle=0.01)
+    debut = time.perf_counter()
+    sauvegarde.marquer(str(tmp_path / "scores.json"), {"zoe": [10]})
+    assert time.perf_counter() - debut < 0.1
+
+    while sauvegarde.nombre_ecritures == 0:
+        time.sleep(0.01)
+    assert fils == ["sauvegarde"]
+    sauvegarde.arreter()
+
+
+def test_une_erreur_d_ecriture_est_reessayee(tmp_path, monkeypatch, capsys):
+    echecs = []
+    ecrire = persistance.ecrire_fichier
+
+    def disque_plein_au_debut(chemin, texte):
+        if len(echecs) < 2:
+            echecs.append(chemin)
+            raise OSError(28, "No space left on device")
+        ecrire(chemin, texte)
+
+    monkeypatch.setattr(persistance, "ecrire_fichier", disque_plein_au_debut)
+    chemin = tmp_path / "scores.json"
+    sauvegarde = SauvegardeDifferee(intervalle=0.01)
+    sauvegarde.marquer(str(chemin), {"zoe": [10]})
+    while sauvegarde.nombre_ecritures == 0:
+        time.sleep(0.01)
+    # Le fil d'écriture a survécu aux erreurs et le score n'est pas perdu
+    assert len(echecs) == 2 and sauvegarde.fil.is_alive()
+    assert json.loads(chemin.read_text()) == {"zoe": [10]}
+    sortie = capsys.readouterr().out
+    assert sortie.count("Impossible d'écrire") == 1
+    sauvegarde.arreter()
@@ -0,0 +1,40 @@
+"""
+Tests du profileur : les échantillons sont rangés par écran
+"""
+import time
+
+from profilage import ProfileurEchantillons
+
+
+def calculer_longtemps(duree):
+    fin = time.perf_counter() + duree
+    while time.perf_counter() < fin:
+        pass
+
+
+# Mêmes noms que les écrans du jeu : le profileur les reconnaît dans la pile
+def afficher_menu():
+    calculer_longtemps(0.1)
+
+
+def afficher_ecran_fin():
+    calculer_longtemps(0.1)
+
+
+def test_les_echantillons_sont_ranges_par_ecran(tmp_path):
+    profileur = ProfileurEchantillons(intervalle=0.001)
+    profileur.demarrer()
+    afficher_menu()
+    afficher_ecran_fin()
+    profileur.arreter()
+
+    prefixe = str(tmp_path / "profil")
+    resume = profileur.enregistrer(prefixe)
+    lignes = open(prefixe + ".folded").read().splitlines()
+    ecrans = {ligne.split(";")[0] for ligne in lignes}
+    assert {"menu", "fin"} <= ecrans
+    # Chaque ligne : "ecran;fonction;fonction... nombre"
+    assert all(ligne.rsplit(" ", 1)[1].isdigit() for ligne in lignes)
+    assert any(ligne.startswith("menu;") and "test_profilage.py:afficher_menu;" in ligne
+               for ligne in lignes)
+    assert "=== menu" in resume and "test_profilage.py:calculer_longtemps" in resume
@@ -0,0 +1,102 @@
+"""
+Tests du rembobinage : revenir en arrière redonne exactement la même partie
+"""
+import copy
+import random
+
+from rembobinage import Rembobinage, INTERVALLE_IMAGE_CLE
+from robots import robot_gourmand
+from snake_game import Partie, Direction, avancer_partie, changer_direction
+
+
+def etat(partie):
+    return (list(partie.serpent), list(partie.pommes), partie.score, partie.direction,
+            partie.mode_triche, partie.alea.getstate())
+
+
+def jouer(partie, rembobinage, nombre_pas):
+    """Joue nombre_pas pas avec le robot gourmand, retourne l'état après chaque pas"""
+    etats = []
+    for _ in range(nombre_pas):
+        changer_direction(partie, robot_gourmand(partie))
+        changements = avancer_partie(partie)
+        assert changements["collision"] is None
+        rembobinage.noter(changements)
+        etats.append(copy.deepcopy(etat(partie)))
+    return etats
+
+
+def test_rembobiner_redonne_l_etat_exact():
+    partie = Partie(True, random.Random(5))
+    rembobinage = Rembobinage(partie, pas_max=30)
+    etats = jouer(partie, rembobinage, 200)
+    assert partie.score > 0
+
+    for nombre_pas in (1, 7, INTERVALLE_IMAGE_CLE, 30):
+        assert rembobinage.rembobiner(nombre_pas) == nombre_pas
+        assert etat(partie) == etats[-1 - nombre_pas]
+        # Et la partie continue comme la première fois
+        suite = jouer(partie, rembobinage, nombre_pas)
+        assert suite == etats[-nombre_pas:]
+
+
+def test_on_ne_rembobine_pas_plus_loin_que_la_fenetre():
+    partie = Partie(False, random.Random(2))
+    rembobinage = Rembobinage(partie, pas_max=30)
+    etats = jouer(partie, rembobinage, 100)
+    assert rembobinage.rembobiner(1000) == 30
+    assert etat(partie) == etats[-31]
+    # La mémoire ne dépend que de la fenêtre, pas de la durée de la partie
+    assert len(rembobinage.pas) <= 30 + INTERVALLE_IMAGE_CLE
+    assert len(rembobinage.images_cles) <= 30 // INTERVALLE_IMAGE_CLE + 2
+
+
+def test_continuer_apres_un_choc():
+    partie = Partie(False, random.Random(3))
+    rembobinage = Rembobinage(partie)
+    changements = avancer_partie(partie)
+    while changements["collision"] is None:
+        rembobinage.noter(changements)
+        changements = avancer_partie(partie)
+    rembobinage.rembobiner(5)
+    # Cinq cases avant le mur : on peut tourner et continuer
+    changer_direction(partie, Direction.HAUT)
+    assert avancer_partie(partie)["collision"] is None
+
+
+def test_les_mesures_et_le_fantome_reculent_aussi(tmp_path, monkeypatch):
+    import fantome
+    from fantome import EnregistreurFantome, ouvrir_fantome
+    from telemetrie import MesuresPartie
+    monkeypatch.setattr(fantome, "DOSSIER_FANTOMES", str(tmp_path))
+    # Le fantôme d'une partie précédente
+    ancienne = Partie(False, random.Random(3))
+    enregistreur = EnregistreurFantome("Zoé", ancienne.serpent)
+    for _ in range(200):
+        changer_direction(ancienne, robot_gourmand(ancienne))
+        enregistreur.noter(avancer_partie(ancienne))
+    assert enregistreur.terminer(ancienne.score)
+
+    partie = Partie(True, random.Random(5))
+    rembobinage = Rembobinage(partie)
+    mesures = MesuresPartie(fps_jeu=10)
+    lecteur = ouvrir_fantome("Zoé")
+    historique = []
+    for _ in range(120):
+        changer_direction(partie, robot_gourmand(partie))
+        changements = avancer_partie(partie)
+        rembobinage.noter(changements)
+        mesures.noter(changements)
+        lecteur.avancer()
+        historique.append((mesures.pas, mesures.pommes_mangees, mesures.points_oublies, lecteur.cases()))
+    # Le choc : compté, et le fantôme avance, puis on revient en arrière
+    mesures.noter({"pommes_mangees": [], "point_oublie": False})
+    lecteur.avancer()
+    defaits = rembobinage.rembobiner(30)
+    mesures.reculer(defaits + 1)
+    lecteur.reculer(defaits + 1)
+
+    avant = historique[-1 - defaits]
+    assert historique[-1][1] > avant[1]    # Des pommes mangées pendant les pas défaits
+    assert (mesures.pas, mesures.pommes_mangees, mesures.points_oublies, lecteur.cases()) == avant
+    lecteur.fermer()
@@ -0,0 +1,101 @@
+"""
+Tests du jeu en réseau : le serveur et des clients automatiques sur la boucle locale
+"""
+import asyncio
+
+from snake_game import Direction, changer_direction
+from reseau import (ServeurSnake, PartieReseau, JoueurReseau, ClientReseau, robot_reseau,
+                    encoder_message, decoder_message, lire_bonjour)
+
+
+def test_les_changements_suffisent_a_reconstruire_la_partie():
+    joueurs = [JoueurReseau(0, "zoe", (0, 255, 0)), JoueurReseau(1, "bob", (255, 0, 0))]
+    partie = PartieReseau(joueurs, fps=10, graine=3)
+    client = ClientReseau()
+    client.appliquer(decoder_message(encoder_message(partie.etat_complet())))
+
+    # Zoé tourne en rond pour rester en vie, Bob fonce dans le mur
+    virages = [Direction.BAS, Direction.GAUCHE, Direction.HAUT, Direction.DROITE]
+    for tick in range(40):
+        if tick % 5 == 0:
+            changer_direction(joueurs[0].partie, virages[(tick // 5) % 4])
+        client.appliquer(decoder_message(encoder_message(partie.avancer())))
+
+        for joueur in partie.joueurs_vivants():
+            assert client.serpents[str(joueur.numero)] == joueur.partie.serpent
+            assert client.scores[str(joueur.numero)] == joueur.partie.score
+        assert sorted(client.pommes) == sorted(partie.pommes)
+
+    assert not joueurs[1].vivant
+    assert "1" not in client.serpents
+
+
+def test_partie_complete_sur_la_boucle_locale():
+    async def scenario():
+        serveur = ServeurSnake(joueurs_par_partie=2, fps=200, ticks_max=60)
+        port = await serveur.demarrer("127.0.0.1", 0)
+        clients = await asyncio.gather(robot_reseau("127.0.0.1", port, "zoe"),
+                                       robot_reseau("127.0.0.1", port, "bob"))
+        await serveur.arreter()
+        return serveur, clients
+
+    serveur, clients = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert all(client.termine for client in clients)
+    # Les deux clients ont vu la même partie jusqu'au bout
+    assert clients[0].tick == clients[1].tick == 60
+    assert clients[0].scores == clients[1].scores
+    assert serveur.nombre_ticks == 60
+
+
+def test_les_messages_incomprehensibles_sont_ignores():
+    async def scenario():
+        serveur = ServeurSnake(joueurs_par_partie=1, fps=1, ticks_max=1)
+        port = await serveur.demarrer("127.0.0.1", 0)
+
+        # Un bonjour qui n'est pas un objet JSON : la connexion est fermée
+        lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+        ecrivain.write(b"[1, 2]\n")
+        assert await lecteur.readline() == b""
+        ecrivain.close()
+
+        # Des lignes fausses, puis une vraie direction : elle est quand même suivie
+        lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+        ecrivain.write(encoder_message({"type": "bonjour", "nom": "zoe"}))
+        await lecteur.readline()
+        ecrivain.write(b"pas du json\n" + encoder_message({"type": "direction", "direction": "NULLE_PART"})
+                       + b"[3]\n" + encoder_message({"type": "direction", "direction": "HAUT"}))
+        await ecrivain.drain()
+        while not serveur.parties or serveur.parties[0].joueurs[0].partie.direction_demandee != Direction.HAUT:
+            await asyncio.sleep(0.01)
+        ecrivain.close()
+        await serveur.arreter()
+        return serveur
+
+    serveur = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert serveur.prochain_numero == 1
+
+
+def test_un_bonjour_faux_est_refuse():
+    assert lire_bonjour({"type": "bonjour"}) == ("Joueur", (0, 255, 0))
+    assert lire_bonjour({"nom": "zoe", "couleur": [1, 2, 3]}) == ("zoe", (1, 2, 3))
+    for faux in ({"nom": 5}, {"nom": ""}, {"nom": "z" * 21}, {"couleur": 7}, {"couleur": "vert"},
+                 {"couleur": [1, 2]}, {"couleur": [1, 2, 300]}, {"couleur": [1.5, 2, 3]}, [1, 2]):
+        assert lire_bonjour(faux) is None, faux
+
+    async def scenario():
+        serveur = ServeurSnake(joueurs_par_partie=2, fps=200, ticks_max=5)
+        port = await serveur.demarrer("127.0.0.1", 0)
+        # Un nom qui n'est pas un texte : la connexion est fermée, sans entrer dans la salle d'attente
+        lecteur, ecrivain = await asyncio.open_connection("127.0.0.1", port)
+        ecrivain.write(encoder_message({"type": "bonjour", "nom": 5}))
+        assert await lecteur.readline() == b""
+        ecrivain.close()
+        assert serveur.salle_attente == []
+        # Les joueurs suivants peuvent toujours jouer
+        clients = await asyncio.gather(robot_reseau("127.0.0.1", port, "zoe"),
+                                       robot_reseau("127.0.0.1", port, "bob"))
+        await serveur.arreter()
+        return clients
+
+    clients = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert all(client.termine for client in clients)
@@ -0,0 +1,81 @@
+"""
+Tests des scénarios d'essai : des serpents très longs, toujours valables
+"""
+import json
+
+import pygame
+import pytest
+
+import snake_game
+from pilote import jouer_scenario, touche, taper, clic
+from robots import robot_cycle
+from scenarios import creer_partie, mesurer
+from snake_game import TAILLE_CASE, HAUTEUR_PANNEAU, avancer_partie, changer_direction
+
+CASES_PLATEAU = (snake_game.LARGEUR // TAILLE_CASE) * ((snake_game.HAUTEUR - HAUTEUR_PANNEAU) // TAILLE_CASE)
+BOUTON_DEMARRER = (snake_game.LARGEUR // 2, snake_game.HAUTEUR - 90)
+
+
+def verifier(partie, longueur, pommes_libres=True):
+    serpent = partie.serpent
+    assert len(serpent) == longueur == len(set(serpent))
+    # Chaque case touche la suivante, et tout est dans le plateau
+    for (x1, y1), (x2, y2) in zip(serpent, serpent[1:]):
+        assert abs(x1 - x2) + abs(y1 - y2) == TAILLE_CASE
+    assert all(0 <= x < snake_game.LARGEUR and HAUTEUR_PANNEAU <= y < snake_game.HAUTEUR for x, y in serpent)
+    if pommes_libres:
+        assert not set(partie.pommes) & set(serpent)
+
+
+def test_des_serpents_de_toutes_les_longueurs():
+    assert CASES_PLATEAU == 50 * 35
+    for longueur in (1, 3, 1000, CASES_PLATEAU - 5, CASES_PLATEAU):
+        partie = creer_partie(longueur, nombre_pommes=10, graine=2)
+        verifier(partie, longueur)
+        assert len(partie.pommes) == min(10, CASES_PLATEAU - longueur)
+    # Toujours la même partie avec la même graine
+    assert creer_partie(1200, 3, graine=5).pommes == creer_partie(1200, 3, graine=5).pommes
+
+
+def test_le_robot_cycle_ne_perd_jamais_jusqu_au_plateau_plein():
+    partie = creer_partie(CASES_PLATEAU - 20, nombre_pommes=20)
+    for _ in range(300):
+        changer_direction(partie, robot_cycle(partie))
+        changements = avancer_partie(partie)
+        if changements["collision"] is not None:
+            break
+    # Il ne perd que quand il n'y a plus aucune place
+    assert len(partie.serpent) == CASES_PLATEAU
+    # (les nouvelles pommes peuvent tomber sur le serpent)
+    verifier(partie, CASES_PLATEAU, pommes_libres=False)
+    assert changements["collision"] == "serpent"
+
+
+def test_le_banc_mesure_regles_pommes_et_dessin(ecran):
+    resultat = mesurer(1500, 1, 5)
+    assert resultat["longueur"] == 1500
+    assert all(resultat[cle] > 0 for cle in ("regles_us", "pomme_us", "dessin_us"))
+
+
+def test_un_scenario_dans_la_boucle_du_jeu(tmp_path, monkeypatch, ecran):
+    monkeypatch.chdir(tmp_path)
+    scenario = [
+        ("menu", [clic(BOUTON_DEMARRER)]),
+        ("nom", taper("stress") + [touche(pygame.K_RETURN)]),
+        ("partie", [touche(pygame.K_ESCAPE)]),
+        ("fin", [touche(pygame.K_q, "q")]),
+    ]
+    pilote = jouer_scenario(scenario, ["--stress", "1700", "--robot", "cycle"])
+    assert pilote.etapes == []
+    assert pilote.ecrans.count("partie") >= 1
+    # Une partie d'essai ne va pas dans les scores
+    fichier_scores = tmp_path / snake_game.FICHIER_SCORES
+    assert not fichier_scores.exists() or "stress" not in json.loads(fichier_scores.read_text())
+
+
+@pytest.mark.parametrize("arguments", [["--stress", "0"], ["--stress", str(CASES_PLATEAU + 1)],
+                                       ["--stress", "10", "--plateau", "51x37"]])
+def test_une_longueur_impossible_est_refusee_tout_de_suite(arguments):
+    with pytest.raises(SystemExit):
+        snake_game.lire_options(arguments)
+    assert snake_game.lire_options(["--stress", str(CASES_PLATEAU)]).stress == CASES_PLATEAU
@@ -0,0 +1,50 @@
+"""
+Tests de l'historique des scores : taille limitée, résumés exacts
+"""
+import datetime
+import json
+import random
+
+import snake_game
+
+
+def test_l_ancien_format_est_converti_sans_rien_perdre(tmp_path, monkeypatch):
+    anciens_scores = [10, 0, 0, 30, 90] * 20
+    fichier = tmp_path / "scores.json"
+    fichier.write_text(json.dumps({"madmax": anciens_scores}))
+    monkeypatch.setattr(snake_game, "FICHIER_SCORES", str(fichier))
+
+    scores = snake_game.charger_scores()
+    historique = scores["madmax"]
+    assert len(historique["recentes"]) == snake_game.PARTIES_RECENTES_GARDEES
+    assert snake_game.resume_joueur(historique) == {
+        "parties": 100, "total": sum(anciens_scores), "meilleur": 90, "moyenne": sum(anciens_scores) / 100}
+    assert snake_game.obtenir_meilleur_score(scores, "madmax") == 90
+
+
+def test_beaucoup_de_parties_gardent_un_historique_borne_et_exact(tmp_path, monkeypatch):
+    # Pas besoin d'écrire le fichier à chaque partie ici
+    monkeypatch.setattr(snake_game, "sauvegarder_scores", lambda scores: None)
+    alea = random.Random(5)
+    scores = {}
+    tous = []
+    jour = datetime.date(2025, 1, 1)
+    for numero in range(3000):
+        if numero % 10 == 0:
+            jour += datetime.timedelta(days=1)
+        score = alea.randint(0, 100) * 10
+        tous.append(score)
+        snake_game.ajouter_score(scores, "zoe", score, jour)
+
+    historique = scores["zoe"]
+    resume = snake_game.resume_joueur(historique)
+    assert resume["parties"] == 3000
+    assert resume["total"] == sum(tous)
+    assert resume["meilleur"] == max(tous)
+    assert historique["meilleurs"] == sorted(tous, reverse=True)[:snake_game.MEILLEURS_SCORES_GARDES]
+
+    # Taille limitée : N parties, au plus ~31 jours, puis des mois
+    assert len(historique["recentes"]) == snake_game.PARTIES_RECENTES_GARDEES
+    assert len(historique["jours"]) <= snake_game.JOURS_DETAILLES + 1
+    assert len(historique["mois"]) <= 12
+    assert [s for s, d in historique["recentes"]] == tous[-snake_game.PARTIES_RECENTES_GARDEES:]
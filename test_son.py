@@ -0,0 +1,49 @@
+"""
+Tests des sons : préparés une fois, joués sans attendre (pilote audio "dummy")
+"""
+import time
+import wave
+
+import pygame
+
+from son import Sons, EFFETS
+
+
+def test_les_sons_sont_prets_et_joues_sur_leur_canal(tmp_path):
+    assert pygame.mixer.get_init() is not None
+    sons = Sons(dossier=str(tmp_path))
+    assert set(sons.sons) == set(EFFETS)
+    # Chaque son dure à peu près la durée de ses notes
+    for nom, notes in EFFETS.items():
+        assert abs(sons.sons[nom].get_length() - sum(d for _, d in notes)) < 0.01
+
+    sons.jouer("manger")
+    assert sons.canaux["manger"].get_sound() is sons.sons["manger"]
+    # Jouer un autre son ne coupe pas le premier
+    sons.jouer("mort")
+    assert sons.canaux["manger"].get_sound() is sons.sons["manger"]
+
+
+def test_jouer_un_son_est_tres_rapide(tmp_path):
+    sons = Sons(dossier=str(tmp_path))
+    debut = time.perf_counter()
+    for _ in range(1000):
+        sons.jouer("manger")
+    assert (time.perf_counter() - debut) / 1000 < 0.0001
+
+
+def test_sans_son_rien_n_est_joue(tmp_path):
+    sons = Sons(actif=False, dossier=str(tmp_path))
+    sons.jouer("record")
+    assert sons.sons == {}
+
+
+def test_un_fichier_du_joueur_remplace_le_son_fabrique(tmp_path):
+    # Un son "maison" : une demi-seconde de silence
+    with wave.open(str(tmp_path / "mort.wav"), "wb") as fichier:
+        fichier.setnchannels(1)
+        fichier.setsampwidth(2)
+        fichier.setframerate(22050)
+        fichier.writeframes(bytes(22050))
+    sons = Sons(dossier=str(tmp_path))
+    assert abs(sons.sons["mort"].get_length() - 0.5) < 0.01
@@ -0,0 +1,158 @@
+"""
+Tests de la diffusion aux spectateurs : le jeu publie, le service renvoie à tout le monde
+"""
+import asyncio
+import random
+
+from snake_game import Partie, Direction, avancer_partie, changer_direction
+from reseau import ClientReseau
+from spectateurs import (PublicateurSpectateurs, DiffuseurSpectateurs, Spectateur, demarrer_service,
+                         encoder_message, INTERVALLE_IMAGE_CLE, TAILLE_MAX_DATAGRAMME, TAILLE_MAX_LIGNE)
+
+
+def jouer_un_pas(partie, publicateur, numero):
+    # Tourner en rond pour rester loin des murs
+    if numero % 4 == 0:
+        virages = [Direction.BAS, Direction.GAUCHE, Direction.HAUT, Direction.DROITE]
+        changer_direction(partie, virages[(numero // 4) % 4])
+    score_avant = partie.score
+    changements = avancer_partie(partie)
+    publicateur.tick(partie, changements, score_avant)
+
+
+def test_un_spectateur_en_retard_voit_tout_de_suite_la_bonne_partie():
+    async def scenario():
+        diffuseur, serveur, transport = await demarrer_service("127.0.0.1", 0, 0)
+        port_publication = transport.get_extra_info("sockname")[1]
+        port_spectateurs = serveur.sockets[0].getsockname()[1]
+
+        partie = Partie(alea=random.Random(1))
+        publicateur = PublicateurSpectateurs("127.0.0.1", port_publication)
+        publicateur.debut_partie(partie, "zoe", (0, 100, 255))
+        for numero in range(INTERVALLE_IMAGE_CLE + 7):
+            jouer_un_pas(partie, publicateur, numero)
+        partie.mode_triche = True
+        jouer_un_pas(partie, publicateur, INTERVALLE_IMAGE_CLE + 7)
+
+        # Laisser le service recevoir tous les messages
+        while diffuseur.messages_recus < INTERVALLE_IMAGE_CLE + 9:
+            await asyncio.sleep(0.01)
+
+        # Le spectateur arrive en cours de partie
+        client = ClientReseau()
+        client.lecteur, client.ecrivain = await asyncio.open_connection("127.0.0.1", port_spectateurs)
+        while client.tick < publicateur.numero_tick:
+            await asyncio.wait_for(client.recevoir(), 5)
+
+        client.fermer()
+        publicateur.fermer()
+        serveur.close()
+        transport.close()
+        return partie, client
+
+    partie, client = asyncio.run(scenario())
+    assert client.serpents["0"] == partie.serpent
+    assert sorted(client.pommes) == sorted(partie.pommes)
+    assert client.noms["0"] == "zoe"
+    assert client.triche["0"] is True
+
+
+class EcrivainLent:
+    """Faux spectateur dont le tampon d'envoi est plein ou vide, au choix"""
+
+    def __init__(self):
+        self.plein = False
+        self.recu = []
+        self.transport = self
+
+    def get_write_buffer_size(self):
+        return 10 ** 9 if self.plein else 0
+
+    def write(self, donnees):
+        self.recu.append(donnees)
+
+    def close(self):
+        pass
+
+
+def test_un_spectateur_lent_saute_des_images_jusqu_a_la_prochaine_image_cle():
+    diffuseur = DiffuseurSpectateurs()
+    lent = EcrivainLent()
+    diffuseur.spectateurs.append(Spectateur(lent))
+
+    image_cle = encoder_message({"type": "etat", "tick": 0, "joueurs": {}, "pommes": []})
+    tick = [encoder_message({"type": "tick", "tick": n, "joueurs": {}}) for n in range(1, 4)]
+
+    diffuseur.datagram_received(image_cle, None)
+    lent.plein = True
+    diffuseur.datagram_received(tick[0], None)
+    lent.plein = False
+    # Il a raté un message : les suivants ne lui servent à rien sans nouvelle image clé
+    diffuseur.datagram_received(tick[1], None)
+    diffuseur.datagram_received(image_cle, None)
+    diffuseur.datagram_received(tick[2], None)
+
+    assert lent.recu == [image_cle, image_cle, tick[2]]
+    # Les mêmes octets sont envoyés à tout le monde (encodés une seule fois)
+    assert lent.recu[0] is image_cle
+    assert diffuseur.spectateurs[0].images_perdues == 2
+
+
+def test_un_spectateur_arrive_avant_la_premiere_image_cle_l_attend():
+    class LecteurMuet:
+        def __init__(self):
+            self.depart = asyncio.Event()
+
+        async def read(self):
+            await self.depart.wait()
+            return b""
+
+    async def scenario():
+        diffuseur = DiffuseurSpectateurs()
+        ecrivain, lecteur = EcrivainLent(), LecteurMuet()
+        tache = asyncio.create_task(diffuseur.accueillir_spectateur(lecteur, ecrivain))
+        await asyncio.sleep(0)
+
+        image_cle = encoder_message({"type": "etat", "tick": 1, "joueurs": {}, "pommes": []})
+        tick = [encoder_message({"type": "tick", "tick": n, "joueurs": {}}) for n in (1, 2)]
+        diffuseur.datagram_received(tick[0], None)
+        diffuseur.datagram_received(image_cle, None)
+        diffuseur.datagram_received(tick[1], None)
+        lecteur.depart.set()
+        await tache
+        return ecrivain.recu, image_cle, tick
+
+    recu, image_cle, tick = asyncio.run(scenario())
+    # Sans image clé, le premier changement ne lui servirait à rien
+    assert recu == [image_cle, tick[1]]
+
+
+def test_une_image_cle_trop_grosse_arrive_en_morceaux():
+    async def scenario():
+        diffuseur, serveur, transport = await demarrer_service("127.0.0.1", 0, 0)
+        port_publication = transport.get_extra_info("sockname")[1]
+        port_spectateurs = serveur.sockets[0].getsockname()[1]
+
+        # Un serpent immense, comme sur un grand plateau (--plateau)
+        partie = Partie(alea=random.Random(1))
+        partie.serpent = [(x * 20, 80 + y * 20) for y in range(100) for x in range(100)]
+        publicateur = PublicateurSpectateurs("127.0.0.1", port_publication)
+        publicateur.nom = "zoé"
+        assert len(encoder_message(publicateur.image_cle(partie))) > TAILLE_MAX_DATAGRAMME
+        publicateur.debut_partie(partie, "zoé", (0, 100, 255))
+        while diffuseur.messages_recus < 1:
+            await asyncio.sleep(0.01)
+
+        client = ClientReseau()
+        client.lecteur, client.ecrivain = await asyncio.open_connection("127.0.0.1", port_spectateurs,
+                                                                        limit=TAILLE_MAX_LIGNE)
+        await asyncio.wait_for(client.recevoir(), 5)
+        client.fermer()
+        publicateur.fermer()
+        serveur.close()
+        transport.close()
+        return partie, client
+
+    partie, client = asyncio.run(asyncio.wait_for(scenario(), 10))
+    assert client.serpents["0"] == partie.serpent
+    assert client.noms["0"] == "zoé"
@@ -0,0 +1,80 @@
+"""
+Tests de la télémétrie : compter pendant la partie, écrire à la fin
+"""
+import json
+import time
+
+import pygame
+
+import snake_game
+from pilote import jouer_scenario, touche, taper, clic
+from telemetrie import MesuresPartie, Telemetrie
+
+BOUTON_DEMARRER = (snake_game.LARGEUR // 2, snake_game.HAUTEUR - 90)
+
+PAS_NORMAL = {"pommes_mangees": [], "point_oublie": False}
+POMME_OUBLIEE = {"pommes_mangees": [(0, 80)], "point_oublie": True}
+
+
+def test_images_en_retard():
+    mesures = MesuresPartie(fps_jeu=10)
+    # La première image (après le compte à rebours) ne compte pas
+    for duree in (3000, 100, 140, 160, 300):
+        mesures.image(duree)
+    assert mesures.images_en_retard == 1 + 2
+    # Après une pause non plus
+    mesures.pause()
+    mesures.image(10000)
+    assert mesures.images_en_retard == 3
+
+
+def test_compter_coute_tres_peu():
+    mesures = MesuresPartie(fps_jeu=12)
+    debut = time.perf_counter()
+    for _ in range(100000):
+        mesures.noter(PAS_NORMAL)
+        mesures.image(83)
+    assert (time.perf_counter() - debut) / 100000 < 0.00002
+    mesures.noter(POMME_OUBLIEE)
+    assert (mesures.pas, mesures.pommes_mangees, mesures.points_oublies) == (100001, 1, snake_game.POINTS_PAR_POMME)
+
+
+def test_fichier_tournant_et_fichier_prometheus(tmp_path):
+    telemetrie = Telemetrie(str(tmp_path), taille_max=600, fichiers_gardes=3)
+    partie = snake_game.Partie()
+    for _ in range(20):
+        mesures = telemetrie.nouvelle_partie(10)
+        for _ in range(5):
+            mesures.noter(PAS_NORMAL)
+        telemetrie.terminer(mesures, partie, "mur")
+    telemetrie.fermer()
+
+    fichiers = sorted(chemin.name for chemin in tmp_path.iterdir())
+    assert fichiers == ["parties.jsonl", "parties.jsonl.1", "parties.jsonl.2", "snake.prom"]
+    ligne = json.loads((tmp_path / "parties.jsonl").read_text().splitlines()[-1])
+    assert (ligne["pas"], ligne["longueur"], ligne["collision"]) == (5, 3, "mur")
+
+    prometheus = (tmp_path / "snake.prom").read_text()
+    assert "# TYPE snake_parties_total counter" in prometheus
+    valeurs = {ligne.split("{")[0]: float(ligne.split()[-1])
+               for ligne in prometheus.splitlines() if not ligne.startswith("#")}
+    assert valeurs["snake_parties_total"] == 20
+    assert valeurs["snake_pas_total"] == 100
+    assert valeurs["snake_derniere_partie_longueur"] == 3
+
+
+def test_une_partie_laisse_sa_ligne(tmp_path, monkeypatch, ecran):
+    monkeypatch.chdir(tmp_path)
+    scenario = [
+        ("menu", [clic(BOUTON_DEMARRER)]),
+        ("nom", taper("zoé") + [touche(pygame.K_RETURN)]),
+        ("fin", [touche(pygame.K_q, "q")]),
+    ]
+    pilote = jouer_scenario(scenario, ["--telemetrie", "mesures"])
+    assert pilote.etapes == []
+    ligne = json.loads((tmp_path / "mesures" / "parties.jsonl").read_text())
+    # Sans toucher au clavier : 24 pas jusqu'au bord, le 25e dans le mur
+    # (l'horloge virtuelle n'est jamais en retard)
+    assert (ligne["pas"], ligne["collision"], ligne["images_en_retard"]) == (25, "mur", 0)
+    assert ligne["ajouter_score_s"] > 0
+    assert (tmp_path / "mesures" / "snake.prom").exists()
@@ -0,0 +1,48 @@
+"""
+Tests du tournoi de robots : parties reproductibles et résultats regroupés
+"""
+import pytest
+
+import snake_game
+from robots import robot_gourmand, trouver_robot
+from tournoi import jouer_partie_robot, jouer_lot, lancer_tournoi, lire_config, appliquer_reglages, main
+
+
+def test_la_meme_graine_donne_la_meme_partie():
+    premiere = jouer_partie_robot(robot_gourmand, 42)
+    seconde = jouer_partie_robot(robot_gourmand, 42)
+    assert premiere == seconde
+    assert premiere["score"] > 0
+
+
+def test_les_reglages_changent_les_constantes_puis_reviennent():
+    assert lire_config("proba_bord=0.5,points_par_pomme=100") == {"proba_bord": 0.5, "points_par_pomme": 100}
+    with pytest.raises(ValueError):
+        lire_config("vitesse=3")
+
+    appliquer_reglages({"points_par_pomme": 100})
+    assert snake_game.calculer_nombre_pommes(250) == 3
+    appliquer_reglages({})
+    assert snake_game.calculer_nombre_pommes(250) == 2
+
+
+def test_le_tournoi_donne_les_memes_resultats_qu_en_jouant_une_par_une():
+    rapport = lancer_tournoi("tout_droit", {"normal": {}}, 12, graine_depart=7, processus=2)
+    parties = jouer_lot("tout_droit", {}, True, 5000, range(7, 19))
+    resume = rapport["normal"]
+    assert resume["parties"] == 12
+    assert resume["score_max"] == max(p["score"] for p in parties)
+    assert resume["morts_mur"] == 12
+
+
+def test_robot_d_un_autre_module():
+    assert trouver_robot("robots:robot_prudent") is trouver_robot("prudent")
+    with pytest.raises(ValueError):
+        trouver_robot("inconnu")
+
+
+def test_un_tournoi_sans_partie_est_refuse():
+    with pytest.raises(SystemExit):
+        main(["--parties", "0"])
+    with pytest.raises(ValueError):
+        lancer_tournoi("tout_droit", {"normal": {}}, 0)
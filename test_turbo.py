@@ -0,0 +1,75 @@
+"""
+Tests du mode turbo : les pas ne sont plus limités et seuls certains sont dessinés
+"""
+import pygame
+import pytest
+
+import snake_game
+from pilote import jouer_scenario, touche, taper, clic
+from turbo import Turbo
+
+BOUTON_DEMARRER = (snake_game.LARGEUR // 2, snake_game.HAUTEUR - 90)
+
+# Le robot "tout droit" finit dans le mur de droite après 25 pas
+SCENARIO_ROBOT = [
+    ("menu", [clic(BOUTON_DEMARRER)]),
+    ("nom", taper("robot") + [touche(pygame.K_RETURN)]),
+    ("fin", [touche(pygame.K_q, "q")]),
+]
+
+
+class Temps:
+    """Un faux pygame.time.get_ticks qu'on fait avancer à la main"""
+    def __init__(self):
+        self.ms = 0
+
+    def __call__(self):
+        return self.ms
+
+
+def test_un_pas_sur_n_est_dessine():
+    turbo = Turbo(tous_les=4)
+    assert [turbo.pas_joue() for _ in range(12)] == [False, False, False, True] * 3
+    assert turbo.rythme(10) == 0
+    assert Turbo(multiplicateur=5).rythme(12) == 60
+
+
+def test_au_plus_m_images_par_seconde_et_mesure_du_rythme(monkeypatch):
+    temps = Temps()
+    monkeypatch.setattr(pygame.time, "get_ticks", temps)
+    turbo = Turbo(images_par_seconde=10)
+    dessines = 0
+    # 2 000 pas en une seconde (un pas toutes les 0,5 ms)
+    for pas in range(2000):
+        temps.ms = pas // 2
+        dessines += turbo.pas_joue()
+    assert dessines == 10
+    assert abs(turbo.pas_par_seconde - 2000) < 10
+
+
+def test_le_panneau_affiche_le_rythme(ecran):
+    partie = snake_game.Partie()
+    dessiner = snake_game.dessiner_partie
+    dessiner(ecran, partie.serpent, partie.pommes, "robot", 0, (0, 255, 0), False)
+    sans = pygame.image.tobytes(ecran.subsurface((800, 0, 200, 80)), "RGB")
+    dessiner(ecran, partie.serpent, partie.pommes, "robot", 0, (0, 255, 0), False, pas_par_seconde=1234.5)
+    avec = pygame.image.tobytes(ecran.subsurface((800, 0, 200, 80)), "RGB")
+    assert sans != avec
+
+
+def test_une_partie_de_robot_en_turbo(tmp_path, monkeypatch, ecran):
+    monkeypatch.chdir(tmp_path)
+    normal = jouer_scenario(SCENARIO_ROBOT, ["--robot", "tout_droit"])
+    turbo = jouer_scenario(SCENARIO_ROBOT, ["--robot", "tout_droit", "--turbo", "--turbo-pas", "10"])
+    assert normal.etapes == [] and turbo.etapes == []
+    # Les mêmes 25 pas, mais seulement 2 images dessinées au lieu de 24
+    assert normal.ecrans.count("partie") == 24
+    assert turbo.ecrans.count("partie") == 2
+
+
+@pytest.mark.parametrize("arguments", [["--robot", "inconnu"], ["--robot", "module_absent:robot"],
+                                       ["--robot", "robots:robot_absent"],
+                                       ["--turbo", "--turbo-images", "0"], ["--turbo", "--turbo-pas", "0"]])
+def test_les_mauvaises_options_sont_refusees_tout_de_suite(arguments):
+    with pytest.raises(SystemExit):
+        snake_game.lire_options(arguments)
@@ -0,0 +1,210 @@
+"""
+====================================================================
+            TOURNOI DE ROBOTS (RÉGLAGE DES PIÈGES)
+====================================================================
+
+Pour régler les pièges (pommes près des bords, points oubliés) et le
+nombre de pommes, on fait jouer des milliers de parties par des
+robots, sans fenêtre, sur tous les processeurs de la machine.
+
+Chaque partie a sa "graine" : avec la même graine, le hasard donne
+exactement les mêmes pommes, donc la même partie. On peut toujours
+rejouer une partie précise pour comprendre ce qui s'est passé.
+
+Exemples :
+    python tournoi.py --parties 5000 --robot gourmand
+    python tournoi.py --config proba_bord=0.2 --config proba_bord=0.4,proba_oubli=0.1
+    python tournoi.py --robot prudent --rejouer 1234
+====================================================================
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+
+# Pas de fenêtre ni de son pour les parties des robots
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import snake_game
+from snake_game import Partie, avancer_partie, changer_direction
+from robots import trouver_robot
+
+# Les réglages qu'on peut changer, et la constante du jeu qui correspond
+REGLAGES = {
+    "proba_bord": "PROBA_POMME_BORD",
+    "proba_oubli": "PROBA_POINT_OUBLIE",
+    "points_par_pomme": "POINTS_PAR_POMME_SUPPLEMENTAIRE",
+}
+
+# Nombre de parties envoyées d'un coup à chaque processus
+TAILLE_LOT = 50
+
+
+def lire_config(texte):
+    """
+    Transforme "proba_bord=0.3,proba_oubli=0.1" en dictionnaire de réglages
+    """
+    reglages = {}
+    if not texte:
+        return reglages
+    for morceau in texte.split(","):
+        nom, _, valeur = morceau.partition("=")
+        nom = nom.strip()
+        if nom not in REGLAGES:
+            raise ValueError(f"Réglage inconnu: {nom} (réglages possibles : {', '.join(REGLAGES)})")
+        reglages[nom] = int(valeur) if nom == "points_par_pomme" else float(valeur)
+    return reglages
+
+
+def appliquer_reglages(reglages):
+    """
+    Change les constantes du jeu (dans ce processus seulement)
+    Les réglages non donnés reprennent leur valeur normale
+    """
+    for nom, constante in REGLAGES.items():
+        setattr(snake_game, constante, reglages.get(nom, VALEURS_NORMALES[constante]))
+
+
+# Valeurs du jeu avant tout changement
+VALEURS_NORMALES = {constante: getattr(snake_game, constante) for constante in REGLAGES.values()}
+
+
+def jouer_partie_robot(robot, graine, piege=True, ticks_max=5000):
+    """
+    Joue une partie complète sans fenêtre, le robot choisit la direction à chaque pas
+    Retourne un dictionnaire qui résume la partie
+    """
+    partie = Partie(piege, random.Random(graine))
+    pommes_mangees = 0
+    points_oublies = 0
+    collision = None
+    ticks = 0
+
+    while ticks < ticks_max:
+        changer_direction(partie, robot(partie))
+        changements = avancer_partie(partie)
+        ticks += 1
+        if changements["collision"] is not None:
+            collision = changements["collision"]
+            break
+        pommes_mangees += len(changements["pommes_mangees"])
+        if changements["point_oublie"]:
+            points_oublies += 10
+
+    return {"graine": graine, "score": partie.score, "ticks": ticks,
+            "longueur": len(partie.serpent), "pommes_mangees": pommes_mangees,
+            "points_oublies": points_oublies, "collision": collision}
+
+
+def jouer_lot(nom_robot, reglages, piege, ticks_max, graines):
+    """
+    Joue plusieurs parties avec les mêmes réglages (exécuté dans un processus du groupe)
+    """
+    appliquer_reglages(reglages)
+    robot = trouver_robot(nom_robot)
+    return [jouer_partie_robot(robot, graine, piege, ticks_max) for graine in graines]
+
+
+def resumer(resultats):
+    """
+    Regroupe les résultats des parties : moyenne, médiane, répartition des scores...
+    """
+    scores = sorted(r["score"] for r in resultats)
+    deciles = statistics.quantiles(scores, n=10) if len(scores) >= 2 else scores * 9
+    repartition = {}
+    for score in scores:
+        tranche = score // 50 * 50
+        repartition[tranche] = repartition.get(tranche, 0) + 1
+    return {
+        "parties": len(scores),
+        "score_moyen": statistics.mean(scores),
+        "score_median": statistics.median(scores),
+        "ecart_type": statistics.pstdev(scores),
+        "score_min": scores[0],
+        "score_max": scores[-1],
+        "decile_10": deciles[0],
+        "decile_90": deciles[-1],
+        "ticks_moyen": statistics.mean(r["ticks"] for r in resultats),
+        "longueur_moyenne": statistics.mean(r["longueur"] for r in resultats),
+        "points_oublies_moyen": statistics.mean(r["points_oublies"] for r in resultats),
+        "morts_mur": sum(1 for r in resultats if r["collision"] == "mur"),
+        "morts_serpent": sum(1 for r in resultats if r["collision"] == "serpent"),
+        "repartition_scores": {str(t): n for t, n in sorted(repartition.items())},
+    }
+
+
+def lancer_tournoi(nom_robot, configs, nombre_parties, graine_depart=0, piege=True,
+                   ticks_max=5000, processus=None):
+    """
+    Joue nombre_parties parties pour chaque configuration, sur plusieurs processus
+    Les mêmes graines sont utilisées pour chaque configuration (comparaison équitable)
+    Retourne {nom de la configuration: résumé}
+    """
+    if nombre_parties < 1:
+        raise ValueError("Il faut au moins une partie pour faire un tournoi")
+    graines = list(range(graine_depart, graine_depart + nombre_parties))
+    lots = [graines[i:i + TAILLE_LOT] for i in range(0, len(graines), TAILLE_LOT)]
+
+    resultats = {nom: [] for nom in configs}
+    with ProcessPoolExecutor(max_workers=processus) as groupe:
+        taches = [(nom, groupe.submit(jouer_lot, nom_robot, reglages, piege, ticks_max, lot))
+                  for nom, reglages in configs.items() for lot in lots]
+        for nom, tache in taches:
+            resultats[nom].extend(tache.result())
+
+    return {nom: resumer(resultats[nom]) for nom in configs}
+
+
+def afficher_rapport(rapport):
+    print("\n" + "=" * 78)
+    print("🏆 RÉSULTATS DU TOURNOI")
+    print("=" * 78)
+    print(f"{'Configuration':34} {'Parties':>7} {'Moyenne':>8} {'Médiane':>8} {'Max':>6} {'Oubliés':>8}")
+    for nom, resume in rapport.items():
+        print(f"{nom:34} {resume['parties']:7} {resume['score_moyen']:8.1f} "
+              f"{resume['score_median']:8.1f} {resume['score_max']:6} {resume['points_oublies_moyen']:8.1f}")
+    print("=" * 78 + "\n")
+
+
+def main(arguments=None):
+    parseur = argparse.ArgumentParser(description="Tournoi de robots Snake")
+    parseur.add_argument("--robot", default="gourmand", help="nom du robot ou module:fonction")
+    parseur.add_argument("--parties", type=int, default=1000, help="parties par configuration")
+    parseur.add_argument("--graine", type=int, default=0, help="graine de la première partie")
+    parseur.add_argument("--config", action="append", default=[],
+                         help="réglages à essayer, ex: proba_bord=0.3,proba_oubli=0.1 (plusieurs possibles)")
+    parseur.add_argument("--sans-piege", action="store_true", help="jouer comme un ami (aucun piège)")
+    parseur.add_argument("--ticks-max", type=int, default=5000)
+    parseur.add_argument("--processus", type=int, default=None, help="nombre de processus (défaut: tous)")
+    parseur.add_argument("--rapport", default="rapport_tournoi.json")
+    parseur.add_argument("--rejouer", type=int, default=None, metavar="GRAINE",
+                         help="rejouer une seule partie et afficher son résultat")
+    options = parseur.parse_args(arguments)
+    if options.parties < 1:
+        parseur.error("--parties : il faut au moins une partie")
+    if options.processus is not None and options.processus < 1:
+        parseur.error("--processus : il faut au moins un processus")
+
+    configs = {texte or "normal": lire_config(texte) for texte in (options.config or [""])}
+
+    if options.rejouer is not None:
+        for nom, reglages in configs.items():
+            resultat = jouer_lot(options.robot, reglages, not options.sans_piege,
+                                 options.ticks_max, [options.rejouer])[0]
+            print(f"{nom}: {resultat}")
+        return
+
+    rapport = lancer_tournoi(options.robot, configs, options.parties, options.graine,
+                             not options.sans_piege, options.ticks_max, options.processus)
+    afficher_rapport(rapport)
+    with open(options.rapport, 'w') as f:
+        json.dump({"robot": options.robot, "graine": options.graine, "configurations": rapport}, f, indent=2)
+    print(f"📄 Rapport écrit dans {options.rapport}")
+
+
+if __name__ == "__main__":
+    main()
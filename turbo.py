@@ -0,0 +1,72 @@
+"""
+====================================================================
+            MODE TURBO : REGARDER LES ROBOTS EN ACCÉLÉRÉ
+====================================================================
+
+Normalement le jeu fait 10 pas par seconde (horloge.tick(fps_jeu)) et
+dessine chaque pas : une partie de robot avec un serpent de 1 000 cases
+dure plusieurs minutes.
+
+En mode turbo :
+- les pas ne sont plus limités (ou seulement à FPS x multiplicateur) ;
+- on ne dessine qu'une partie des pas : au plus 30 images par seconde
+  (ou un pas sur N) : l'écran montre quand même où en est la partie ;
+- le panneau affiche le nombre de pas joués par seconde.
+
+    python snake_game.py --robot gourmand --turbo          # sans limite
+    python snake_game.py --robot gourmand --turbo 5        # 5 fois plus vite
+    python snake_game.py --robot gourmand --turbo --turbo-pas 100
+====================================================================
+"""
+
+import pygame
+
+IMAGES_PAR_SECONDE_TURBO = 30
+
+# Le nombre de pas par seconde est recalculé toutes les ... millisecondes
+DUREE_MESURE_MS = 500
+
+
+class Turbo:
+    """
+    Décide à quel rythme avancer et quels pas dessiner
+    multiplicateur : 0 = pas de limite, sinon FPS x multiplicateur pas par seconde
+    tous_les       : dessiner un pas sur tous_les (sinon au plus images_par_seconde)
+    """
+    def __init__(self, multiplicateur=0, images_par_seconde=IMAGES_PAR_SECONDE_TURBO, tous_les=None):
+        self.multiplicateur = multiplicateur
+        self.intervalle_images_ms = 1000 / images_par_seconde
+        self.tous_les = tous_les
+        self.pas_depuis_image = 0
+        self.derniere_image_ms = None
+        self.pas_par_seconde = None     # Pas encore mesuré
+        self.pas_mesures = 0
+        self.debut_mesure_ms = pygame.time.get_ticks()
+
+    def rythme(self, fps_jeu):
+        """
+        Le nombre d'images par seconde à donner à horloge.tick (0 = pas de limite)
+        """
+        return round(fps_jeu * self.multiplicateur) if self.multiplicateur else 0
+
+    def pas_joue(self):
+        """
+        À appeler après chaque pas : retourne True si ce pas doit être dessiné
+        """
+        maintenant = pygame.time.get_ticks()
+        self.pas_mesures += 1
+        self.pas_depuis_image += 1
+        if maintenant - self.debut_mesure_ms >= DUREE_MESURE_MS:
+            self.pas_par_seconde = self.pas_mesures * 1000 / (maintenant - self.debut_mesure_ms)
+            self.pas_mesures = 0
+            self.debut_mesure_ms = maintenant
+
+        if self.tous_les is not None:
+            dessiner = self.pas_depuis_image >= self.tous_les
+        else:
+            dessiner = (self.derniere_image_ms is None
+                        or maintenant - self.derniere_image_ms >= self.intervalle_images_ms)
+        if dessiner:
+            self.pas_depuis_image = 0
+            self.derniere_image_ms = maintenant
+        return dessiner